@@ -0,0 +1,249 @@
+"""Bulk Ad Copy - Catalog-Wide RSA Asset Generation, Local Policy Checks & Targeted Re-Requests
+
+Usage (no Streamlit needed):
+    python ad_copy_batch.py                          # every client's products
+    python ad_copy_batch.py --client 3 --audience "Pastaneler, restoranlar" --json rsa.json
+    python ad_copy_batch.py --client 3 --queue       # send the ads to the approval center
+"""
+import argparse
+import concurrent.futures
+import json
+import re
+import time
+from config import Config
+from database import init_db, get_conn, fetch_all, insert_many
+from ai_engine import HAS_ANTHROPIC, generate_ad_assets
+
+MIN_HEADLINES = 3
+MIN_DESCRIPTIONS = 2
+
+
+def parse_products(text):
+    """Product names from a clients.products field ("Kadayıf, Yufka, Börek Hamuru..."), duplicates dropped."""
+    products, seen = [], set()
+    for name in re.split(r"[,;\n]+", text or ""):
+        name = " ".join(name.split()).strip(" .")
+        if name and name.casefold() not in seen:
+            seen.add(name.casefold())
+            products.append(name)
+    return products
+
+
+def catalog(client_ids=None):
+    """One item per (client, product) for the given clients (all by default)."""
+    init_db()
+    clients = fetch_all("clients", order_by="id ASC", limit=100000)
+    if client_ids is not None:
+        clients = [c for c in clients if c["id"] in set(client_ids)]
+    return [{"client_id": c["id"], "client": c["name"], "product": product,
+             "description": f"{c['name']} — {c.get('sector') or ''}".strip(" —"),
+             "website": c.get("website") or "", "customer_id": c.get("google_ads_id") or ""}
+            for c in clients for product in parse_products(c.get("products"))]
+
+
+# ═══════════════════════════════════════════════════════════════
+#  LOCAL VALIDATION
+# ═══════════════════════════════════════════════════════════════
+
+def _asset_problem(text, kind, seen):
+    if not text:
+        return "boş"
+    limit = Config.AD_HEADLINE_MAX_CHARS if kind == "headline" else Config.AD_DESCRIPTION_MAX_CHARS
+    if len(text) > limit:
+        return f"{len(text)}/{limit} karakter"
+    if kind == "headline" and "!" in text:
+        return "başlıkta ünlem"
+    if text.casefold() in seen:
+        return "tekrar"
+    return None
+
+
+def validate_assets(headlines, descriptions, keep=None):
+    """(accepted {"headlines", "descriptions"}, rejected [{"type", "text", "reason"}]).
+
+    Assets in `keep` are already accepted; new ones are checked for length, headline
+    punctuation and case-insensitive duplicates against them and each other. Beyond
+    AD_RSA_HEADLINES / AD_RSA_DESCRIPTIONS further valid assets are simply dropped.
+    """
+    keep = keep or {}
+    accepted, rejected = {}, []
+    for kind, key, items, limit in (("headline", "headlines", headlines, Config.AD_RSA_HEADLINES),
+                                    ("description", "descriptions", descriptions, Config.AD_RSA_DESCRIPTIONS)):
+        valid = list(keep.get(key, []))
+        seen = {text.casefold() for text in valid}
+        for text in items:
+            text = " ".join(str(text).split())
+            problem = _asset_problem(text, kind, seen)
+            if problem:
+                rejected.append({"type": kind, "text": text, "reason": problem})
+            elif len(valid) < limit:
+                valid.append(text)
+                seen.add(text.casefold())
+        accepted[key] = valid
+    return accepted, rejected
+
+
+# ═══════════════════════════════════════════════════════════════
+#  GENERATION
+# ═══════════════════════════════════════════════════════════════
+
+def generate_product(item, audience="", force_refresh=False):
+    """Full RSA asset set for one catalog item.
+
+    After the first request only the missing assets are asked for again, with the
+    rejected ones and their reasons, up to AD_COPY_REPAIR_ROUNDS times.
+    Status is "ok" (full set), "partial" (publishable minimum) or "failed".
+    """
+    result = {**item, "headlines": [], "descriptions": [], "rejected": [], "requests": 0, "tokens": 0, "error": None}
+    accepted, rejected = {"headlines": [], "descriptions": []}, []
+    for _ in range(1 + Config.AD_COPY_REPAIR_ROUNDS):
+        need_headlines = Config.AD_RSA_HEADLINES - len(accepted["headlines"])
+        need_descriptions = Config.AD_RSA_DESCRIPTIONS - len(accepted["descriptions"])
+        if need_headlines <= 0 and need_descriptions <= 0:
+            break
+        assets = generate_ad_assets(item["product"], item.get("description", ""), audience,
+                                    max(need_headlines, 0), max(need_descriptions, 0),
+                                    keep=accepted, rejected=rejected, force_refresh=force_refresh)
+        result["requests"] += 1
+        if "error" in assets:
+            result["error"] = assets["error"]
+            break
+        result["tokens"] += assets["_meta"]["tokens"]
+        accepted, rejected = validate_assets(assets["headlines"], assets["descriptions"], keep=accepted)
+        result["rejected"] += rejected
+
+    result.update(accepted)
+    if len(accepted["headlines"]) >= Config.AD_RSA_HEADLINES and len(accepted["descriptions"]) >= Config.AD_RSA_DESCRIPTIONS:
+        result["status"] = "ok"
+    elif len(accepted["headlines"]) >= MIN_HEADLINES and len(accepted["descriptions"]) >= MIN_DESCRIPTIONS:
+        result["status"] = "partial"
+    else:
+        result["status"] = "failed"
+    return result
+
+
+def generate_catalog(items, audience="", concurrency=None, force_refresh=False, on_progress=None):
+    """generate_product() for every item concurrently; results in input order.
+
+    Requests are still capped by AI_MAX_CONCURRENCY inside create_message().
+    """
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        raise RuntimeError("Anthropic API yapılandırılmamış")
+    results = [None] * len(items)
+    workers = max(1, min(concurrency or Config.AI_BATCH_CONCURRENCY, len(items) or 1))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(generate_product, item, audience, force_refresh): i for i, item in enumerate(items)}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = {**items[i], "headlines": [], "descriptions": [], "rejected": [], "requests": 0,
+                              "tokens": 0, "error": str(e), "status": "failed"}
+            if on_progress:
+                on_progress(done, len(items), results[i])
+    return results
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RESPONSIVE SEARCH ADS
+# ═══════════════════════════════════════════════════════════════
+
+def client_ad_groups(client_id):
+    """Synced ad groups of a client that exist in Google Ads, as {"google_adgroup_id", "name", "campaign"}."""
+    conn = get_conn()
+    rows = [dict(r) for r in conn.execute(
+        "SELECT g.google_adgroup_id, g.name, c.name AS campaign FROM ad_groups g "
+        "JOIN campaigns c ON c.id = g.campaign_id WHERE c.client_id = ? AND g.google_adgroup_id IS NOT NULL "
+        "AND g.status != 'REMOVED' ORDER BY g.name", [client_id])]
+    conn.close()
+    return rows
+
+
+def match_ad_group(product, ad_groups):
+    """Google ad group id whose name contains the product name (or vice versa), else None."""
+    name = product.casefold()
+    for group in ad_groups:
+        group_name = (group.get("name") or "").casefold()
+        if group_name and (name in group_name or group_name in name):
+            return group["google_adgroup_id"]
+    return None
+
+
+def rsa_ads(results, ad_groups=None, default_ad_group=None, final_url=None):
+    """(ads, unassigned): publishable results as google_ads_client.create_responsive_search_ads() input.
+
+    Each product goes to the ad group named after it, else `default_ad_group`;
+    products with neither, and failed results, are returned as unassigned.
+    """
+    ads, unassigned = [], []
+    for r in results:
+        ad_group_id = match_ad_group(r["product"], ad_groups or []) or default_ad_group
+        url = final_url or r.get("website")
+        if r["status"] == "failed" or not ad_group_id or not url:
+            unassigned.append(r)
+            continue
+        ads.append({"client_id": r["client_id"], "customer_id": r.get("customer_id"), "product": r["product"],
+                    "ad_group_id": str(ad_group_id), "final_url": url,
+                    "headlines": r["headlines"], "descriptions": r["descriptions"]})
+    return ads, unassigned
+
+
+def queue_for_approval(ads):
+    """Add each ad to the approval center as a "responsive_search_ad" action; returns the count."""
+    return insert_many("approvals", [{
+        "client_id": ad["client_id"],
+        "action_type": "responsive_search_ad",
+        "title": f"Yeni RSA: {ad['product']}",
+        "description": f"{len(ad['headlines'])} başlık, {len(ad['descriptions'])} açıklama — "
+                       f"reklam grubu {ad['ad_group_id']} (duraklatılmış olarak eklenir)",
+        "payload": json.dumps(ad, ensure_ascii=False),
+    } for ad in ads])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ürün kataloğundan toplu RSA reklam metni üretimi")
+    parser.add_argument("--client", type=int, action="append", help="müşteri id (tekrarlanabilir; varsayılan tümü)")
+    parser.add_argument("--audience", default="", help="hedef kitle")
+    parser.add_argument("--concurrency", type=int, default=Config.AI_BATCH_CONCURRENCY, help="eşzamanlı ürün")
+    parser.add_argument("--force-refresh", action="store_true", help="AI önbelleğini atla")
+    parser.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    parser.add_argument("--queue", action="store_true", help="reklamları Onay Merkezine gönder")
+    args = parser.parse_args()
+
+    items = catalog(args.client)
+    if not items:
+        print("Katalogda ürün yok (clients.products boş).")
+        return
+
+    start = time.time()
+
+    def progress(done, total, result):
+        icon = {"ok": "✅", "partial": "⚠️"}.get(result["status"], "❌")
+        print(f"[{done}/{total}] {icon} {result['client']} / {result['product']}: "
+              f"{len(result['headlines'])} başlık, {len(result['descriptions'])} açıklama, "
+              f"{result['requests']} istek" + (f" — {result['error']}" if result["error"] else ""))
+
+    results = generate_catalog(items, args.audience, args.concurrency, args.force_refresh, on_progress=progress)
+    rejected = sum(len(r["rejected"]) for r in results)
+    print(f"\n{len(results)} ürün, {sum(r['requests'] for r in results)} istek, {rejected} öğe reddedildi, "
+          f"{time.time() - start:.0f} sn")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.queue:
+        ads, unassigned = [], []
+        for client_id in sorted({r["client_id"] for r in results}):
+            client_ads, client_unassigned = rsa_ads([r for r in results if r["client_id"] == client_id],
+                                                    client_ad_groups(client_id))
+            ads += client_ads
+            unassigned += client_unassigned
+        print(f"{queue_for_approval(ads)} reklam Onay Merkezine gönderildi")
+        for r in unassigned:
+            print(f"  atlandı: {r['client']} / {r['product']} (reklam grubu, URL veya geçerli öğe yok)")
+
+
+if __name__ == "__main__":
+    main()
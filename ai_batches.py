@@ -0,0 +1,332 @@
+"""Offline AI Batches - Bulk Strategy & SEO Jobs Through a Batch Backend, Polled Into the Database
+
+Non-interactive workloads (nightly SEO recommendations, monthly strategies) are
+submitted as one batch instead of hundreds of live calls; results are collected
+later and written to `strategies` / `seo_audits`.
+
+Usage (e.g. from cron, after seo_batch.py):
+    python ai_batches.py submit seo
+    python ai_batches.py submit strategy --prompt "Q4 dönemine odaklan"
+    python ai_batches.py poll            # collect every finished job
+    python ai_batches.py poll 12 --wait  # block until job 12 ends
+"""
+import argparse
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from config import Config
+from database import init_db, get_conn, fetch_all, fetch_one, insert_many
+from ai_engine import (HAS_ANTHROPIC, get_client, create_message, _strategy_params, _parse_strategy,
+                       _strategy_parsed, _seo_params)
+from ai_cache import get_ai_cache, cache_key, cache_entry, cached_message
+from seo_history import load_audit_results
+from strategy_batch import _client_context, insert_strategy
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BACKENDS
+# ═══════════════════════════════════════════════════════════════
+
+class BatchBackend(ABC):
+    """Runs many messages.create requests ({"custom_id", "params"}) asynchronously."""
+
+    name = ""
+
+    @abstractmethod
+    def submit(self, requests):
+        """Start a batch; returns its id."""
+
+    @abstractmethod
+    def status(self, batch_id):
+        """{"ended": bool, "counts": {"processing", "succeeded", "errored"}}."""
+
+    @abstractmethod
+    def results(self, batch_id):
+        """Yields (custom_id, message, error) for an ended batch; message is None when the request failed."""
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Message Batches API: billed at half the price of live calls, most batches end within an hour."""
+
+    name = "anthropic"
+
+    def __init__(self):
+        self.batches = get_client().messages.batches
+
+    def submit(self, requests):
+        return self.batches.create(requests=requests).id
+
+    def status(self, batch_id):
+        batch = self.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {"ended": batch.processing_status == "ended",
+                "counts": {"processing": counts.processing, "succeeded": counts.succeeded,
+                           "errored": counts.errored + counts.canceled + counts.expired}}
+
+    def results(self, batch_id):
+        for entry in self.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                yield entry.custom_id, entry.result.message, None
+            else:
+                error = getattr(entry.result, "error", None)
+                yield entry.custom_id, None, str(getattr(error, "error", error) or entry.result.type)
+
+
+class LocalBatchBackend(BatchBackend):
+    """Stand-in for tests and development: answers every request on submit.
+
+    `responder(custom_id, params)` returns the response text; by default each request
+    is sent as a normal live call. Responses are kept in ai_local_batch_results, so
+    `submit` and `poll` may run in different processes.
+    """
+
+    name = "local"
+
+    def __init__(self, responder=None):
+        self.responder = responder
+
+    def submit(self, requests):
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        rows = []
+        for request in requests:
+            row = {"batch_id": batch_id, "custom_id": request["custom_id"], "response": None, "error": None}
+            try:
+                if self.responder:
+                    entry = {"text": self.responder(request["custom_id"], request["params"]),
+                             "usage": {}, "model": request["params"].get("model"), "stop_reason": "end_turn"}
+                else:
+                    entry = cache_entry(create_message(request["custom_id"].split("-", 1)[0], **request["params"]))
+                row["response"] = json.dumps(entry, ensure_ascii=False)
+            except Exception as e:
+                row["error"] = str(e)
+            rows.append(row)
+        insert_many("ai_local_batch_results", rows)
+        return batch_id
+
+    def _rows(self, batch_id):
+        conn = get_conn()
+        rows = [dict(r) for r in conn.execute(
+            "SELECT custom_id, response, error FROM ai_local_batch_results WHERE batch_id = ?", [batch_id])]
+        conn.close()
+        return rows
+
+    def status(self, batch_id):
+        # An unknown batch (e.g. its database was reset) ends empty; poll_job fails its items
+        rows = self._rows(batch_id)
+        return {"ended": True, "counts": {"processing": 0,
+                                          "succeeded": sum(1 for r in rows if r["response"] is not None),
+                                          "errored": sum(1 for r in rows if r["response"] is None)}}
+
+    def results(self, batch_id):
+        for r in self._rows(batch_id):
+            if r["response"] is not None:
+                yield r["custom_id"], cached_message(json.loads(r["response"])), None
+            else:
+                yield r["custom_id"], None, r["error"]
+
+
+def get_backend(name=None):
+    """Backend by name ("anthropic" / "local"); defaults to Config.AI_BATCH_BACKEND."""
+    name = name or Config.AI_BATCH_BACKEND
+    if name == "local":
+        return LocalBatchBackend()
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        raise RuntimeError("Anthropic API yapılandırılmamış")
+    return AnthropicBatchBackend()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  JOB KINDS (request builders and result writers)
+# ═══════════════════════════════════════════════════════════════
+
+def strategy_requests(client_ids=None, custom_prompt=""):
+    """[(client_id, params)] for a strategy per client (all clients by default)."""
+    where, params = ("id IN ({})".format(",".join("?" * len(client_ids))), client_ids) if client_ids else (None, None)
+    return [(client["id"], _strategy_params(*_client_context(client), custom_prompt=custom_prompt))
+            for client in fetch_all("clients", where=where, params=params, order_by="id ASC", limit=100000)]
+
+
+def seo_requests(audit_ids=None):
+    """[(audit_id, params)] for SEO recommendations; by default each client's latest full audit still without them."""
+    if audit_ids is None:
+        conn = get_conn()
+        audit_ids = [r["id"] for r in conn.execute("""
+            SELECT a.id FROM seo_audits a
+            JOIN (SELECT client_id, MAX(id) AS id FROM seo_audits WHERE client_id IS NOT NULL GROUP BY client_id) latest
+              ON latest.id = a.id
+            WHERE a.ai_recommendations IS NULL
+        """)]
+        conn.close()
+    requests = []
+    for audit_id in audit_ids:
+        results = load_audit_results(audit_id)
+        if results:
+            requests.append((audit_id, _seo_params(results["url"], results)))
+    return requests
+
+
+def _apply_strategy(conn, client_id, message):
+    strategy = _parse_strategy(message)
+    title = f"Toplu Strateji — {datetime.now().strftime('%d.%m.%Y')}"
+    return insert_strategy(conn, client_id, strategy, title)
+
+
+def _apply_seo(conn, audit_id, message):
+    conn.execute("UPDATE seo_audits SET ai_recommendations = ?, ai_generated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                 [message.content[0].text, audit_id])
+    return audit_id
+
+
+JOB_KINDS = {
+    "strategy": {"purpose": "strategy", "build": strategy_requests, "apply": _apply_strategy,
+                 "cache_if": _strategy_parsed},
+    "seo": {"purpose": "seo", "build": seo_requests, "apply": _apply_seo},
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SUBMIT & POLL
+# ═══════════════════════════════════════════════════════════════
+
+def submit_job(kind, entries, backend=None):
+    """Submit [(target_id, params)] of one kind as a batch; returns the job id (None if nothing to do)."""
+    init_db()
+    if not entries:
+        return None
+    backend = backend or get_backend()
+    requests = [{"custom_id": f"{kind}-{target_id}",
+                 "params": dict(params, model=params.get("model", Config.ANTHROPIC_MODEL))}
+                for target_id, params in entries]
+    batch_id = backend.submit(requests)
+    conn = get_conn()
+    try:
+        cur = conn.execute("INSERT INTO ai_batch_jobs (batch_id, backend, kind, request_count) VALUES (?,?,?,?)",
+                           [batch_id, backend.name, kind, len(requests)])
+        conn.executemany("INSERT INTO ai_batch_items (job_id, custom_id, target_id, params) VALUES (?,?,?,?)",
+                         [[cur.lastrowid, r["custom_id"], target_id, json.dumps(r["params"], ensure_ascii=False)]
+                          for r, (target_id, _) in zip(requests, entries)])
+        conn.commit()
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def submit(kind, backend=None, **build_kwargs):
+    """Build the default requests of a job kind and submit them."""
+    return submit_job(kind, JOB_KINDS[kind]["build"](**build_kwargs), backend)
+
+
+def poll_job(job_id, backend=None):
+    """Refresh a job's status; once its batch has ended, write every result to its row. Returns the job."""
+    job = fetch_one("ai_batch_jobs", "id = ?", [job_id])
+    if job is None or job["status"] == "ended":
+        return job
+    backend = backend or get_backend(job["backend"])
+    status = backend.status(job["batch_id"])
+    counts = status["counts"]
+    conn = get_conn()
+    try:
+        if not status["ended"]:
+            conn.execute("UPDATE ai_batch_jobs SET status = 'in_progress', succeeded = ?, errored = ? WHERE id = ?",
+                         [counts["succeeded"], counts["errored"], job_id])
+            conn.commit()
+            return fetch_one("ai_batch_jobs", "id = ?", [job_id])
+
+        kind = JOB_KINDS[job["kind"]]
+        items = {r["custom_id"]: dict(r) for r in conn.execute(
+            "SELECT * FROM ai_batch_items WHERE job_id = ? AND status = 'pending'", [job_id])}
+        succeeded = errored = 0
+        for custom_id, message, error in backend.results(job["batch_id"]):
+            item = items.pop(custom_id, None)
+            if item is None:
+                continue
+            if message is not None:
+                try:
+                    result_id = kind["apply"](conn, item["target_id"], message)
+                    if kind.get("cache_if", bool)(message):
+                        get_ai_cache().put(cache_key(kind["purpose"], json.loads(item["params"])),
+                                           kind["purpose"], message)
+                except Exception as e:
+                    message, error = None, str(e)
+            if message is not None:
+                succeeded += 1
+                conn.execute("UPDATE ai_batch_items SET status = 'done', result_id = ? "
+                             "WHERE job_id = ? AND custom_id = ?", [result_id, job_id, custom_id])
+            else:
+                errored += 1
+                conn.execute("UPDATE ai_batch_items SET status = 'failed', error = ? "
+                             "WHERE job_id = ? AND custom_id = ?", [(error or "")[:500], job_id, custom_id])
+        # Requests the batch returned nothing for (e.g. an unknown local batch)
+        missing = list(items)
+        for custom_id in missing:
+            conn.execute("UPDATE ai_batch_items SET status = 'failed', error = ? WHERE job_id = ? AND custom_id = ?",
+                         ["Toplu iş sonuçlarında yok", job_id, custom_id])
+        errored += len(missing)
+        conn.execute("UPDATE ai_batch_jobs SET status = 'ended', succeeded = ?, errored = ?, "
+                     "ended_at = CURRENT_TIMESTAMP WHERE id = ?", [succeeded, errored, job_id])
+        conn.commit()
+    finally:
+        conn.close()
+    return fetch_one("ai_batch_jobs", "id = ?", [job_id])
+
+
+def open_jobs():
+    init_db()
+    return fetch_all("ai_batch_jobs", where="status != 'ended'", order_by="id ASC", limit=1000)
+
+
+def wait_for_job(job_id, backend=None, interval=None, timeout=None):
+    """poll_job() every `interval` seconds until the batch ends or `timeout` seconds pass."""
+    interval = interval or Config.AI_BATCH_POLL_SECONDS
+    deadline = time.time() + timeout if timeout else None
+    while True:
+        job = poll_job(job_id, backend)
+        if job is None or job["status"] == "ended" or (deadline and time.time() + interval > deadline):
+            return job
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu (çevrimdışı) AI işleri")
+    sub = parser.add_subparsers(dest="command", required=True)
+    submit_cmd = sub.add_parser("submit", help="yeni toplu iş gönder")
+    submit_cmd.add_argument("kind", choices=list(JOB_KINDS))
+    submit_cmd.add_argument("--prompt", default="", help="strateji işleri için ek talimat")
+    submit_cmd.add_argument("--wait", action="store_true", help="bitene kadar bekle ve sonuçları yaz")
+    poll_cmd = sub.add_parser("poll", help="biten işlerin sonuçlarını veritabanına yaz")
+    poll_cmd.add_argument("job_id", nargs="?", type=int)
+    poll_cmd.add_argument("--wait", action="store_true", help="bitene kadar bekle")
+    parser.add_argument("--backend", choices=["anthropic", "local"], help="varsayılan: Config.AI_BATCH_BACKEND")
+    args = parser.parse_args()
+
+    init_db()
+    # Polling without --backend uses the backend each job was submitted to
+    backend = get_backend(args.backend) if args.backend or args.command == "submit" else None
+    if args.command == "submit":
+        job_id = submit(args.kind, backend, **({"custom_prompt": args.prompt} if args.kind == "strategy" else {}))
+        if job_id is None:
+            print("Gönderilecek istek yok.")
+            return
+        print(f"İş #{job_id} gönderildi.")
+        job_ids = [job_id] if args.wait else []
+    else:
+        job_ids = [args.job_id] if args.job_id else [j["id"] for j in open_jobs()]
+
+    for job_id in job_ids:
+        try:
+            job = wait_for_job(job_id, backend) if args.wait else poll_job(job_id, backend)
+        except Exception as e:
+            # One broken job must not keep every later job from being collected
+            print(f"İş #{job_id} okunamadı: {e}")
+            continue
+        if job is None:
+            print(f"İş #{job_id} bulunamadı.")
+            continue
+        print(f"İş #{job['id']} ({job['kind']}, {job['request_count']} istek): {job['status']} — "
+              f"{job['succeeded']} başarılı, {job['errored']} hatalı")
+
+
+if __name__ == "__main__":
+    main()
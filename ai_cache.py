@@ -0,0 +1,160 @@
+"""AI Response Cache - Content-Addressed, TTL + LRU Bounded, for Repeat Claude Calls"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from config import Config
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+def cache_key(purpose, params):
+    """SHA-256 over the purpose and every request parameter (model, messages, max_tokens, ...)."""
+    payload = json.dumps({"purpose": purpose, **params}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_entry(response):
+    """JSON-serializable {"text", "usage", "model", "stop_reason"} of a messages.create response."""
+    return {"text": "".join(getattr(block, "text", "") for block in response.content),
+            "usage": {f: getattr(response.usage, f, 0) or 0 for f in USAGE_FIELDS},
+            "model": getattr(response, "model", None),
+            "stop_reason": getattr(response, "stop_reason", None)}
+
+
+def cached_message(entry):
+    """Response-shaped object (content[0].text, usage, stop_reason) rebuilt from a cache entry."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=entry["text"])],
+        usage=SimpleNamespace(**{f: entry["usage"].get(f) or 0 for f in USAGE_FIELDS}),
+        model=entry.get("model"),
+        stop_reason=entry.get("stop_reason"),
+        from_cache=True,
+    )
+
+
+class AICache:
+    """On-disk cache of Claude responses keyed by cache_key(); expired after ttl, least recently used evicted."""
+
+    def __init__(self, path=None, ttl_hours=None, max_entries=None):
+        self.path = path or Config.AI_CACHE_PATH
+        self.ttl = (ttl_hours or Config.AI_CACHE_TTL_HOURS) * 3600
+        self.max_entries = max_entries or Config.AI_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _conn(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        with self._lock:
+            conn = self._conn()
+            conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ai_response_cache (
+                key TEXT PRIMARY KEY,
+                purpose TEXT,
+                model TEXT,
+                response TEXT,
+                created_at REAL,
+                last_used_at REAL,
+                hits INTEGER DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_ai_cache_lru ON ai_response_cache(last_used_at);
+
+            CREATE TABLE IF NOT EXISTS ai_cache_stats (
+                purpose TEXT PRIMARY KEY,
+                hits INTEGER DEFAULT 0,
+                misses INTEGER DEFAULT 0
+            );
+            """)
+            conn.execute("DELETE FROM ai_response_cache WHERE created_at < ?", [time.time() - self.ttl])
+            conn.commit()
+            conn.close()
+
+    def _count(self, conn, purpose, hit):
+        column = "hits" if hit else "misses"
+        conn.execute("INSERT OR IGNORE INTO ai_cache_stats (purpose) VALUES (?)", [purpose])
+        conn.execute(f"UPDATE ai_cache_stats SET {column} = {column} + 1 WHERE purpose = ?", [purpose])
+
+    def get(self, key, purpose):
+        """Cached entry {"text", "usage", "model", "stop_reason"} or None; counts the hit/miss."""
+        now = time.time()
+        with self._lock:
+            conn = self._conn()
+            row = conn.execute("SELECT response, created_at FROM ai_response_cache WHERE key = ?", [key]).fetchone()
+            if row and row["created_at"] < now - self.ttl:
+                conn.execute("DELETE FROM ai_response_cache WHERE key = ?", [key])
+                row = None
+            if row:
+                conn.execute("UPDATE ai_response_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+                             [now, key])
+            self._count(conn, purpose, hit=row is not None)
+            conn.commit()
+            conn.close()
+        return json.loads(row["response"]) if row else None
+
+    def put(self, key, purpose, response):
+        """Store a messages.create response, then evict least recently used entries beyond max_entries.
+
+        Responses cut off at max_tokens are not stored, so a truncated answer is not replayed for the TTL.
+        """
+        entry = cache_entry(response)
+        if entry["stop_reason"] == "max_tokens":
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_response_cache (key, purpose, model, response, created_at, last_used_at) "
+                "VALUES (?,?,?,?,?,?)",
+                [key, purpose, entry["model"], json.dumps(entry, ensure_ascii=False), now, now])
+            conn.execute("""
+                DELETE FROM ai_response_cache WHERE key IN (
+                    SELECT key FROM ai_response_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )""", [self.max_entries])
+            conn.commit()
+            conn.close()
+
+    def stats(self):
+        """Per-purpose hits, misses, hit rate and stored entries."""
+        conn = self._conn()
+        entries = {r["purpose"]: r["n"] for r in conn.execute(
+            "SELECT purpose, COUNT(*) AS n FROM ai_response_cache GROUP BY purpose")}
+        stats = []
+        for r in conn.execute("SELECT * FROM ai_cache_stats ORDER BY purpose"):
+            lookups = r["hits"] + r["misses"]
+            stats.append({
+                "purpose": r["purpose"],
+                "hits": r["hits"],
+                "misses": r["misses"],
+                "hit_rate": round(r["hits"] / lookups * 100, 1) if lookups else 0,
+                "entries": entries.get(r["purpose"], 0),
+            })
+        conn.close()
+        return stats
+
+    def clear(self):
+        with self._lock:
+            conn = self._conn()
+            conn.execute("DELETE FROM ai_response_cache")
+            conn.execute("DELETE FROM ai_cache_stats")
+            conn.commit()
+            conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_ai_cache():
+    """Process-wide AICache on Config.AI_CACHE_PATH."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AICache()
+        return _cache
@@ -0,0 +1,284 @@
+"""Prompt Context Builder - Token Budget, Relevance Ranking & Compact Tables for Claude Prompts"""
+from config import Config
+from seo_rules import SEVERITIES
+from automation_engines import BudgetManager, BidOptimizer, NegativeKeywordMiner, AnomalyDetector
+
+# Audit keys that never help the model: run metadata and raw fetched content
+SEO_SKIP_KEYS = {"cache", "timings", "timestamp", "partial", "pages", "recommendations", "summary", "issues",
+                 "section_scores", "robots_txt", "robots_content", "raw", "schemas", "page_results"}
+# Longer strings than this are cut, lists are reduced to their length
+MAX_VALUE_CHARS = 120
+
+
+def estimate_tokens(text):
+    """Rough token count of a prompt fragment (characters / Config.AI_CHARS_PER_TOKEN)."""
+    return int(len(text) / Config.AI_CHARS_PER_TOKEN) + 1
+
+
+def _cell(value, max_chars=MAX_VALUE_CHARS):
+    if isinstance(value, float):
+        return f"{value:,.2f}".rstrip("0").rstrip(".") if value else "0"
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f"{value:,}"
+    text = str(value if value is not None else "-").replace("|", "/").replace("\n", " ")
+    return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
+
+
+class ContextBuilder:
+    """Collects prompt sections in priority order until the token budget is spent.
+
+    Tables take rows (already ranked, most relevant first) only while they fit, and
+    note how many were left out, so the most important data always makes it in.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.used = 0
+        self.parts = []
+        self.dropped = 0
+
+    @property
+    def remaining(self):
+        return self.budget - self.used
+
+    def _append(self, text):
+        self.parts.append(text)
+        self.used += estimate_tokens(text)
+
+    def add(self, title, text):
+        """Add a free-text section if it fits; returns whether it was added."""
+        block = f"## {title}\n{text.strip()}\n"
+        if estimate_tokens(block) > self.remaining:
+            self.dropped += 1
+            return False
+        self._append(block)
+        return True
+
+    def add_table(self, title, rows, columns, share=1.0, max_chars=MAX_VALUE_CHARS):
+        """Add rows as a pipe table; `columns` is [(header, key or callable)]. Returns the number of rows added.
+
+        `share` caps the table at that fraction of the whole budget so one long
+        table cannot crowd out the sections after it.
+        """
+        if not rows:
+            return 0
+        limit = min(self.remaining, int(self.budget * share))
+        header = f"## {title}\n| " + " | ".join(h for h, _ in columns) + " |\n"
+        if estimate_tokens(header) > limit:
+            self.dropped += 1
+            return 0
+        lines, used = [], estimate_tokens(header)
+        for row in rows:
+            cells = (_cell(key(row) if callable(key) else row.get(key), max_chars) for _, key in columns)
+            line = "| " + " | ".join(cells) + " |\n"
+            cost = estimate_tokens(line)
+            if used + cost > limit:
+                break
+            lines.append(line)
+            used += cost
+        if not lines:
+            self.dropped += 1
+            return 0
+        left = len(rows) - len(lines)
+        self._append(header + "".join(lines) + (f"(+{left} satır bütçe nedeniyle eklenmedi)\n" if left else ""))
+        return len(lines)
+
+    def build(self):
+        return "\n".join(self.parts)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RELEVANCE RANKING
+# ═══════════════════════════════════════════════════════════════
+
+def campaign_flags(c, target_cpa=None):
+    """Short anomaly labels for a campaign (spend without conversions, CPA over target, low CTR)."""
+    flags = []
+    cost, conversions = c.get("cost") or 0, c.get("conversions") or 0
+    if cost > 0 and not conversions:
+        flags.append("dönüşümsüz harcama")
+    if target_cpa and conversions and cost / conversions > target_cpa * 1.5:
+        flags.append("CPA hedefin üstünde")
+    if (c.get("impressions") or 0) > 1000 and (c.get("ctr") or 0) < 1:
+        flags.append("düşük CTR")
+    return ", ".join(flags)
+
+
+def rank_campaigns(campaigns, target_cpa=None):
+    """Flagged campaigns first, then by spend."""
+    return sorted(campaigns or [], key=lambda c: (not campaign_flags(c, target_cpa), -(c.get("cost") or 0)))
+
+
+def keyword_flags(k):
+    flags = []
+    if (k.get("cost") or 0) > 0 and not k.get("conversions"):
+        flags.append("dönüşümsüz")
+    if k.get("quality_score") and k["quality_score"] < 5 and (k.get("cost") or 0) > 0:
+        flags.append("düşük QS")
+    return ", ".join(flags)
+
+
+def rank_keywords(keywords):
+    """Wasteful or low-quality spenders first, then top spenders."""
+    return sorted(keywords or [], key=lambda k: (not keyword_flags(k), -(k.get("cost") or 0)))
+
+
+# ═══════════════════════════════════════════════════════════════
+#  PRE-ANALYSIS (automation engines run before the model sees anything)
+# ═══════════════════════════════════════════════════════════════
+
+def _with_derived(rows):
+    """Copies of campaign/keyword rows with cpa and avg_cpc filled in where the sync left them out."""
+    derived = []
+    for row in rows or []:
+        row = {k: v for k, v in row.items() if v is not None}
+        cost, clicks, conversions = row.get("cost", 0), row.get("clicks", 0), row.get("conversions", 0)
+        row.setdefault("cpa", cost / conversions if conversions else 0)
+        row.setdefault("avg_cpc", cost / clicks if clicks else 0)
+        row.setdefault("keyword", row.get("text", ""))
+        derived.append(row)
+    return derived
+
+
+def pre_analysis(client_info, campaigns=None, keywords=None, search_terms=None, daily_data=None):
+    """Findings from the automation engines: pacing, budget moves, bid changes, negatives, anomalies, waste."""
+    campaigns, keywords = _with_derived(campaigns), _with_derived(keywords)
+    target_cpa, target_roas = client_info.get("target_cpa"), client_info.get("target_roas")
+    monthly_budget = client_info.get("monthly_budget") or 0
+    for c in campaigns:
+        c.setdefault("target_cpa", target_cpa or 0)
+
+    negatives = NegativeKeywordMiner.analyze_search_terms(search_terms or [], target_cpa)
+    wasted_campaigns = [c for c in campaigns if c.get("cost", 0) > 0 and not c.get("conversions")]
+    return {
+        "pacing": BudgetManager.analyze_pacing(campaigns, monthly_budget) if monthly_budget and campaigns else None,
+        "reallocations": BudgetManager.get_reallocation_suggestions(campaigns, monthly_budget),
+        "bids": BidOptimizer.analyze_keywords(keywords, target_cpa, target_roas),
+        "negatives": negatives,
+        "anomalies": AnomalyDetector.detect_anomalies(daily_data) if daily_data else [],
+        "wasted": {
+            "campaign_cost": round(sum(c["cost"] for c in wasted_campaigns), 2),
+            "campaigns": [c["name"] for c in wasted_campaigns],
+            "keyword_cost": round(sum(k.get("cost", 0) for k in keywords
+                                      if k.get("cost", 0) > 0 and not k.get("conversions")), 2),
+            "search_term_cost": round(sum(n["potential_savings"] for n in negatives), 2),
+        },
+    }
+
+
+PACING_LABELS = {"normal": "normal", "overspend": "fazla harcama", "underspend": "düşük harcama"}
+
+
+def add_findings(builder, findings):
+    """Render pre_analysis() output into the builder, most actionable first."""
+    lines = []
+    pacing = findings.get("pacing")
+    if pacing:
+        lines.append(f"- Bütçe temposu: {PACING_LABELS.get(pacing['status'], pacing['status'])} — ayın "
+                     f"{pacing['day_of_month']}. gününde {_cell(pacing['total_cost'])} TL harcandı, beklenen "
+                     f"{_cell(pacing['expected_cost'])} TL (%{_cell(pacing['pacing_pct'])}); kalan "
+                     f"{_cell(pacing['remaining_budget'])} TL, ideal günlük {_cell(pacing['daily_ideal'])} TL")
+    wasted = findings.get("wasted") or {}
+    if any(wasted.get(k) for k in ("campaign_cost", "keyword_cost", "search_term_cost")):
+        lines.append(f"- Dönüşümsüz harcama: kampanyalarda {_cell(wasted['campaign_cost'])} TL"
+                     + (f" ({', '.join(wasted['campaigns'][:5])})" if wasted["campaigns"] else "")
+                     + f", anahtar kelimelerde {_cell(wasted['keyword_cost'])} TL, negatif aday arama "
+                       f"terimlerinde {_cell(wasted['search_term_cost'])} TL")
+    if lines:
+        builder.add("Hesaplanmış Bulgular", "\n".join(lines))
+
+    builder.add_table("Anomaliler", findings.get("anomalies"),
+                      [("Önem", "severity"), ("Metrik", "metric"), ("Bulgu", "message")], share=0.15)
+    builder.add_table("Bütçe Aktarım Önerileri", findings.get("reallocations"),
+                      [("Kampanya", "campaign"), ("Aksiyon", "action"), ("Mevcut TL", "current_budget"),
+                       ("Önerilen TL", "suggested_budget"), ("Neden", "reason")], share=0.15)
+    builder.add_table("Teklif Önerileri (en büyük değişiklik önce)", findings.get("bids"),
+                      [("Kelime", "keyword"), ("Mevcut TBM", "current_cpc"), ("Önerilen TBM", "suggested_cpc"),
+                       ("Değişim %", "adjustment_pct"), ("Neden", "reason")], share=0.2)
+    builder.add_table("Negatif Kelime Adayları (en pahalı önce)", findings.get("negatives"),
+                      [("Arama Terimi", "search_term"), ("Maliyet TL", "cost"), ("Tık", "clicks"),
+                       ("Eşleme", "suggested_match"), ("Neden", lambda n: "; ".join(n["reasons"]))], share=0.15)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  PROMPT CONTEXTS
+# ═══════════════════════════════════════════════════════════════
+
+CAMPAIGN_COLUMNS = [("Kampanya", "name"), ("Gösterim", "impressions"), ("Tık", "clicks"), ("Maliyet TL", "cost"),
+                    ("Dönüşüm", "conversions"), ("CTR %", "ctr"), ("TBM TL", "avg_cpc")]
+KEYWORD_COLUMNS = [("Kelime", lambda k: k.get("keyword") or k.get("text")), ("Eşleme", "match_type"),
+                   ("Tık", "clicks"), ("Maliyet TL", "cost"), ("Dönüşüm", "conversions"), ("QS", "quality_score"),
+                   ("Not", keyword_flags)]
+
+
+def strategy_context(client_info, campaigns=None, keywords=None, search_terms=None, budget=None):
+    """Client facts, engine findings, then ranked campaign and keyword tables within the strategy token budget."""
+    builder = ContextBuilder(budget or Config.AI_CONTEXT_TOKENS_STRATEGY)
+    builder.add("Müşteri Bilgileri", f"""
+- Firma: {client_info.get('name', 'N/A')}
+- Sektör: {client_info.get('sector', 'N/A')}
+- Website: {client_info.get('website', 'N/A')}
+- Aylık Bütçe: {client_info.get('monthly_budget', 0) or 0:,.0f} TL
+- Ürünler: {client_info.get('products', 'N/A')}
+- Hedef CPA: {client_info.get('target_cpa', 'Belirlenmedi')}
+- Hedef ROAS: {client_info.get('target_roas', 'Belirlenmedi')}""")
+    add_findings(builder, pre_analysis(client_info, campaigns, keywords, search_terms))
+    target_cpa = client_info.get("target_cpa")
+    builder.add_table("Mevcut Kampanya Performansı (sorunlular ve en çok harcayanlar önce)",
+                      rank_campaigns(campaigns, target_cpa),
+                      CAMPAIGN_COLUMNS + [("Not", lambda c: campaign_flags(c, target_cpa))], share=0.3)
+    builder.add_table("Anahtar Kelimeler (israf edenler ve en çok harcayanlar önce)",
+                      rank_keywords(keywords), KEYWORD_COLUMNS, share=0.25)
+    return builder.build()
+
+
+def performance_context(client_info, campaigns, daily_data=None, keywords=None, search_terms=None, budget=None):
+    """Engine findings first, then a short campaign summary, within the performance token budget."""
+    builder = ContextBuilder(budget or Config.AI_CONTEXT_TOKENS_PERFORMANCE)
+    builder.add("Firma", f"{client_info.get('name')}\nBütçe: {client_info.get('monthly_budget', 0) or 0:,.0f} TL")
+    add_findings(builder, pre_analysis(client_info, campaigns, keywords, search_terms, daily_data))
+    builder.add_table("Kampanya Özeti (sorunlular ve en çok harcayanlar önce)", rank_campaigns(campaigns),
+                      [("Kampanya", "name"), ("Maliyet TL", "cost"), ("Dönüşüm", "conversions"), ("CTR %", "ctr"),
+                       ("Not", campaign_flags)], share=0.3)
+    return builder.build()
+
+
+def _compact_section(details):
+    """Scalar facts of an audit section; lists become counts, nested dicts and long text are dropped."""
+    facts = []
+    for key, value in details.items():
+        if key in SEO_SKIP_KEYS or isinstance(value, dict):
+            continue
+        if isinstance(value, (list, tuple, set)):
+            facts.append(f"{key}={len(value)}")
+        elif isinstance(value, str) and len(value) > MAX_VALUE_CHARS:
+            continue
+        else:
+            facts.append(f"{key}={_cell(value)}")
+    return ", ".join(facts)
+
+
+def seo_context(audit_data, budget=None):
+    """Score, issues (critical first), per-section facts and crawled page scores within the SEO token budget."""
+    builder = ContextBuilder(budget or Config.AI_CONTEXT_TOKENS_SEO)
+    scores = audit_data.get("section_scores") or {}
+    builder.add("Genel", f"Puan: {audit_data.get('overall_score', 0)}/100 ({audit_data.get('grade', '')})\n"
+                         + "Bölüm puanları: " + ", ".join(f"{k}={_cell(v)}" for k, v in scores.items()))
+    rank = {severity: i for i, severity in enumerate(SEVERITIES)}
+    issues = sorted(audit_data.get("issues") or [], key=lambda i: rank.get(i.get("severity"), len(SEVERITIES)))
+    builder.add_table("Sorunlar (kritik önce)", issues,
+                      [("Önem", "severity"), ("Kategori", "category"), ("Sorun", "message")], share=0.4)
+
+    # Weakest sections first: their details explain the lost points
+    sections = [(k, v) for k, v in audit_data.items() if isinstance(v, dict) and k not in SEO_SKIP_KEYS]
+    sections.sort(key=lambda kv: scores.get(kv[0], kv[1].get("score", 100)) or 0)
+    builder.add_table("Bölüm Detayları (en zayıf önce)",
+                      [{"section": k, "facts": _compact_section(v)} for k, v in sections],
+                      [("Bölüm", "section"), ("Veriler", lambda r: r["facts"])], share=0.4, max_chars=800)
+
+    pages = (audit_data.get("multi_page") or {}).get("page_results") or []
+    builder.add_table("Taranan Sayfalar (en düşük puan önce)",
+                      sorted(pages, key=lambda p: p.get("overall_score", p.get("score", 100)) or 0),
+                      [("URL", "url"), ("Puan", lambda p: p.get("overall_score", p.get("score"))),
+                       ("Sorun", lambda p: len(p.get("issues") or []))])
+    return builder.build()
@@ -1,217 +1,483 @@
 """Claude AI Strategy Engine - Premium Turkish Analysis"""
-import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
 from datetime import datetime
 from config import Config
+from ai_cache import get_ai_cache, cache_key, cached_message
+from ai_context import estimate_tokens, strategy_context, performance_context, seo_context
+from ai_json import parse_ai_json, STRATEGY_SCHEMA, AD_COPY_SCHEMA, AD_ASSET_SCHEMA
 
 try:
     import anthropic
+    import httpx
     HAS_ANTHROPIC = True
 except ImportError:
     HAS_ANTHROPIC = False
 
 
-def generate_strategy(client_info, campaigns=None, keywords=None, search_terms=None, custom_prompt=""):
-    """Generate comprehensive AI strategy for a client."""
-    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
-        return {"error": "Anthropic API yapılandırılmamış"}
-
-    api = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
-
-    # Build context
-    context = f"""
-## Müşteri Bilgileri
-- Firma: {client_info.get('name', 'N/A')}
-- Sektör: {client_info.get('sector', 'N/A')}
-- Website: {client_info.get('website', 'N/A')}
-- Aylık Bütçe: {client_info.get('monthly_budget', 0):,.0f} TL
-- Ürünler: {client_info.get('products', 'N/A')}
-- Hedef CPA: {client_info.get('target_cpa', 'Belirlenmedi')}
-- Hedef ROAS: {client_info.get('target_roas', 'Belirlenmedi')}
-"""
-
-    if campaigns:
-        context += "\n## Mevcut Kampanya Performansı\n"
-        for c in campaigns[:10]:
-            context += (f"- {c['name']}: {c.get('impressions',0):,} gösterim, "
-                        f"{c.get('clicks',0):,} tık, {c.get('cost',0):,.2f} TL maliyet, "
-                        f"{c.get('conversions',0):.0f} dönüşüm, CTR: {c.get('ctr',0):.2f}%, "
-                        f"Ort. TBM: {c.get('avg_cpc',0):.2f} TL\n")
-
-    if keywords:
-        context += "\n## En Çok Harcama Yapan Anahtar Kelimeler (İlk 20)\n"
-        for k in keywords[:20]:
-            context += (f"- [{k.get('match_type','?')}] \"{k.get('keyword','')}\" → "
-                        f"{k.get('clicks',0)} tık, {k.get('cost',0):.2f} TL, "
-                        f"{k.get('conversions',0):.0f} dönüşüm, QS: {k.get('quality_score',0)}\n")
-
-    prompt = f"""Sen premium bir Google Ads optimizasyon uzmanısın. Türkçe yanıt ver.
-
-{context}
-
-{f"Ek Talimatlar: {custom_prompt}" if custom_prompt else ""}
-
-Lütfen aşağıdaki JSON formatında kapsamlı bir strateji oluştur:
-
-{{
+# ═══════════════════════════════════════════════════════════════
+#  SHARED CLIENT & CALL METRICS
+# ═══════════════════════════════════════════════════════════════
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+_call_slots = threading.BoundedSemaphore(Config.AI_MAX_CONCURRENCY)
+_metrics = defaultdict(lambda: {"calls": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0,
+                                "cache_read_tokens": 0, "cache_write_tokens": 0,
+                                "latencies": deque(maxlen=200), "first_token": deque(maxlen=200)})
+_metrics_lock = threading.Lock()
+
+
+def _new_client(key):
+    return anthropic.Anthropic(
+        api_key=key,
+        timeout=httpx.Timeout(Config.AI_TIMEOUT, connect=Config.AI_CONNECT_TIMEOUT),
+        max_retries=Config.AI_MAX_RETRIES,
+        http_client=anthropic.DefaultHttpxClient(limits=httpx.Limits(
+            max_connections=Config.AI_POOL_SIZE, max_keepalive_connections=Config.AI_POOL_SIZE)),
+    )
+
+
+def get_client():
+    """Process-wide Anthropic client for Config.ANTHROPIC_API_KEY; every call reuses its pooled connections.
+
+    When the configured key changes (saved in settings) the previous client and its pool are closed.
+    """
+    global _client, _client_key
+    key = Config.ANTHROPIC_API_KEY
+    with _client_lock:
+        if _client is None or _client_key != key:
+            previous = _client
+            _client = _new_client(key)
+            _client_key = key
+            if previous is not None:
+                previous.close()
+        return _client
+
+
+@contextmanager
+def client_for(api_key=None):
+    """The shared client for the configured key; for any other key (e.g. an unsaved
+    one in the settings connection test) a throwaway client, closed on exit."""
+    if api_key and api_key != Config.ANTHROPIC_API_KEY:
+        with _new_client(api_key) as client:
+            yield client
+    else:
+        yield get_client()
+
+
+def _record(purpose, latency, usage=None, error=False, first_token=None):
+    with _metrics_lock:
+        m = _metrics[purpose]
+        m["calls"] += 1
+        m["errors"] += error
+        m["latencies"].append(latency)
+        if first_token is not None:
+            m["first_token"].append(first_token)
+        if usage is not None:
+            m["input_tokens"] += usage.input_tokens
+            m["output_tokens"] += usage.output_tokens
+            m["cache_read_tokens"] += getattr(usage, "cache_read_input_tokens", 0) or 0
+            m["cache_write_tokens"] += getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+
+def create_message(purpose, api_key=None, cache=False, force_refresh=False, cache_if=None, **kwargs):
+    """messages.create on the shared client, at most AI_MAX_CONCURRENCY at a time.
+
+    `purpose` labels the call in ai_metrics(); the model defaults to Config.ANTHROPIC_MODEL.
+    With `cache`, an identical earlier request (same model, prompt and parameters) is
+    answered from the AI response cache; `force_refresh` skips the lookup and overwrites it.
+    Responses the `cache_if(response)` check rejects (e.g. unparseable JSON) are not stored.
+    """
+    kwargs.setdefault("model", Config.ANTHROPIC_MODEL)
+    key = cache_key(purpose, kwargs) if cache else None
+    if key and not force_refresh:
+        entry = get_ai_cache().get(key, purpose)
+        if entry is not None:
+            return cached_message(entry)
+    with _call_slots:
+        start = time.time()
+        try:
+            with client_for(api_key) as client:
+                response = client.messages.create(**kwargs)
+        except Exception:
+            _record(purpose, time.time() - start, error=True)
+            raise
+    _record(purpose, time.time() - start, response.usage)
+    if key and (cache_if is None or cache_if(response)):
+        get_ai_cache().put(key, purpose, response)
+    return response
+
+
+def stream_message(purpose, api_key=None, cache=False, force_refresh=False, **kwargs):
+    """Streaming create_message(): yields text deltas as they arrive.
+
+    A cache hit is yielded as one chunk. Time to the first delta is recorded
+    per purpose, since that is the wait the user actually sees.
+    """
+    kwargs.setdefault("model", Config.ANTHROPIC_MODEL)
+    key = cache_key(purpose, kwargs) if cache else None
+    if key and not force_refresh:
+        entry = get_ai_cache().get(key, purpose)
+        if entry is not None:
+            yield entry["text"]
+            return
+    with _call_slots:
+        start = time.time()
+        first_token = None
+        try:
+            with client_for(api_key) as client, client.messages.stream(**kwargs) as stream:
+                for text in stream.text_stream:
+                    if first_token is None:
+                        first_token = time.time() - start
+                    yield text
+                response = stream.get_final_message()
+        except Exception:
+            _record(purpose, time.time() - start, error=True, first_token=first_token)
+            raise
+    _record(purpose, time.time() - start, response.usage, first_token=first_token)
+    if key:
+        get_ai_cache().put(key, purpose, response)
+
+
+def create_async_client(api_key=None, max_retries=0):
+    """AsyncAnthropic client for batch runs; create one per event loop (its pool is bound to the loop).
+
+    Retries default to off so batch runners can apply their own rate-limit aware backoff.
+    """
+    return anthropic.AsyncAnthropic(
+        api_key=api_key or Config.ANTHROPIC_API_KEY,
+        timeout=httpx.Timeout(Config.AI_TIMEOUT, connect=Config.AI_CONNECT_TIMEOUT),
+        max_retries=max_retries,
+        http_client=anthropic.DefaultAsyncHttpxClient(limits=httpx.Limits(
+            max_connections=Config.AI_POOL_SIZE, max_keepalive_connections=Config.AI_POOL_SIZE)),
+    )
+
+
+async def acreate_message(client, purpose, cache=False, force_refresh=False, cache_if=None, **kwargs):
+    """Async create_message() on `client`: same cache lookup and metrics, concurrency is up to the caller."""
+    kwargs.setdefault("model", Config.ANTHROPIC_MODEL)
+    key = cache_key(purpose, kwargs) if cache else None
+    if key and not force_refresh:
+        entry = get_ai_cache().get(key, purpose)
+        if entry is not None:
+            return cached_message(entry)
+    start = time.time()
+    try:
+        response = await client.messages.create(**kwargs)
+    except Exception:
+        _record(purpose, time.time() - start, error=True)
+        raise
+    _record(purpose, time.time() - start, response.usage)
+    if key and (cache_if is None or cache_if(response)):
+        get_ai_cache().put(key, purpose, response)
+    return response
+
+
+def ai_metrics():
+    """Per-purpose call counts, errors, latency (avg / p95 of recent calls) and token totals."""
+    with _metrics_lock:
+        stats = []
+        for purpose, m in _metrics.items():
+            latencies = sorted(m["latencies"])
+            first_token = m["first_token"]
+            stats.append({
+                "purpose": purpose,
+                "calls": m["calls"],
+                "errors": m["errors"],
+                "avg_latency": round(sum(latencies) / len(latencies), 2) if latencies else 0,
+                "p95_latency": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2)
+                               if latencies else 0,
+                "avg_first_token": round(sum(first_token) / len(first_token), 2) if first_token else None,
+                "input_tokens": m["input_tokens"],
+                "output_tokens": m["output_tokens"],
+                "cache_read_tokens": m["cache_read_tokens"],
+                "cache_write_tokens": m["cache_write_tokens"],
+            })
+    return sorted(stats, key=lambda s: s["calls"], reverse=True)
+
+
+def cached_prompt(system, data, tail=""):
+    """system + messages with a prompt-cache breakpoint after the client/audit data block.
+
+    The API only caches prefixes of at least AI_PROMPT_CACHE_MIN_TOKENS, which the
+    instructions alone never reach; with the data they usually do, and that prefix
+    repeats on regenerations with other instructions (`tail`), forced refreshes and
+    streamed/unstreamed pairs. Shorter prompts are sent without the marker.
+    """
+    block = {"type": "text", "text": data}
+    if estimate_tokens(system + data) >= Config.AI_PROMPT_CACHE_MIN_TOKENS:
+        block["cache_control"] = {"type": "ephemeral"}
+    content = [block] + ([{"type": "text", "text": tail}] if tail else [])
+    return {"system": system, "messages": [{"role": "user", "content": content}]}
+
+
+# Static instructions go in the system prompt, the client data after them in the user turn
+STRATEGY_SYSTEM = """Sen premium bir Google Ads optimizasyon uzmanısın. Türkçe yanıt ver.
+
+Kullanıcı sana müşteri bilgilerini, otomasyon motorlarının hesapladığı bulguları ve kampanya
+verilerini verecek. Hesaplanmış bulgularla (tempo, teklif ve bütçe önerileri, negatif adaylar)
+tutarlı kal. Bu verilere dayanarak aşağıdaki JSON formatında kapsamlı bir strateji oluştur:
+
+{
     "analysis": "Mevcut durumun detaylı analizi (en az 200 kelime)",
     "recommendations": [
-        {{
+        {
             "priority": "high/medium/low",
             "category": "bidding/budget/keywords/ads/structure",
             "title": "Öneri başlığı",
             "description": "Detaylı açıklama",
             "expected_impact": "Beklenen etki"
-        }}
+        }
     ],
     "budget_allocation": [
-        {{
+        {
             "campaign_name": "Kampanya adı",
             "current_budget": 0,
             "suggested_budget": 0,
             "reason": "Neden"
-        }}
+        }
     ],
-    "kpi_targets": {{
+    "kpi_targets": {
         "target_cpa": 0,
         "target_roas": 0,
         "target_ctr": 0,
         "target_conv_rate": 0
-    }},
+    },
     "negative_keywords": ["önerilen negatif kelimeler"],
     "new_keyword_suggestions": [
-        {{
+        {
             "keyword": "kelime",
             "match_type": "PHRASE/EXACT",
             "estimated_cpc": 0,
             "reason": "Neden öneriliyor"
-        }}
+        }
     ],
     "action_plan": [
-        {{
+        {
             "week": 1,
             "actions": ["Yapılacak işler"]
-        }}
+        }
     ]
-}}
+}
 
 SADECE JSON döndür, başka bir şey yazma."""
 
-    try:
-        response = api.messages.create(
-            model=Config.ANTHROPIC_MODEL,
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        text = response.content[0].text.strip()
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0]
-
-        strategy = json.loads(text)
-        strategy["_meta"] = {
-            "model": Config.ANTHROPIC_MODEL,
-            "tokens": response.usage.input_tokens + response.usage.output_tokens,
-            "generated_at": datetime.now().isoformat(),
-        }
-        return strategy
-    except json.JSONDecodeError:
-        return {"analysis": text, "recommendations": [], "_meta": {"error": "JSON parse hatası"}}
-    except Exception as e:
-        return {"error": str(e)}
 
+def _strategy_params(client_info, campaigns=None, keywords=None, search_terms=None, custom_prompt=""):
+    """messages.create parameters (minus model) of a strategy request; custom instructions follow the cached prefix."""
+    return {"max_tokens": 4096, **cached_prompt(
+        STRATEGY_SYSTEM, strategy_context(client_info, campaigns, keywords, search_terms),
+        f"Ek Talimatlar: {custom_prompt}" if custom_prompt else "")}
 
-def analyze_performance(client_info, campaigns, daily_data=None):
-    """Quick AI performance analysis in Turkish."""
-    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
-        return "Anthropic API yapılandırılmamış. Lütfen API anahtarınızı ayarlayın."
 
-    api = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+def _strategy_parsed(response):
+    """cache_if check: only strategies that parse are worth replaying."""
+    return parse_ai_json(response.content[0].text, STRATEGY_SCHEMA)[0] is not None
 
-    context = f"Firma: {client_info.get('name')}\nBütçe: {client_info.get('monthly_budget',0):,.0f} TL\n\n"
-    context += "Kampanya Performansı:\n"
-    for c in campaigns[:10]:
-        context += (f"• {c['name']}: {c.get('cost',0):,.2f} TL harcama, "
-                    f"{c.get('clicks',0)} tık, {c.get('conversions',0):.0f} dönüşüm, "
-                    f"CTR {c.get('ctr',0):.2f}%, CPA {c.get('cpa',0):.2f} TL\n")
 
-    if daily_data:
-        context += "\nSon 7 Günlük Trend:\n"
-        for d in daily_data[-7:]:
-            context += f"• {d['date']}: {d.get('cost',0):.2f} TL, {d.get('clicks',0)} tık, {d.get('conversions',0):.0f} dönüşüm\n"
+def _parse_strategy(response):
+    text = response.content[0].text
+    strategy, parse = parse_ai_json(text, STRATEGY_SCHEMA)
+    if strategy is None:
+        return {"analysis": text, "recommendations": [], "_meta": {"error": "JSON parse hatası"}}
+    strategy["_meta"] = {
+        **parse,
+        "model": Config.ANTHROPIC_MODEL,
+        "tokens": response.usage.input_tokens + response.usage.output_tokens,
+        "cache_read_tokens": getattr(response.usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write_tokens": getattr(response.usage, "cache_creation_input_tokens", 0) or 0,
+        "generated_at": datetime.now().isoformat(),
+        "cached": getattr(response, "from_cache", False),
+    }
+    return strategy
+
+
+def generate_strategy(client_info, campaigns=None, keywords=None, search_terms=None, custom_prompt="",
+                      force_refresh=False):
+    """Generate comprehensive AI strategy for a client."""
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        return {"error": "Anthropic API yapılandırılmamış"}
 
     try:
-        response = api.messages.create(
-            model=Config.ANTHROPIC_MODEL,
-            max_tokens=2048,
-            messages=[{"role": "user", "content": f"""Sen bir Google Ads uzmanısın. Türkçe analiz yap.
+        response = create_message(
+            "strategy",
+            cache=True,
+            force_refresh=force_refresh,
+            cache_if=_strategy_parsed,
+            **_strategy_params(client_info, campaigns, keywords, search_terms, custom_prompt),
+        )
+        return _parse_strategy(response)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def agenerate_strategy(client, client_info, campaigns=None, keywords=None, search_terms=None,
+                             custom_prompt="", force_refresh=False):
+    """generate_strategy() on an async client; API errors propagate so the caller can retry them."""
+    response = await acreate_message(
+        client,
+        "strategy",
+        cache=True,
+        force_refresh=force_refresh,
+        cache_if=_strategy_parsed,
+        **_strategy_params(client_info, campaigns, keywords, search_terms, custom_prompt),
+    )
+    return _parse_strategy(response)
 
-{context}
 
-Şunları yap:
+PERFORMANCE_SYSTEM = """Sen bir Google Ads uzmanısın. Türkçe analiz yap.
+
+Kullanıcı firma bilgilerini, otomasyon motorlarının hesapladığı bulguları (bütçe temposu,
+anomaliler, teklif ve bütçe önerileri, negatif kelime adayları, dönüşümsüz harcama) ve kısa
+bir kampanya özetini verecek. Sayıları yeniden hesaplama; yorumunu bu bulgulara dayandır ve
+onlarla çelişme. Şunları yap:
 1. Genel performans değerlendirmesi (kısa ve öz)
 2. En önemli 3 sorun
 3. Hemen yapılması gereken 3 aksiyon
 4. Bütçe kullanım değerlendirmesi
 
-Profesyonel ama anlaşılır bir dil kullan. Markdown formatında yaz."""}],
+Profesyonel ama anlaşılır bir dil kullan. Markdown formatında yaz."""
+
+
+def _performance_params(client_info, campaigns, daily_data=None, keywords=None, search_terms=None):
+    """messages.create parameters (minus model) of a quick performance analysis."""
+    return {"max_tokens": 2048, **cached_prompt(PERFORMANCE_SYSTEM, performance_context(
+        client_info, campaigns, daily_data, keywords, search_terms))}
+
+
+def analyze_performance(client_info, campaigns, daily_data=None, keywords=None, search_terms=None,
+                        force_refresh=False):
+    """Quick AI performance analysis in Turkish."""
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        return "Anthropic API yapılandırılmamış. Lütfen API anahtarınızı ayarlayın."
+
+    try:
+        response = create_message(
+            "performance",
+            cache=True,
+            force_refresh=force_refresh,
+            **_performance_params(client_info, campaigns, daily_data, keywords, search_terms),
         )
         return response.content[0].text
     except Exception as e:
         return f"AI analiz hatası: {str(e)}"
 
 
-def generate_ad_copy(product_name, product_description, target_audience, language="tr"):
-    """Generate ad copy suggestions."""
+def analyze_performance_stream(client_info, campaigns, daily_data=None, keywords=None, search_terms=None,
+                               force_refresh=False):
+    """analyze_performance() as a generator of text deltas (for st.write_stream)."""
     if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
-        return {"error": "API yapılandırılmamış"}
-
-    api = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        yield "Anthropic API yapılandırılmamış. Lütfen API anahtarınızı ayarlayın."
+        return
 
     try:
-        response = api.messages.create(
-            model=Config.ANTHROPIC_MODEL,
-            max_tokens=2048,
-            messages=[{"role": "user", "content": f"""Google Ads için Türkçe reklam metinleri oluştur.
+        yield from stream_message("performance", cache=True, force_refresh=force_refresh,
+                                  **_performance_params(client_info, campaigns, daily_data, keywords, search_terms))
+    except Exception as e:
+        yield f"\n\nAI analiz hatası: {str(e)}"
 
-Ürün: {product_name}
-Açıklama: {product_description}
-Hedef Kitle: {target_audience}
 
-3 farklı reklam varyantı oluştur. Her biri için:
+AD_COPY_SYSTEM = """Google Ads için Türkçe reklam metinleri oluştur.
+
+Kullanıcının verdiği ürün için 3 farklı reklam varyantı oluştur. Her biri için:
 - 3 başlık (max 30 karakter)
 - 2 açıklama (max 90 karakter)
 - 1 strateji notu
 
 JSON formatında döndür:
-[{{"variant": "A", "headlines": [...], "descriptions": [...], "strategy": "..."}}]
+[{"variant": "A", "headlines": [...], "descriptions": [...], "strategy": "..."}]
+
+SADECE JSON döndür."""
+
+
+def generate_ad_copy(product_name, product_description, target_audience, language="tr", force_refresh=False):
+    """Generate ad copy suggestions."""
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        return {"error": "API yapılandırılmamış"}
 
-SADECE JSON döndür."""}],
+    try:
+        response = create_message(
+            "ad_copy",
+            cache=True,
+            force_refresh=force_refresh,
+            cache_if=lambda r: bool(parse_ai_json(r.content[0].text, AD_COPY_SCHEMA)[0]),
+            max_tokens=2048,
+            system=AD_COPY_SYSTEM,
+            messages=[{"role": "user", "content": f"""Ürün: {product_name}
+Açıklama: {product_description}
+Hedef Kitle: {target_audience}"""}],
         )
-        text = response.content[0].text.strip()
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0]
-        return json.loads(text)
+        ads, _ = parse_ai_json(response.content[0].text, AD_COPY_SCHEMA)
+        if not ads:
+            return {"error": "Yanıtta reklam metni bulunamadı"}
+        return ads
     except Exception as e:
         return {"error": str(e)}
 
 
-def generate_seo_recommendations(url, audit_data):
-    """Generate SEO recommendations based on audit data."""
+AD_ASSET_SYSTEM = """Google Ads Duyarlı Arama Ağı Reklamı (RSA) için Türkçe öğeler oluştur.
+
+Kurallar:
+- Başlıklar en fazla 30, açıklamalar en fazla 90 karakter (boşluklar dahil)
+- Başlıklarda ünlem işareti kullanma
+- Her öğe diğerlerinden farklı olsun; aynı ifadeyi tekrar etme
+- Başlıklar birbirinden bağımsız okunabilsin (Google bunları karıştırarak gösterir)
+
+JSON formatında döndür:
+{"headlines": [...], "descriptions": [...]}
+
+SADECE JSON döndür."""
+
+
+def generate_ad_assets(product_name, product_description, target_audience, headlines, descriptions,
+                       keep=None, rejected=None, force_refresh=False):
+    """Request `headlines` new headlines and `descriptions` new descriptions for one product's RSA.
+
+    `keep` ({"headlines", "descriptions"}) are accepted assets the new ones must not repeat;
+    `rejected` ([{"type", "text", "reason"}]) are failed ones shown to the model so only
+    replacements are generated. Returns {"headlines", "descriptions", "_meta"} or {"error"}.
+    """
     if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
-        return "API yapılandırılmamış"
+        return {"error": "API yapılandırılmamış"}
+
+    content = f"""Ürün: {product_name}
+Açıklama: {product_description}
+Hedef Kitle: {target_audience}
 
-    api = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+{headlines} başlık ve {descriptions} açıklama üret."""
+    if keep and (keep.get("headlines") or keep.get("descriptions")):
+        content += "\n\nMevcut öğeler (tekrar etme):\n" + "\n".join(
+            f"- {text}" for text in keep.get("headlines", []) + keep.get("descriptions", []))
+    if rejected:
+        content += "\n\nReddedilen öğeler (yerine yenilerini yaz):\n" + "\n".join(
+            f"- {r['text']} ({r['reason']})" for r in rejected)
 
     try:
-        response = api.messages.create(
-            model=Config.ANTHROPIC_MODEL,
-            max_tokens=2048,
-            messages=[{"role": "user", "content": f"""Sen bir SEO uzmanısın. Türkçe yanıt ver.
+        response = create_message(
+            "ad_assets",
+            cache=True,
+            force_refresh=force_refresh,
+            cache_if=lambda r: parse_ai_json(r.content[0].text, AD_ASSET_SCHEMA)[0] is not None,
+            max_tokens=1024,
+            system=AD_ASSET_SYSTEM,
+            messages=[{"role": "user", "content": content}],
+        )
+        assets, meta = parse_ai_json(response.content[0].text, AD_ASSET_SCHEMA)
+        if assets is None:
+            return {"error": "Yanıtta reklam öğesi bulunamadı"}
+        assets["_meta"] = {**meta, "tokens": response.usage.input_tokens + response.usage.output_tokens,
+                           "cached": getattr(response, "from_cache", False)}
+        return assets
+    except Exception as e:
+        return {"error": str(e)}
+
 
-Site: {url}
-Audit Sonuçları:
-{json.dumps(audit_data, indent=2, ensure_ascii=False)}
+SEO_SYSTEM = """Sen bir SEO uzmanısın. Türkçe yanıt ver.
 
-Şunları yap:
+Kullanıcı bir sitenin SEO denetim sonuçlarını verecek. Bunlara dayanarak şunları yap:
 1. Teknik SEO değerlendirmesi
 2. İçerik optimizasyon önerileri
 3. Sayfa hızı iyileştirme tavsiyeleri
@@ -219,8 +485,38 @@ Audit Sonuçları:
 5. Meta tag optimizasyon önerileri
 6. Yapısal veri (Schema) önerileri
 
-Markdown formatında, aksiyon odaklı yaz."""}],
+Markdown formatında, aksiyon odaklı yaz."""
+
+
+def _seo_params(url, audit_data):
+    """messages.create parameters (minus model) of an SEO recommendations request."""
+    return {"max_tokens": 2048, **cached_prompt(SEO_SYSTEM, f"Site: {url}\nAudit Sonuçları:\n{seo_context(audit_data)}")}
+
+
+def generate_seo_recommendations(url, audit_data, force_refresh=False):
+    """Generate SEO recommendations based on audit data."""
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        return "API yapılandırılmamış"
+
+    try:
+        response = create_message(
+            "seo",
+            cache=True,
+            force_refresh=force_refresh,
+            **_seo_params(url, audit_data),
         )
         return response.content[0].text
     except Exception as e:
         return f"SEO analiz hatası: {str(e)}"
+
+
+def generate_seo_recommendations_stream(url, audit_data, force_refresh=False):
+    """generate_seo_recommendations() as a generator of text deltas (for st.write_stream)."""
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        yield "API yapılandırılmamış"
+        return
+
+    try:
+        yield from stream_message("seo", cache=True, force_refresh=force_refresh, **_seo_params(url, audit_data))
+    except Exception as e:
+        yield f"\n\nSEO analiz hatası: {str(e)}"
@@ -0,0 +1,233 @@
+"""Tolerant JSON Extraction - Incremental Parsing, Truncation Repair & Schema Coercion for AI Responses"""
+import json
+import re
+
+OPENERS = {"{": "}", "[": "]"}
+# Most cut points tried when repairing a truncated value, newest first
+MAX_REPAIR_CUTS = 200
+
+
+def _scan(text):
+    """(open bracket stack, inside a string?, cut points) for a JSON fragment.
+
+    Cut points are positions just before a comma or just after an opening
+    bracket (outside strings): places where the value can be closed cleanly.
+    """
+    stack, cuts = [], []
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in OPENERS:
+            stack.append(ch)
+            cuts.append(i + 1)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            cuts.append(i)
+    return stack, in_string, cuts
+
+
+def repair_json(text):
+    """Parse a truncated JSON value by closing its open string and brackets.
+
+    If the tail is unusable (a dangling key, half a number) it is cut back to the
+    last comma or opening bracket and retried, keeping as much of the value as possible.
+    Returns None when nothing parses.
+    """
+    _, _, cuts = _scan(text)
+    for cut in [len(text)] + cuts[::-1][:MAX_REPAIR_CUTS]:
+        candidate = text[:cut]
+        stack, in_string, _ = _scan(candidate)
+        if in_string:
+            candidate += '"'
+        candidate = candidate.rstrip().rstrip(",")
+        if candidate.endswith(":"):
+            continue
+        candidate += "".join(OPENERS[c] for c in reversed(stack))
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+class JSONExtractor:
+    """Finds the first complete JSON object or array in text fed chunk by chunk (e.g. a token stream).
+
+    Prose and Markdown fences around the value are ignored. feed() returns the value
+    as soon as it is complete; close() returns it or, for a truncated response, the repaired value.
+    """
+
+    def __init__(self):
+        self._reset()
+        self.value = None
+        self.done = False
+        self.repaired = False
+
+    def _reset(self):
+        self.buffer = []
+        self.stack = []
+        self.in_string = self.escape = False
+
+    def feed(self, chunk):
+        pending = chunk
+        while pending and not self.done:
+            pending = self._consume(pending)
+        return self.value
+
+    def _consume(self, chunk):
+        """Scan `chunk`; returns text still to scan when a candidate failed to parse, else ""."""
+        for i, ch in enumerate(chunk):
+            if not self.stack:
+                if ch in OPENERS:
+                    self.stack.append(ch)
+                    self.buffer.append(ch)
+                continue
+            self.buffer.append(ch)
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in OPENERS:
+                self.stack.append(ch)
+            elif ch in "}]":
+                self.stack.pop()
+                if not self.stack:
+                    text = "".join(self.buffer)
+                    try:
+                        self.value = json.loads(text, strict=False)
+                        self.done = True
+                        return ""
+                    except json.JSONDecodeError:
+                        # Not JSON after all (e.g. "{placeholder}" in prose): rescan after its opening bracket
+                        self._reset()
+                        return text[1:] + chunk[i + 1:]
+        return ""
+
+    def close(self):
+        """The extracted value, repairing a truncated one; None if the text held no JSON."""
+        if not self.done and self.buffer:
+            self.value = repair_json("".join(self.buffer))
+            self.done = self.repaired = self.value is not None
+        return self.value
+
+
+def extract_json(text):
+    """(value, repaired) for the first JSON object/array in `text`; value is None if there is none."""
+    extractor = JSONExtractor()
+    extractor.feed(text or "")
+    return extractor.close(), extractor.repaired
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SCHEMAS
+# ═══════════════════════════════════════════════════════════════
+# A schema is a type (str, int, float), a one-item list [item schema] or a
+# dict {key: schema}. Values are coerced to it; missing keys get empty defaults.
+
+STRATEGY_SCHEMA = {
+    "analysis": str,
+    "recommendations": [{"priority": str, "category": str, "title": str, "description": str,
+                         "expected_impact": str}],
+    "budget_allocation": [{"campaign_name": str, "current_budget": float, "suggested_budget": float,
+                           "reason": str}],
+    "kpi_targets": {"target_cpa": float, "target_roas": float, "target_ctr": float, "target_conv_rate": float},
+    "negative_keywords": [str],
+    "new_keyword_suggestions": [{"keyword": str, "match_type": str, "estimated_cpc": float, "reason": str}],
+    "action_plan": [{"week": int, "actions": [str]}],
+}
+
+AD_COPY_SCHEMA = [{"variant": str, "headlines": [str], "descriptions": [str], "strategy": str}]
+
+AD_ASSET_SCHEMA = {"headlines": [str], "descriptions": [str]}
+
+
+def _default(schema):
+    if isinstance(schema, dict):
+        return {key: _default(sub) for key, sub in schema.items()}
+    if isinstance(schema, list):
+        return []
+    return schema()
+
+
+def _number(value):
+    """Numbers as the model sometimes writes them: "₺1.250,50", "%3,2", "12 TL"."""
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, (int, float)):
+        return value
+    text = re.sub(r"[^\d,.\-]", "", str(value))
+    if re.fullmatch(r"-?\d{1,3}(\.\d{3})+", text):
+        # "1.250" / "2.500.000": Turkish thousands grouping, not a decimal point
+        return float(text.replace(".", ""))
+    if "," in text and "." in text:
+        text = text.replace(".", "").replace(",", ".") if text.rfind(",") > text.rfind(".") else text.replace(",", "")
+    else:
+        text = text.replace(",", ".")
+    return float(text)
+
+
+def coerce(value, schema, path="", errors=None):
+    """Coerce `value` to `schema`; returns (value, errors) with one message per fixed-up field."""
+    errors = [] if errors is None else errors
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            errors.append(f"{path or 'kök'}: nesne bekleniyordu")
+            return _default(schema), errors
+        result = dict(value)
+        for key, sub in schema.items():
+            if key in value:
+                result[key], _ = coerce(value[key], sub, f"{path}.{key}".lstrip("."), errors)
+            else:
+                errors.append(f"{path}.{key}".lstrip(".") + ": eksik")
+                result[key] = _default(sub)
+        return result, errors
+    if isinstance(schema, list):
+        if isinstance(value, dict):
+            # {"variants": [...]} style wrappers around the expected list
+            value = next((v for v in value.values() if isinstance(v, list)), None)
+        if not isinstance(value, list):
+            errors.append(f"{path or 'kök'}: liste bekleniyordu")
+            return [], errors
+        item_schema = schema[0]
+        items = []
+        for i, item in enumerate(value):
+            if isinstance(item_schema, dict) and not isinstance(item, dict):
+                errors.append(f"{path}[{i}]: geçersiz öğe atlandı")
+                continue
+            items.append(coerce(item, item_schema, f"{path}[{i}]", errors)[0])
+        return items, errors
+    if schema is str:
+        if isinstance(value, str):
+            return value, errors
+        errors.append(f"{path}: metin bekleniyordu")
+        return ("" if value is None else str(value)), errors
+    try:
+        number = _number(value)
+        return (int(number) if schema is int else float(number)), errors
+    except (TypeError, ValueError):
+        errors.append(f"{path}: sayı bekleniyordu")
+        return schema(), errors
+
+
+def parse_ai_json(text, schema):
+    """Extract, repair and coerce a model response; returns (value or None, {"repaired", "schema_errors"})."""
+    value, repaired = extract_json(text)
+    if value is None:
+        return None, {"repaired": False, "schema_errors": []}
+    value, errors = coerce(value, schema)
+    return value, {"repaired": repaired, "schema_errors": errors}
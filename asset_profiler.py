@@ -0,0 +1,122 @@
+"""Asset Weight Profiler - Deduplicated Concurrent Sizing, Page Weight & Compression Checks"""
+from collections import Counter
+from urllib.parse import urljoin
+from config import Config
+from link_checker import LinkChecker, normalize_link
+
+ASSET_KINDS = ("css", "js", "image")
+# Text formats that should be served gzip/brotli-compressed
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/x-javascript",
+                      "application/json", "application/xml", "image/svg+xml")
+# Below roughly one TCP packet compression saves nothing worth reporting
+COMPRESS_MIN_BYTES = 1400
+
+
+def extract_assets(soup, base_url):
+    """CSS, JS and image URLs referenced by a page: [{"url", "kind", "blocking"}], first occurrence wins."""
+    assets = {}
+
+    def add(ref, kind, blocking=False):
+        if not ref or ref.startswith("data:"):
+            return
+        url = normalize_link(urljoin(base_url, ref))
+        if url and url not in assets:
+            assets[url] = {"url": url, "kind": kind, "blocking": blocking}
+
+    # Same render-blocking rules as _analyze_page_speed
+    for link in soup.find_all("link", attrs={"rel": "stylesheet"}, href=True):
+        add(link["href"], "css", not link.get("media") or link.get("media") == "all")
+    for script in soup.find_all("script", src=True):
+        add(script["src"], "js", not script.get("async") and not script.get("defer"))
+    for img in soup.find_all("img"):
+        add(img.get("src") or img.get("data-src"), "image")
+    return list(assets.values())
+
+
+def _is_compressible(kind, content_type):
+    if content_type:
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+    return kind in ("css", "js")
+
+
+class AssetProfiler:
+    """Sizes every unique asset once (through LinkChecker's cache) and totals page weight."""
+
+    def __init__(self, headers=None, checker=None, max_urls=None):
+        self.checker = checker or LinkChecker(headers=headers)
+        self.max_urls = max_urls or Config.SEO_ASSET_MAX_URLS
+
+    def profile(self, pages):
+        """Weight report for {page url: {"html_bytes": int, "assets": [extract_assets() items]}}."""
+        unique = {}
+        for page in pages.values():
+            for asset in page.get("assets", []):
+                if len(unique) >= self.max_urls:
+                    break
+                unique.setdefault(asset["url"], asset)
+        probes = self.checker.check(list(unique)) if unique else {}
+
+        sized = {}
+        for url, asset in unique.items():
+            probe = probes.get(url, {})
+            content_type = probe.get("content_type", "")
+            size = probe.get("content_length")
+            sized[url] = {
+                "url": url,
+                "kind": asset["kind"],
+                "status": probe.get("status"),
+                "bytes": size,
+                "content_type": content_type,
+                "compressed": bool(probe.get("content_encoding")),
+                "compressible": _is_compressible(asset["kind"], content_type),
+            }
+
+        image_limit = Config.SEO_IMAGE_MAX_KB * 1024
+        oversized = [a for a in sized.values()
+                     if a["kind"] == "image" and (a["bytes"] or 0) > image_limit]
+        uncompressed = [a for a in sized.values()
+                        if a["compressible"] and not a["compressed"] and (a["bytes"] or 0) > COMPRESS_MIN_BYTES]
+        unknown = sum(1 for a in sized.values() if a["bytes"] is None and a["status"] not in (None, "error", "timeout"))
+
+        page_weights = []
+        for page_url, page in pages.items():
+            by_kind = Counter()
+            blocking_bytes = 0
+            for asset in page.get("assets", []):
+                size = (sized.get(asset["url"]) or {}).get("bytes") or 0
+                by_kind[asset["kind"]] += size
+                if asset.get("blocking"):
+                    blocking_bytes += size
+            html_bytes = page.get("html_bytes", 0)
+            page_weights.append({
+                "url": page_url,
+                "total_bytes": html_bytes + sum(by_kind.values()),
+                "html_bytes": html_bytes,
+                **{f"{kind}_bytes": by_kind[kind] for kind in ASSET_KINDS},
+                "blocking_bytes": blocking_bytes,
+                "asset_count": len(page.get("assets", [])),
+            })
+        page_weights.sort(key=lambda p: p["total_bytes"], reverse=True)
+        weight_limit = Config.SEO_PAGE_WEIGHT_MAX_KB * 1024
+        heavy = [p for p in page_weights if p["total_bytes"] > weight_limit]
+
+        def largest(assets, n):
+            return sorted(assets, key=lambda a: a["bytes"] or 0, reverse=True)[:n]
+
+        return {
+            "pages_profiled": len(page_weights),
+            "unique_assets": len(sized),
+            "asset_bytes": sum(a["bytes"] or 0 for a in sized.values()),
+            "unknown_size_count": unknown,
+            "page_weights": page_weights[:50],
+            "avg_page_bytes": int(sum(p["total_bytes"] for p in page_weights) / max(1, len(page_weights))),
+            "max_page_bytes": page_weights[0]["total_bytes"] if page_weights else 0,
+            "heavy_pages": [p["url"] for p in heavy][:50],
+            "heavy_page_count": len(heavy),
+            "largest_assets": largest(sized.values(), 20),
+            "oversized_images": largest(oversized, 50),
+            "oversized_image_count": len(oversized),
+            "uncompressed_assets": largest(uncompressed, 50),
+            "uncompressed_count": len(uncompressed),
+            "uncompressed_bytes": sum(a["bytes"] for a in uncompressed),
+        }
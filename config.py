@@ -25,14 +25,71 @@ class Config:
     GOOGLE_ADS_REFRESH_TOKEN = _get_secret("GOOGLE_ADS_REFRESH_TOKEN")
     GOOGLE_ADS_LOGIN_CUSTOMER_ID = _get_secret("GOOGLE_ADS_LOGIN_CUSTOMER_ID")
     GOOGLE_ADS_API_VERSION = "v18"
+    GOOGLE_ADS_MUTATE_CHUNK = 1000  # operations per mutate request
 
     # Anthropic Claude
     ANTHROPIC_API_KEY = _get_secret("ANTHROPIC_API_KEY")
     ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+    AI_TIMEOUT = 120  # seconds to wait for a response
+    AI_CONNECT_TIMEOUT = 10
+    AI_MAX_RETRIES = 2  # SDK retries with backoff on connection errors, 429 and 5xx
+    AI_MAX_CONCURRENCY = 4  # simultaneous requests per process
+    AI_POOL_SIZE = 10  # pooled keep-alive connections
+    AI_CACHE_PATH = "ai_response_cache.db"
+    AI_CACHE_TTL_HOURS = 24  # same prompt within this window is answered from the cache
+    AI_CACHE_MAX_ENTRIES = 500  # least recently used responses are evicted beyond this
+    AI_BATCH_CONCURRENCY = 8  # in-flight requests during portfolio strategy runs
+    AI_BATCH_MAX_ATTEMPTS = 6  # per client, on rate limits, overload and connection errors
+    # Prompt context budgets (estimated input tokens; most relevant data is kept first)
+    AI_CHARS_PER_TOKEN = 3.5
+    AI_CONTEXT_TOKENS_STRATEGY = 3000
+    AI_CONTEXT_TOKENS_PERFORMANCE = 1500
+    AI_CONTEXT_TOKENS_SEO = 4000
+    AI_PROMPT_CACHE_MIN_TOKENS = 1024  # shortest prefix the API will cache (Sonnet)
+    AI_BATCH_BACKEND = "anthropic"  # offline bulk jobs: "anthropic" (Message Batches API) or "local" (test stand-in)
+    AI_BATCH_POLL_SECONDS = 60
+    # Responsive Search Ads: Google's per-ad asset limits
+    AD_HEADLINE_MAX_CHARS = 30
+    AD_DESCRIPTION_MAX_CHARS = 90
+    AD_RSA_HEADLINES = 15  # generated per product (3 minimum to publish)
+    AD_RSA_DESCRIPTIONS = 4  # (2 minimum to publish)
+    AD_COPY_REPAIR_ROUNDS = 2  # re-requests for assets that fail local validation
 
     # Database
     DATABASE_PATH = "otonom_ads_pro.db"
 
+    # SEO HTTP cache (conditional requests between repeat audits)
+    HTTP_CACHE_PATH = "seo_http_cache.db"
+    HTTP_CACHE_MAX_AGE_DAYS = 60
+    HTTP_POOL_SIZE = 32
+    SEO_QUICK_AUDIT_MAX_STALE = 3600  # quick audits reuse a cached home page this recent (seconds)
+
+    # Multi-page crawl (page HTML is analyzed in worker processes above the threshold)
+    SEO_CRAWL_MAX_PAGES = 5
+    SEO_PARSE_WORKERS = 0  # 0 = one per CPU core
+    SEO_PARSE_CHUNK_SIZE = 8
+    SEO_PARSE_PROCESS_MIN_PAGES = 20
+
+    # Multi-site benchmarking
+    SEO_BENCHMARK_MAX_SITES = 11
+
+    # Nightly batch audit of every client website (seo_batch.py)
+    SEO_BATCH_WORKERS = 16  # sites audited at once
+    SEO_BATCH_PER_DOMAIN = 1  # concurrent audits of one domain
+    SEO_BATCH_DOMAIN_DELAY = 2.0  # seconds between audits starting on the same domain
+    SEO_BATCH_FLUSH_EVERY = 25  # audits written per database transaction
+
+    # Link checking (HEAD probes across crawled pages)
+    LINK_CHECK_MAX_WORKERS = 32
+    LINK_CHECK_PER_HOST = 4
+    LINK_CHECK_TIMEOUT = 5
+    LINK_CHECK_TTL = 3600
+
+    # Asset weight (CSS/JS/image sizes from the same HEAD probes)
+    SEO_ASSET_MAX_URLS = 2000  # unique asset URLs sized per audit
+    SEO_IMAGE_MAX_KB = 200
+    SEO_PAGE_WEIGHT_MAX_KB = 3000
+
     # Automation Thresholds
     BUDGET_OVERSPEND_THRESHOLD = 0.15
     BUDGET_UNDERSPEND_THRESHOLD = 0.25
@@ -102,6 +102,28 @@ def init_db():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
 
+    -- Portfolio strategy runs; items not yet 'done' are picked up again on resume
+    CREATE TABLE IF NOT EXISTS strategy_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        label TEXT,
+        custom_prompt TEXT,
+        status TEXT DEFAULT 'running',
+        total INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS strategy_run_items (
+        run_id INTEGER NOT NULL REFERENCES strategy_runs(id) ON DELETE CASCADE,
+        client_id INTEGER NOT NULL REFERENCES clients(id),
+        status TEXT DEFAULT 'pending',
+        strategy_id INTEGER REFERENCES strategies(id),
+        attempts INTEGER DEFAULT 0,
+        error TEXT,
+        updated_at TIMESTAMP,
+        PRIMARY KEY (run_id, client_id)
+    );
+
     CREATE TABLE IF NOT EXISTS action_logs (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         client_id INTEGER,
@@ -154,6 +176,44 @@ def init_db():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
 
+    CREATE TABLE IF NOT EXISTS seo_page_audits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        audit_id INTEGER REFERENCES seo_audits(id),
+        client_id INTEGER,
+        url TEXT,
+        content_hash TEXT,
+        status_code INTEGER,
+        score REAL,
+        issues TEXT,
+        result TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_seo_page_audits_audit ON seo_page_audits(audit_id);
+    CREATE INDEX IF NOT EXISTS idx_seo_audits_url ON seo_audits(url);
+
+    -- One row per issue; severity is the index into seo_rules.SEVERITIES (0 = critical)
+    CREATE TABLE IF NOT EXISTS seo_issues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        audit_id INTEGER NOT NULL REFERENCES seo_audits(id) ON DELETE CASCADE,
+        page_id INTEGER REFERENCES seo_page_audits(id) ON DELETE CASCADE,
+        section TEXT,
+        code TEXT,
+        severity INTEGER NOT NULL CHECK (severity BETWEEN 0 AND 2),
+        category TEXT,
+        message TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_seo_issues_audit ON seo_issues(audit_id);
+    CREATE INDEX IF NOT EXISTS idx_seo_issues_code ON seo_issues(code);
+
+    -- Section results of an audit without their issues, as zlib-compressed JSON
+    CREATE TABLE IF NOT EXISTS seo_audit_sections (
+        audit_id INTEGER NOT NULL REFERENCES seo_audits(id) ON DELETE CASCADE,
+        section TEXT NOT NULL,
+        score REAL,
+        details BLOB,
+        PRIMARY KEY (audit_id, section)
+    );
+
     CREATE TABLE IF NOT EXISTS search_terms (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         client_id INTEGER,
@@ -179,11 +239,54 @@ def init_db():
         approved_at TIMESTAMP,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
+
+    -- Bulk AI jobs submitted to a batch backend, and where each request's result went
+    CREATE TABLE IF NOT EXISTS ai_batch_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        batch_id TEXT,
+        backend TEXT,
+        kind TEXT,
+        status TEXT DEFAULT 'submitted',
+        request_count INTEGER DEFAULT 0,
+        succeeded INTEGER DEFAULT 0,
+        errored INTEGER DEFAULT 0,
+        submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ended_at TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS ai_batch_items (
+        job_id INTEGER NOT NULL REFERENCES ai_batch_jobs(id) ON DELETE CASCADE,
+        custom_id TEXT NOT NULL,
+        target_id INTEGER,
+        params TEXT,
+        status TEXT DEFAULT 'pending',
+        result_id INTEGER,
+        error TEXT,
+        PRIMARY KEY (job_id, custom_id)
+    );
+
+    -- Responses of the local batch backend, so a later process can poll them
+    CREATE TABLE IF NOT EXISTS ai_local_batch_results (
+        batch_id TEXT NOT NULL,
+        custom_id TEXT NOT NULL,
+        response TEXT,
+        error TEXT,
+        PRIMARY KEY (batch_id, custom_id)
+    );
     """)
+    add_column(conn, "seo_audits", "ai_recommendations", "TEXT")
+    add_column(conn, "seo_audits", "ai_generated_at", "TIMESTAMP")
     conn.commit()
     conn.close()
 
 
+def add_column(conn, table, column, decl):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists (migrates databases created earlier)."""
+    existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in existing:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
 # ── CRUD Helpers ──
 
 def insert(table, **kwargs):
@@ -197,6 +300,20 @@ def insert(table, **kwargs):
     return last_id
 
 
+def insert_many(table, rows):
+    """Insert many rows (dicts with identical keys) in a single transaction."""
+    if not rows:
+        return 0
+    conn = get_conn()
+    cols = list(rows[0].keys())
+    placeholders = ", ".join(["?"] * len(cols))
+    conn.executemany(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})",
+                     [[r.get(c) for c in cols] for r in rows])
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
 def fetch_all(table, where=None, params=None, order_by="id DESC", limit=100):
     conn = get_conn()
     q = f"SELECT * FROM {table}"
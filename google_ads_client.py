@@ -369,6 +369,50 @@ def update_ad_group_bid(customer_id, ad_group_id, new_cpc_micros):
     return execute_mutate(customer_id, [op], "AdGroupService", "mutate_ad_groups", client)
 
 
+def build_rsa_operations(client, customer_id, ads, status="PAUSED"):
+    """AdGroupAdOperations creating Responsive Search Ads.
+
+    `ads` are dicts {"ad_group_id", "final_url", "headlines", "descriptions", "path1", "path2"}
+    as produced by ad_copy_batch.rsa_ads(). New ads are paused by default for review.
+    """
+    service = client.get_service("AdGroupAdService")
+    cid = str(customer_id).replace("-", "")
+    operations = []
+
+    for ad in ads:
+        op = client.get_type("AdGroupAdOperation")
+        ad_group_ad = op.create
+        ad_group_ad.ad_group = service.ad_group_path(cid, ad["ad_group_id"])
+        ad_group_ad.status = client.enums.AdGroupAdStatusEnum[status].value
+        ad_group_ad.ad.final_urls.append(ad["final_url"])
+        rsa = ad_group_ad.ad.responsive_search_ad
+        for text in ad["headlines"]:
+            asset = client.get_type("AdTextAsset")
+            asset.text = text
+            rsa.headlines.append(asset)
+        for text in ad["descriptions"]:
+            asset = client.get_type("AdTextAsset")
+            asset.text = text
+            rsa.descriptions.append(asset)
+        if ad.get("path1"):
+            rsa.path1 = ad["path1"]
+        if ad.get("path2"):
+            rsa.path2 = ad["path2"]
+        operations.append(op)
+    return operations
+
+
+def create_responsive_search_ads(customer_id, ads, status="PAUSED"):
+    """Create Responsive Search Ads in chunks of GOOGLE_ADS_MUTATE_CHUNK operations; returns the responses."""
+    client = get_client()
+    if client is None:
+        raise Exception("Google Ads API yapılandırılmamış")
+    operations = build_rsa_operations(client, customer_id, ads, status)
+    chunk = Config.GOOGLE_ADS_MUTATE_CHUNK
+    return [execute_mutate(customer_id, operations[i:i + chunk], "AdGroupAdService", "mutate_ad_group_ads", client)
+            for i in range(0, len(operations), chunk)]
+
+
 def get_accessible_customers():
     """List all accessible customer IDs under MCC."""
     client = get_client()
@@ -0,0 +1,199 @@
+"""Persistent HTTP Cache - Conditional Requests (ETag / Last-Modified) for SEO Audits"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from config import Config
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide pooled requests.Session shared by page fetches and link probes."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=Config.HTTP_POOL_SIZE, pool_maxsize=Config.HTTP_POOL_SIZE)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def content_hash(resp):
+    """SHA-256 of a response body (memoized on the response object)."""
+    digest = getattr(resp, "content_hash", None)
+    if digest is None:
+        digest = hashlib.sha256(resp.content or b"").hexdigest()
+        resp.content_hash = digest
+    return digest
+
+
+class HTTPCache:
+    """On-disk cache of page bodies + validators, and of analysis results per body hash."""
+
+    def __init__(self, path=None, max_age_days=None):
+        self.path = path or Config.HTTP_CACHE_PATH
+        self.max_age_days = max_age_days or Config.HTTP_CACHE_MAX_AGE_DAYS
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _conn(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        with self._lock:
+            conn = self._conn()
+            conn.executescript("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                encoding TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                fetched_at REAL,
+                validated_at REAL
+            );
+
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                url TEXT,
+                section TEXT,
+                content_hash TEXT,
+                result TEXT,
+                created_at REAL,
+                PRIMARY KEY (url, section)
+            );
+            """)
+            cutoff = time.time() - self.max_age_days * 86400
+            conn.execute("DELETE FROM http_cache WHERE validated_at < ?", [cutoff])
+            conn.execute("DELETE FROM analysis_cache WHERE created_at < ?", [cutoff])
+            conn.commit()
+            conn.close()
+
+    # ── Page bodies ──
+
+    def lookup(self, url):
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM http_cache WHERE url = ?", [url]).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def store(self, url, resp):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        now = time.time()
+        with self._lock:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, final_url, status_code, headers, encoding, body, "
+                "etag, last_modified, content_hash, fetched_at, validated_at) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                [url, resp.url, resp.status_code, json.dumps(dict(resp.headers)), resp.encoding,
+                 zlib.compress(resp.content or b""), etag, last_modified, content_hash(resp), now, now])
+            conn.commit()
+            conn.close()
+
+    @staticmethod
+    def _cached_response(url, entry, headers):
+        resp = requests.Response()
+        resp.status_code = entry["status_code"]
+        resp._content = zlib.decompress(entry["body"])
+        resp.headers = headers
+        resp.url = entry["final_url"] or url
+        resp.encoding = entry["encoding"]
+        resp.elapsed = timedelta(0)
+        resp.content_hash = entry["content_hash"]
+        resp.from_cache = True
+        return resp
+
+    def _revalidated(self, url, entry, not_modified):
+        """Build a Response from the cached body after a 304, merging refreshed headers."""
+        headers = CaseInsensitiveDict(json.loads(entry["headers"] or "{}"))
+        for key, value in not_modified.headers.items():
+            if key.lower() not in ("content-length", "content-encoding", "transfer-encoding"):
+                headers[key] = value
+        with self._lock:
+            conn = self._conn()
+            conn.execute("UPDATE http_cache SET headers = ?, validated_at = ? WHERE url = ?",
+                         [json.dumps(dict(headers)), time.time(), url])
+            conn.commit()
+            conn.close()
+
+        resp = self._cached_response(url, entry, headers)
+        resp.elapsed = not_modified.elapsed
+        resp.request = not_modified.request
+        return resp
+
+    def get(self, url, headers=None, timeout=15, max_stale=0):
+        """GET with If-None-Match / If-Modified-Since; a 304 is answered from the cached body.
+
+        A body validated less than `max_stale` seconds ago is returned without any request.
+        """
+        entry = self.lookup(url)
+        if entry and max_stale and time.time() - entry["validated_at"] < max_stale:
+            return self._cached_response(url, entry, CaseInsensitiveDict(json.loads(entry["headers"] or "{}")))
+        req_headers = dict(headers or {})
+        if entry:
+            if entry["etag"]:
+                req_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                req_headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = get_session().get(url, headers=req_headers, timeout=timeout, allow_redirects=True)
+        if resp.status_code == 304 and entry:
+            return self._revalidated(url, entry, resp)
+
+        resp.from_cache = False
+        if resp.status_code == 200:
+            self.store(url, resp)
+        return resp
+
+    # ── Analysis results ──
+
+    def get_analysis(self, url, section, digest):
+        """Return the stored section result if it was computed from the same body hash."""
+        conn = self._conn()
+        row = conn.execute("SELECT content_hash, result FROM analysis_cache WHERE url = ? AND section = ?",
+                           [url, section]).fetchone()
+        conn.close()
+        if row and row["content_hash"] == digest:
+            return json.loads(row["result"])
+        return None
+
+    def store_analysis(self, url, section, digest, result):
+        with self._lock:
+            conn = self._conn()
+            conn.execute("INSERT OR REPLACE INTO analysis_cache (url, section, content_hash, result, created_at) "
+                         "VALUES (?,?,?,?,?)",
+                         [url, section, digest, json.dumps(result, ensure_ascii=False), time.time()])
+            conn.commit()
+            conn.close()
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Process-wide HTTPCache instance (None if the cache file cannot be opened)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = HTTPCache()
+            except sqlite3.Error:
+                return None
+        return _shared_cache
@@ -0,0 +1,129 @@
+"""Concurrent Link Checker - Deduplicated HEAD Probes, Per-Host Limits & TTL Cache"""
+import threading
+import time
+import concurrent.futures
+import requests
+from collections import OrderedDict, defaultdict, deque
+from urllib.parse import urlparse, urldefrag
+from config import Config
+from http_cache import get_session
+
+# url -> (checked_at, result), least recently used first; shared by every checker in the process
+_result_cache = OrderedDict()
+_cache_lock = threading.Lock()
+MAX_CACHED_RESULTS = 50000
+
+
+def normalize_link(url):
+    """Drop the #fragment; returns None for non-HTTP links (mailto:, tel:, javascript:)."""
+    url = urldefrag(url)[0]
+    return url if urlparse(url).scheme in ("http", "https") else None
+
+
+def _content_length(resp):
+    """Body size from Content-Length, or from Content-Range on a ranged GET."""
+    content_range = resp.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    length = resp.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def probe_url(url, headers=None, timeout=None):
+    """HEAD a URL, falling back to a one-byte ranged GET when HEAD is refused."""
+    session = get_session()
+    timeout = timeout or Config.LINK_CHECK_TIMEOUT
+    start = time.time()
+    method = "HEAD"
+    try:
+        resp = session.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        if resp.status_code in (400, 403, 405, 501):
+            method = "GET"
+            ranged = dict(headers or {}, Range="bytes=0-0")
+            resp = session.get(url, headers=ranged, timeout=timeout, allow_redirects=True, stream=True)
+            resp.close()
+    except requests.Timeout:
+        return {"url": url, "status": "timeout", "ok": False, "method": method,
+                "elapsed": round(time.time() - start, 2)}
+    except Exception:
+        return {"url": url, "status": "error", "ok": False, "method": method,
+                "elapsed": round(time.time() - start, 2)}
+
+    status = 200 if resp.status_code == 206 else resp.status_code
+    return {
+        "url": url,
+        "status": status,
+        "ok": status < 400,
+        "method": method,
+        "final_url": resp.url,
+        "redirects": len(resp.history),
+        "content_length": _content_length(resp),
+        "content_type": resp.headers.get("Content-Type", "").split(";")[0].strip(),
+        "content_encoding": resp.headers.get("Content-Encoding", ""),
+        "elapsed": round(time.time() - start, 2),
+    }
+
+
+def _interleave_by_host(urls):
+    """Round-robin URLs across hosts so per-host limits don't stall the pool."""
+    by_host = OrderedDict()
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc, deque()).append(url)
+    queues = list(by_host.values())
+    ordered = []
+    while queues:
+        for q in queues:
+            ordered.append(q.popleft())
+        queues = [q for q in queues if q]
+    return ordered
+
+
+class LinkChecker:
+    """Checks many URLs concurrently; each URL is probed at most once per TTL window."""
+
+    def __init__(self, headers=None, max_workers=None, per_host=None, timeout=None, ttl=None):
+        self.headers = headers
+        self.max_workers = max_workers or Config.LINK_CHECK_MAX_WORKERS
+        self.per_host = per_host or Config.LINK_CHECK_PER_HOST
+        self.timeout = timeout or Config.LINK_CHECK_TIMEOUT
+        self.ttl = Config.LINK_CHECK_TTL if ttl is None else ttl
+        self._host_slots = defaultdict(lambda: threading.Semaphore(self.per_host))
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url):
+        with self._slots_lock:
+            return self._host_slots[urlparse(url).netloc]
+
+    def _probe(self, url):
+        with self._slot(url):
+            result = probe_url(url, headers=self.headers, timeout=self.timeout)
+        with _cache_lock:
+            _result_cache[url] = (time.time(), result)
+            _result_cache.move_to_end(url)
+            while len(_result_cache) > MAX_CACHED_RESULTS:
+                _result_cache.popitem(last=False)
+        return result
+
+    def check(self, urls):
+        """Return {url: result} for the unique HTTP(S) URLs in `urls`."""
+        unique = list(OrderedDict.fromkeys(u for u in map(normalize_link, urls) if u))
+        results = {}
+        pending = []
+        now = time.time()
+        with _cache_lock:
+            for url in unique:
+                cached = _result_cache.get(url)
+                if cached and now - cached[0] < self.ttl:
+                    results[url] = cached[1]
+                    _result_cache.move_to_end(url)
+                else:
+                    pending.append(url)
+
+        if pending:
+            workers = min(self.max_workers, len(pending))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(self._probe, _interleave_by_host(pending)):
+                    results[result["url"]] = result
+        return {url: results[url] for url in unique}
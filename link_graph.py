@@ -0,0 +1,163 @@
+"""Internal Link Graph - CSR Adjacency, PageRank, Click Depth, Orphan Pages & Redirect Chains"""
+from array import array
+import numpy as np
+
+
+class LinkGraph:
+    """Directed internal link graph; edges are compacted into CSR arrays by build()."""
+
+    def __init__(self):
+        self.index = {}  # url -> node id
+        self.urls = []
+        self._src = array("i")
+        self._dst = array("i")
+        self.indptr = None
+        self.indices = None
+
+    def node(self, url):
+        node_id = self.index.get(url)
+        if node_id is None:
+            node_id = self.index[url] = len(self.urls)
+            self.urls.append(url)
+        return node_id
+
+    def add_links(self, source, targets):
+        src = self.node(source)
+        for target in targets:
+            dst = self.node(target)
+            if dst != src:
+                self._src.append(src)
+                self._dst.append(dst)
+
+    def build(self):
+        """Deduplicate edges and lay them out as indptr/indices (row = source page)."""
+        n = len(self.urls)
+        src = np.frombuffer(self._src, dtype=np.int32).astype(np.int64)
+        dst = np.frombuffer(self._dst, dtype=np.int32).astype(np.int64)
+        keys = np.unique(src * n + dst)
+        self.indices = (keys % n).astype(np.int32)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // n, minlength=n), out=self.indptr[1:])
+        self._src, self._dst = array("i"), array("i")
+        return self
+
+    @property
+    def node_count(self):
+        return len(self.urls)
+
+    @property
+    def edge_count(self):
+        return int(self.indptr[-1])
+
+    def in_degree(self):
+        return np.bincount(self.indices, minlength=self.node_count)
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def pagerank(self, damping=0.85, tol=1e-6, max_iter=100):
+        """PageRank by power iteration; rank of dangling pages is spread uniformly."""
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0)
+        out_deg = self.out_degree()
+        sources = np.repeat(np.arange(n), out_deg)
+        dangling = out_deg == 0
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            contrib = rank / np.maximum(out_deg, 1)
+            new = np.bincount(self.indices, weights=contrib[sources], minlength=n)
+            new = damping * (new + rank[dangling].sum() / n) + (1 - damping) / n
+            delta = np.abs(new - rank).sum()
+            rank = new
+            if delta < tol:
+                break
+        return rank
+
+    def click_depth(self, root):
+        """Links needed to reach each page from `root` (BFS); -1 if unreachable."""
+        depth = np.full(self.node_count, -1, dtype=np.int32)
+        if root not in self.index:
+            return depth
+        frontier = np.array([self.index[root]], dtype=np.int64)
+        depth[frontier] = 0
+        level = 0
+        while frontier.size:
+            level += 1
+            starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+            lengths = ends - starts
+            if not lengths.sum():
+                break
+            # Gather every neighbour of the frontier in one vectorized step
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            neighbours = np.unique(self.indices[np.repeat(starts, lengths) + offsets])
+            frontier = neighbours[depth[neighbours] == -1]
+            depth[frontier] = level
+        return depth
+
+
+def analyze_link_graph(root, page_links, sitemap_urls=(), redirects=None, top=20, sitemap_total=None):
+    """Build the internal link graph from crawled pages and report rank, depth, orphans and redirects.
+
+    page_links: {crawled page url: [internal link urls]}
+    redirects: {url: {"final_url", "hops", "chain"}} for internal URLs that redirect
+    sitemap_total: URLs in the whole sitemap when `sitemap_urls` is only part of it
+
+    A sitemap URL's missing in-links only mean something if the crawl covered the
+    sitemap; otherwise only crawled sitemap URLs are checked and orphan_scope is "partial".
+    """
+    redirects = redirects or {}
+
+    def resolve(url):
+        # Credit links to the page a redirect lands on
+        return redirects[url]["final_url"] if url in redirects else url
+
+    graph = LinkGraph()
+    graph.node(root)
+    for page, links in page_links.items():
+        graph.add_links(resolve(page), (resolve(u) for u in links))
+    for url in sitemap_urls:
+        graph.node(resolve(url))
+    graph.build()
+
+    rank = graph.pagerank()
+    depth = graph.click_depth(root)
+    in_deg = graph.in_degree()
+    urls = graph.urls
+
+    order = np.argsort(-rank)[:top]
+    reachable = depth[depth >= 0]
+    levels, counts = np.unique(reachable, return_counts=True)
+    root_id = graph.index[root]
+    sitemap_set = {resolve(u) for u in sitemap_urls}
+    crawled = {resolve(u) for u in page_links}
+    covered = (sitemap_total is None or len(sitemap_set) >= sitemap_total) and sitemap_set <= crawled
+    checked = sitemap_set & crawled
+    orphans = [u for u in checked if in_deg[graph.index[u]] == 0 and graph.index[u] != root_id]
+    deep = [urls[i] for i in np.flatnonzero(depth > 3)]
+    chains = sorted(({"url": url, **info} for url, info in redirects.items()),
+                    key=lambda r: r["hops"], reverse=True)
+
+    return {
+        "node_count": graph.node_count,
+        "edge_count": graph.edge_count,
+        "crawled_pages": len(page_links),
+        "top_pages": [{
+            "url": urls[i],
+            "pagerank": round(float(rank[i]) * graph.node_count, 3),  # 1.0 = average page
+            "in_links": int(in_deg[i]),
+            "depth": int(depth[i]),
+        } for i in order],
+        "depth_distribution": {int(level): int(count) for level, count in zip(levels, counts)},
+        "max_depth": int(reachable.max()) if reachable.size else 0,
+        "unreachable_count": int((depth < 0).sum()),
+        "deep_pages": deep[:50],
+        "deep_page_count": len(deep),
+        "orphan_pages": sorted(orphans)[:100],
+        "orphan_count": len(orphans),
+        "orphan_scope": "full" if covered else "partial",
+        "orphan_checked": len(checked),
+        "redirects": chains[:50],
+        "redirect_count": len(chains),
+        "redirect_chain_count": sum(1 for r in chains if r["hops"] > 1),
+    }
@@ -1,8 +1,11 @@
 """⚙️ Ayarlar - API Configuration & OAuth2 Setup"""
 import streamlit as st
 import os
+import pandas as pd
 from config import Config
 from database import init_db
+from ai_engine import create_message, ai_metrics
+from ai_cache import get_ai_cache
 
 init_db()
 
@@ -111,10 +114,9 @@ with tab2:
     # AI Test
     if st.button("🧪 AI Bağlantı Testi"):
         try:
-            import anthropic
-            api = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY or api_key)
-            response = api.messages.create(
-                model="claude-sonnet-4-20250514",
+            response = create_message(
+                "test",
+                api_key=Config.ANTHROPIC_API_KEY or api_key,
                 max_tokens=50,
                 messages=[{"role": "user", "content": "Merhaba, test mesajı. Kısa yanıt ver."}]
             )
@@ -122,6 +124,41 @@ with tab2:
         except Exception as e:
             st.error(f"❌ AI bağlantı hatası: {str(e)}")
 
+    # AI call metrics (this server process)
+    metrics = ai_metrics()
+    if metrics:
+        st.markdown("#### 📈 AI Çağrı Metrikleri")
+        st.caption(f"Ortak bağlantı havuzu: en fazla {Config.AI_MAX_CONCURRENCY} eşzamanlı istek, "
+                   f"{Config.AI_TIMEOUT} sn zaman aşımı, {Config.AI_MAX_RETRIES} yeniden deneme")
+        st.dataframe(pd.DataFrame(metrics).rename(columns={
+            "purpose": "Çağrı", "calls": "Adet", "errors": "Hata", "avg_latency": "Ort. Süre (sn)",
+            "p95_latency": "P95 Süre (sn)", "avg_first_token": "Ort. İlk Token (sn)",
+            "input_tokens": "Girdi Token", "output_tokens": "Çıktı Token",
+            "cache_read_tokens": "Önbellekten Okunan Token", "cache_write_tokens": "Önbelleğe Yazılan Token",
+        }), use_container_width=True, hide_index=True)
+
+    # AI response cache (persistent, shared by every process on this database file)
+    cache_stats = get_ai_cache().stats()
+    if cache_stats:
+        st.markdown("#### ♻️ AI Yanıt Önbelleği")
+        hits = sum(s["hits"] for s in cache_stats)
+        lookups = hits + sum(s["misses"] for s in cache_stats)
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.metric("İsabet Oranı", f"%{hits / lookups * 100:.1f}" if lookups else "-")
+        with c2:
+            st.metric("İsabet / Sorgu", f"{hits} / {lookups}")
+        with c3:
+            st.metric("Kayıtlı Yanıt", f"{sum(s['entries'] for s in cache_stats)} / {Config.AI_CACHE_MAX_ENTRIES}")
+        st.caption(f"Aynı model, istem ve parametrelerle yapılan çağrılar {Config.AI_CACHE_TTL_HOURS} saat "
+                   "boyunca önbellekten yanıtlanır; en uzun süredir kullanılmayanlar önce silinir.")
+        st.dataframe(pd.DataFrame(cache_stats).rename(columns={
+            "purpose": "Çağrı", "hits": "İsabet", "misses": "Iskalama", "hit_rate": "İsabet %", "entries": "Kayıt",
+        }), use_container_width=True, hide_index=True)
+        if st.button("🗑️ AI Önbelleğini Temizle"):
+            get_ai_cache().clear()
+            st.rerun()
+
 with tab3:
     st.markdown("### 🔐 OAuth2 Refresh Token Alma")
     st.caption("Google Ads API için refresh token almak üzere OAuth2 consent flow'u başlatın.")
@@ -23,6 +23,7 @@ if pending:
             "bid_change": "🎯",
             "budget_change": "💰",
             "campaign_status": "📋",
+            "responsive_search_ad": "✍️",
         }.get(action_type, "📌")
 
         with st.container():
@@ -1,9 +1,12 @@
 """🧠 AI Strateji Motoru - Claude Powered Strategy Engine"""
 import streamlit as st
 import json
+import pandas as pd
 from datetime import datetime
 from database import init_db, fetch_all, insert, log_action
-from ai_engine import generate_strategy, analyze_performance, generate_ad_copy
+from ai_engine import generate_strategy, analyze_performance_stream, generate_ad_copy
+from strategy_batch import run_portfolio_strategies, open_run, run_status
+from ad_copy_batch import catalog, generate_catalog, client_ad_groups, rsa_ads, queue_for_approval
 from config import Config
 
 init_db()
@@ -23,8 +26,11 @@ if not clients:
 selected = st.selectbox("Müşteri", [c["name"] for c in clients])
 client = next(c for c in clients if c["name"] == selected)
 customer_id = client.get("google_ads_id", "")
+force_refresh = st.checkbox("🔄 Önbelleği atla", help=f"Aynı veriyle son {Config.AI_CACHE_TTL_HOURS} saatte "
+                            "üretilmiş yanıt varsa varsayılan olarak önbellekten gelir; işaretlerseniz Claude'a yeniden sorulur.")
 
-tab1, tab2, tab3, tab4 = st.tabs(["📊 Performans Analizi", "🎯 Tam Strateji", "✍️ Reklam Metni Üretici", "📜 Geçmiş Stratejiler"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Performans Analizi", "🎯 Tam Strateji", "✍️ Reklam Metni Üretici",
+                                        "📜 Geçmiş Stratejiler", "📦 Portföy Stratejileri"])
 
 with tab1:
     st.markdown("### 📊 Hızlı AI Performans Analizi")
@@ -32,6 +38,8 @@ with tab1:
 
     campaigns = st.session_state.get(f"campaigns_{customer_id}", [])
     daily = st.session_state.get(f"daily_{customer_id}", [])
+    quick_keywords = st.session_state.get(f"keywords_{customer_id}", [])
+    quick_terms = st.session_state.get(f"search_terms_{customer_id}", [])
 
     if not campaigns:
         campaigns = fetch_all("campaigns", where="client_id = ?", params=[client["id"]])
@@ -40,13 +48,13 @@ with tab1:
         st.warning("Kampanya verisi yok. Önce Veri Senkronizasyonu yapın.")
     else:
         if st.button("🔍 AI Analiz Başlat", type="primary", key="quick_analysis"):
-            with st.spinner("Claude AI analiz ediyor..."):
-                result = analyze_performance(
-                    {"name": client["name"], "monthly_budget": client.get("monthly_budget", 0)},
-                    campaigns, daily
-                )
-                st.markdown(result)
-                log_action(client["id"], "ai_analysis", "AI performans analizi oluşturuldu")
+            # Rendered as the tokens arrive instead of after the whole response
+            st.write_stream(analyze_performance_stream(
+                {"name": client["name"], "monthly_budget": client.get("monthly_budget", 0),
+                 "target_cpa": client.get("target_cpa"), "target_roas": client.get("target_roas")},
+                campaigns, daily, quick_keywords, quick_terms, force_refresh=force_refresh
+            ))
+            log_action(client["id"], "ai_analysis", "AI performans analizi oluşturuldu")
 
 with tab2:
     st.markdown("### 🎯 Kapsamlı AI Strateji Oluşturma")
@@ -75,6 +83,7 @@ with tab2:
                 keywords=keywords,
                 search_terms=search_terms,
                 custom_prompt=custom_prompt,
+                force_refresh=force_refresh,
             )
 
             if "error" in strategy:
@@ -137,6 +146,12 @@ with tab2:
 
                 # Save strategy
                 meta = strategy.get("_meta", {})
+                if meta.get("cached"):
+                    st.caption("♻️ Bu strateji önbellekten geldi (aynı veri ile daha önce üretilmişti).")
+                if meta.get("repaired"):
+                    st.caption("🩹 Yanıt yarıda kesilmişti; tamamlanan kısım onarılarak kullanıldı.")
+                if meta.get("cache_read_tokens") and not meta.get("cached"):
+                    st.caption(f"⚡ Talimat ve müşteri verisinin {meta['cache_read_tokens']:,} token'ı istem önbelleğinden okundu.")
                 insert("strategies",
                        client_id=client["id"],
                        title=f"AI Strateji — {datetime.now().strftime('%d.%m.%Y')}",
@@ -162,7 +177,7 @@ with tab3:
 
     if st.button("✍️ Reklam Metni Oluştur", type="primary") and product_name:
         with st.spinner("Reklam metinleri oluşturuluyor..."):
-            ads = generate_ad_copy(product_name, product_desc, target_audience)
+            ads = generate_ad_copy(product_name, product_desc, target_audience, force_refresh=force_refresh)
             if isinstance(ads, dict) and "error" in ads:
                 st.error(ads["error"])
             elif isinstance(ads, list):
@@ -180,6 +195,66 @@ with tab3:
                     st.caption(f"💬 Strateji: {ad.get('strategy', '')}")
                     st.divider()
 
+    st.divider()
+    st.markdown("### 📦 Katalog Modu — Toplu RSA")
+    st.caption(f"Müşterinin ürün listesindeki her ürün için {Config.AD_RSA_HEADLINES} başlık ve "
+               f"{Config.AD_RSA_DESCRIPTIONS} açıklama üretilir; uzunluk, ünlem ve tekrar kontrolleri yerelde yapılır, "
+               "yalnızca geçersiz öğeler yeniden istenir.")
+
+    items = catalog([client["id"]])
+    if not items:
+        st.info("Müşterinin ürün listesi boş. Müşteri ayarlarından ürünleri virgülle ayırarak girin.")
+    else:
+        st.markdown("**Ürünler:** " + ", ".join(item["product"] for item in items))
+        bulk_audience = st.text_input("Hedef Kitle (tüm ürünler)", key="bulk_audience")
+
+        if st.button(f"🚀 {len(items)} Ürün İçin Üret", type="primary", key="bulk_ad_copy"):
+            bar = st.progress(0.0)
+
+            def bulk_progress(done, total, result):
+                bar.progress(done / total, text=f"{done}/{total} — {result['product']}")
+
+            st.session_state[f"bulk_ads_{client['id']}"] = generate_catalog(
+                items, bulk_audience, force_refresh=force_refresh, on_progress=bulk_progress)
+            log_action(client["id"], "ai_ad_copy", f"{len(items)} ürün için toplu RSA metni üretildi")
+
+        results = st.session_state.get(f"bulk_ads_{client['id']}")
+        if results:
+            status_labels = {"ok": "✅ Tam", "partial": "⚠️ Yayınlanabilir", "failed": "❌ Başarısız"}
+            st.dataframe(pd.DataFrame([{
+                "product": r["product"], "status": status_labels[r["status"]],
+                "headlines": len(r["headlines"]), "descriptions": len(r["descriptions"]),
+                "rejected": len(r["rejected"]), "requests": r["requests"], "error": r["error"] or "",
+            } for r in results]).rename(columns={
+                "product": "Ürün", "status": "Durum", "headlines": "Başlık", "descriptions": "Açıklama",
+                "rejected": "Reddedilen", "requests": "İstek", "error": "Hata",
+            }), use_container_width=True, hide_index=True)
+
+            for r in results:
+                with st.expander(f"{status_labels[r['status']]} {r['product']}"):
+                    st.markdown("**Başlıklar:** " + " · ".join(f"{h} `({len(h)}/{Config.AD_HEADLINE_MAX_CHARS})`"
+                                                            for h in r["headlines"]))
+                    st.markdown("**Açıklamalar:**")
+                    for d in r["descriptions"]:
+                        st.markdown(f"- {d} `({len(d)}/{Config.AD_DESCRIPTION_MAX_CHARS})`")
+                    if r["rejected"]:
+                        st.caption("Reddedilen: " + "; ".join(f"{x['text']} ({x['reason']})" for x in r["rejected"]))
+
+            ad_groups = client_ad_groups(client["id"])
+            group_labels = {g["google_adgroup_id"]: f"{g['campaign']} / {g['name']}" for g in ad_groups}
+            default_group = st.selectbox("Eşleşmeyen ürünler için reklam grubu", [None] + list(group_labels),
+                                         format_func=lambda g: "— Atlama —" if g is None else group_labels[g],
+                                         key="bulk_default_group")
+            final_url = st.text_input("Nihai URL", value=client.get("website") or "", key="bulk_final_url")
+            ads, unassigned = rsa_ads(results, ad_groups, default_group, final_url)
+            st.caption(f"{len(ads)} reklam hazır, {len(unassigned)} ürün atlanacak (reklam grubu, URL veya geçerli öğe yok). "
+                       "Reklamlar duraklatılmış olarak eklenir.")
+
+            if st.button("📤 Onay Merkezine Gönder", key="bulk_queue", disabled=not ads):
+                queued = queue_for_approval(ads)
+                log_action(client["id"], "ai_ad_copy", f"{queued} RSA onaya gönderildi")
+                st.success(f"✅ {queued} reklam Onay Merkezinde bekliyor.")
+
 with tab4:
     st.markdown("### 📜 Geçmiş Stratejiler")
     strategies = fetch_all("strategies", where="client_id = ?", params=[client["id"]], limit=20)
@@ -196,3 +271,51 @@ with tab4:
                         pass
     else:
         st.info("Henüz strateji oluşturulmamış.")
+
+with tab5:
+    st.markdown("### 📦 Portföy Genelinde Strateji Üretimi")
+    st.caption(f"Tüm müşteriler için stratejiler eşzamanlı üretilir (en fazla {Config.AI_BATCH_CONCURRENCY} istek); "
+               "her strateji geldiği anda kaydedilir. Yarıda kalan bir çalışma kaldığı yerden sürdürülebilir. "
+               "Komut satırından: `python strategy_batch.py`")
+
+    def _render_run(status):
+        counts = status.get("counts", {})
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.metric("Tamamlanan", f"{counts.get('done', 0)} / {status.get('total', 0)}")
+        with c2:
+            st.metric("Başarısız", counts.get("failed", 0))
+        with c3:
+            st.metric("Bekleyen", counts.get("pending", 0))
+        if status.get("failed"):
+            st.dataframe(pd.DataFrame(status["failed"]).rename(columns={
+                "client_id": "Müşteri ID", "name": "Müşteri", "attempts": "Deneme", "error": "Hata",
+            }), use_container_width=True, hide_index=True)
+
+    def _run_with_progress(**kwargs):
+        bar = st.progress(0.0, text="Stratejiler üretiliyor...")
+
+        def progress(done, total, outcome):
+            icon = "✅" if outcome["status"] == "done" else "❌"
+            bar.progress(done / total, text=f"{done}/{total} — {icon} {outcome['client']}")
+
+        try:
+            status = run_portfolio_strategies(force_refresh=force_refresh, on_progress=progress, **kwargs)
+        except Exception as e:
+            st.error(f"Hata: {e}")
+            return
+        bar.empty()
+        st.success(f"✅ Çalışma #{status['id']}: {status['counts'].get('done', 0)}/{status['total']} strateji kaydedildi.")
+        _render_run(status)
+
+    pending_run = open_run()
+    if pending_run:
+        st.warning(f"⏸️ Yarım kalan çalışma: #{pending_run['id']} ({pending_run['label']}, "
+                   f"{pending_run['created_at']})")
+        _render_run(run_status(pending_run["id"]))
+        if st.button("▶️ Kaldığı Yerden Sürdür", key="resume_portfolio"):
+            _run_with_progress(run_id=pending_run["id"])
+
+    portfolio_prompt = st.text_area("Tüm müşterilere uygulanacak ek talimat (opsiyonel)", key="portfolio_prompt")
+    if st.button(f"🚀 {len(clients)} Müşteri İçin Strateji Üret", type="primary", key="run_portfolio"):
+        _run_with_progress(custom_prompt=portfolio_prompt)
@@ -1,15 +1,39 @@
 """🔍 SEO Denetimi - Advanced Professional SEO Audit & Analysis"""
 import streamlit as st
-import json
 import plotly.graph_objects as go
 import plotly.express as px
-from database import init_db, fetch_all, insert, log_action
-from seo_auditor import SEOAuditor
-from ai_engine import generate_seo_recommendations
+import pandas as pd
+from database import init_db, fetch_all, log_action
+from seo_auditor import SEOAuditor, benchmark_sites, LOWER_IS_BETTER, QUICK_SECTIONS, SECTIONS, plan_sections
+from seo_rules import rule_stats
+from seo_history import (save_audit, load_previous_pages, diff_latest_audits, audit_handle, load_audit_results,
+                         latest_ai_recommendations)
+from ai_engine import generate_seo_recommendations_stream
 from config import Config
 
 init_db()
 
+# Display names of audit section keys
+SECTION_LABELS = {
+    "meta_analysis": "Meta",
+    "heading_structure": "Başlıklar",
+    "image_analysis": "Görseller",
+    "link_analysis": "Linkler",
+    "content_analysis": "İçerik",
+    "keyword_analysis": "Anahtar Kelime",
+    "technical": "Teknik",
+    "security_headers": "Güvenlik",
+    "page_speed": "Hız",
+    "mobile_friendly": "Mobil",
+    "schema_markup": "Schema",
+    "social_media": "Sosyal",
+    "backlink_indicators": "Backlink",
+    "featured_snippet": "Snippet",
+    "multi_page": "Çoklu Sayfa",
+    "link_graph": "Link Grafiği",
+    "asset_weight": "Sayfa Ağırlığı",
+}
+
 st.markdown('<div class="section-header">🔍 Gelişmiş SEO Denetimi & Analizi</div>', unsafe_allow_html=True)
 st.caption("Derinlemesine SEO analizi: Meta, İçerik, Anahtar Kelime, Hız, Güvenlik, Rakip Karşılaştırma ve daha fazlası")
 
@@ -26,6 +50,25 @@ with col1:
             client = next(c for c in clients if c["name"] == selected_client)
             default_url = client.get("website", "")
     url = st.text_input("Site URL", value=default_url, placeholder="https://kralgida.com")
+    audit_mode = st.radio("Denetim Modu", ["Tam Denetim", "Hızlı Denetim", "Seçili Bölümler"], horizontal=True,
+                          help="Hızlı denetim yalnızca ana sayfa HTML'inden çıkan bölümleri önbellekten getirir; "
+                               "tarama, link kontrolü ve teknik istekler yapılmaz.")
+    selected_sections = None
+    if audit_mode == "Hızlı Denetim":
+        selected_sections = list(QUICK_SECTIONS)
+    elif audit_mode == "Seçili Bölümler":
+        selected_sections = st.multiselect("Bölümler", [name for name, _, _ in SECTIONS],
+                                           default=list(QUICK_SECTIONS),
+                                           format_func=lambda k: SECTION_LABELS.get(k, k))
+    plan = plan_sections(selected_sections)
+    if "multi_page" in plan["sections"]:
+        max_pages = st.slider("Taranacak iç sayfa sayısı", min_value=5, max_value=200,
+                              value=Config.SEO_CRAWL_MAX_PAGES, step=5,
+                              help=f"{Config.SEO_PARSE_PROCESS_MIN_PAGES}+ sayfada HTML analizi tüm CPU çekirdeklerine dağıtılır.")
+    else:
+        max_pages = None
+    if plan["partial"]:
+        st.caption(f"Çalışacak bölümler: {', '.join(SECTION_LABELS.get(k, k) for k in plan['sections'])}")
 
 with col2:
     st.markdown("<br/>", unsafe_allow_html=True)
@@ -33,21 +76,56 @@ with col2:
 
 # ── COMPETITOR INPUT ──
 with st.expander("🏆 Rakip Karşılaştırma (Opsiyonel)"):
-    competitor_url = st.text_input("Rakip Site URL", placeholder="https://rakipsite.com")
-    run_compare = st.button("📊 Rakiple Karşılaştır")
+    competitor_text = st.text_area("Rakip Site URL'leri (her satıra bir adres)",
+                                   placeholder="https://rakip1.com\nhttps://rakip2.com", height=100)
+    competitor_urls = [u.strip() for u in competitor_text.splitlines() if u.strip()]
+    st.caption(f"En fazla {Config.SEO_BENCHMARK_MAX_SITES - 1} rakip aynı anda denetlenir.")
+    run_compare = st.button("📊 Rakiplerle Karşılaştır")
 
 # ═══════════════════════════════════════════════════════════════════
 #  MAIN AUDIT
 # ═══════════════════════════════════════════════════════════════════
 if run_audit and url:
-    with st.spinner("🔍 Site derinlemesine analiz ediliyor... (Bu işlem 30-60 saniye sürebilir)"):
-        progress = st.progress(0, text="Meta analizi yapılıyor...")
-        auditor = SEOAuditor(url)
-        results = auditor.full_audit()
-        progress.progress(100, text="Analiz tamamlandı!")
-
-    st.session_state["seo_results"] = results
-    st.session_state["seo_auditor"] = auditor
+    quick = audit_mode == "Hızlı Denetim"
+    progress = st.progress(0, text="Denetim başlatılıyor...")
+    live_status = st.empty()
+    live_table = st.empty()
+    finished_sections = []
+
+    def on_audit_event(event):
+        # Called from full_audit as each section / crawled page finishes
+        kind = event["event"]
+        if kind == "section_start":
+            label = SECTION_LABELS.get(event["section"], event["section"])
+            progress.progress(int(event["done"] / max(1, event["total"]) * 100),
+                              text=f"{label} analizi yapılıyor... ({event['done'] + 1}/{event['total']})")
+        elif kind == "page":
+            live_status.caption(f"📄 Sayfa {event['done']}/{event['total']} alındı ({event['elapsed']:.2f} sn"
+                                f"{', önbellekten' if event['from_cache'] else ''}): {event['url']}")
+        elif kind == "section":
+            result = event["result"] if isinstance(event["result"], dict) else {}
+            issues = result.get("issues", [])
+            finished_sections.append({
+                "Bölüm": SECTION_LABELS.get(event["section"], event["section"]),
+                "Puan": result.get("score", 0),
+                "Kritik": sum(1 for i in issues if i.get("severity") == "critical"),
+                "Sorun": len(issues),
+                "Süre (sn)": event["elapsed"],
+                "Kaynak": "♻️ Önbellek" if event["cached"] else "🌐 Canlı",
+            })
+            live_table.dataframe(pd.DataFrame(finished_sections), use_container_width=True, hide_index=True)
+
+    auditor = SEOAuditor(url, previous_pages=load_previous_pages(url), max_pages=max_pages,
+                         max_stale=Config.SEO_QUICK_AUDIT_MAX_STALE if quick else 0)
+    results = auditor.full_audit(sections=plan["sections"], on_event=on_audit_event)
+    progress.progress(100, text=f"Analiz tamamlandı! ({results.get('timings', {}).get('total', 0):.1f} sn)")
+    live_status.empty()
+    live_table.empty()
+
+    cache_info = results.get("cache", {})
+    if cache_info.get("home_from_cache") or cache_info.get("reused_sections"):
+        st.caption(f"♻️ Sayfa değişmemiş (304): {len(cache_info.get('reused_sections', []))} bölüm önbellekten, "
+                   f"{cache_info.get('pages_from_cache', 0)} sayfa koşullu istekle yeniden kullanıldı.")
 
     # ── OVERALL SCORE ──
     score = results.get("overall_score", 0)
@@ -100,24 +178,7 @@ if run_audit and url:
     # ── SECTION SCORES RADAR ──
     section_scores = results.get("section_scores", {})
     if section_scores:
-        labels_map = {
-            "meta_analysis": "Meta",
-            "heading_structure": "Başlıklar",
-            "image_analysis": "Görseller",
-            "link_analysis": "Linkler",
-            "content_analysis": "İçerik",
-            "keyword_analysis": "Anahtar Kelime",
-            "technical": "Teknik",
-            "security_headers": "Güvenlik",
-            "page_speed": "Hız",
-            "mobile_friendly": "Mobil",
-            "schema_markup": "Schema",
-            "social_media": "Sosyal",
-            "backlink_indicators": "Backlink",
-            "featured_snippet": "Snippet",
-            "multi_page": "Çoklu Sayfa",
-        }
-        labels = [labels_map.get(k, k) for k in section_scores.keys()]
+        labels = [SECTION_LABELS.get(k, k) for k in section_scores.keys()]
         values = list(section_scores.values())
 
         fig_radar = go.Figure(data=go.Scatterpolar(
@@ -322,6 +383,43 @@ if run_audit and url:
             with c3:
                 st.metric("Preload/Prefetch", speed.get("preload_hints", 0))
 
+        weight = results.get("asset_weight", {})
+        if weight.get("unique_assets"):
+            st.markdown("### ⚖️ Sayfa Ağırlığı & Kaynak Boyutları")
+            c1, c2, c3, c4 = st.columns(4)
+            with c1:
+                st.metric("Ana Sayfa", f"{weight.get('home_bytes', 0) / 1024:.0f} KB")
+            with c2:
+                st.metric("Render-Blocking", f"{weight.get('home_blocking_bytes', 0) / 1024:.0f} KB")
+            with c3:
+                st.metric("Büyük Görsel", weight.get("oversized_image_count", 0))
+            with c4:
+                st.metric("Sıkıştırmasız", weight.get("uncompressed_count", 0))
+            st.caption(f"{weight.get('pages_profiled', 0)} sayfada {weight['unique_assets']} benzersiz kaynak ölçüldü; "
+                       f"ortalama sayfa {weight.get('avg_page_bytes', 0) / 1024:.0f} KB.")
+
+            if weight.get("page_weights"):
+                st.dataframe(pd.DataFrame([{
+                    "Sayfa": p["url"],
+                    "Toplam KB": round(p["total_bytes"] / 1024),
+                    "HTML KB": round(p["html_bytes"] / 1024),
+                    "CSS KB": round(p["css_bytes"] / 1024),
+                    "JS KB": round(p["js_bytes"] / 1024),
+                    "Görsel KB": round(p["image_bytes"] / 1024),
+                    "Kaynak": p["asset_count"],
+                } for p in weight["page_weights"]]), use_container_width=True, hide_index=True)
+
+            flagged = ([("🖼️ Büyük görsel", a) for a in weight.get("oversized_images", [])]
+                       + [("🗜️ Sıkıştırmasız", a) for a in weight.get("uncompressed_assets", [])])
+            if flagged:
+                with st.expander(f"İşaretlenen kaynaklar ({len(flagged)})"):
+                    st.dataframe(pd.DataFrame([{
+                        "Sorun": label,
+                        "URL": a["url"],
+                        "KB": round((a["bytes"] or 0) / 1024),
+                        "Tür": a["content_type"] or a["kind"],
+                    } for label, a in flagged]), use_container_width=True, hide_index=True)
+
     # ── TAB 5: SECURITY ──
     with tabs[5]:
         sec = results.get("security_headers", {})
@@ -366,11 +464,15 @@ if run_audit and url:
             with c4:
                 st.metric("Kırık Link", links.get("broken_link_count", 0))
 
+            st.caption(f"{links.get('checked_link_count', 0)} benzersiz link kontrol edildi "
+                       f"({links.get('broken_internal_count', 0)} iç, {links.get('broken_external_count', 0)} dış kırık)")
+
             broken = links.get("broken_links", [])
             if broken:
                 st.markdown("### ❌ Kırık Linkler")
                 for bl in broken:
-                    st.error(f"**{bl['url']}** → Status: {bl['status']}")
+                    kind = "İç" if bl.get("type") == "internal" else "Dış"
+                    st.error(f"[{kind}] **{bl['url']}** → Status: {bl['status']}")
 
             with st.expander("İç Linkler Detay"):
                 for l in links.get("top_internal", [])[:15]:
@@ -456,13 +558,62 @@ if run_audit and url:
     with tabs[12]:
         multi = results.get("multi_page", {})
         if multi:
-            st.metric("Taranan Sayfa", multi.get("pages_crawled", 0))
+            c1, c2 = st.columns(2)
+            with c1:
+                st.metric("Taranan Sayfa", multi.get("pages_crawled", 0))
+            with c2:
+                st.metric("Sitemap'ten Seçilen", multi.get("sitemap_seeds", 0))
 
             if multi.get("common_issues"):
                 st.markdown("### ⚠️ Ortak Sorunlar")
                 for issue in multi["common_issues"]:
                     st.warning(issue)
 
+            if multi.get("site_links_checked"):
+                st.markdown(f"### 🔗 Site Geneli Link Sağlığı ({multi['site_links_checked']} link)")
+                site_broken = multi.get("site_broken_links", [])
+                if site_broken:
+                    for bl in site_broken[:30]:
+                        st.error(f"**{bl['url']}** → {bl['status']} (bulunduğu sayfa: {bl['found_on']})")
+                else:
+                    st.success("Kırık link bulunamadı.")
+
+            site_kw = multi.get("site_keywords", {})
+            if site_kw.get("terms"):
+                st.markdown(f"### 🗺️ Site Geneli Anahtar Kelime Haritası ({site_kw['pages']} sayfa)")
+                st.dataframe(pd.DataFrame([{
+                    "Kelime / İfade": t["term"],
+                    "Tekrar": t["count"],
+                    "Sayfa": t["page_count"],
+                    "Kapsama %": t["coverage"],
+                    "En Güçlü Sayfalar": ", ".join(t["top_pages"][:3]),
+                } for t in site_kw["terms"]]), use_container_width=True, hide_index=True)
+
+            dup = multi.get("duplicates", {})
+            if dup:
+                st.markdown("### 🧬 Kopya & İnce İçerik")
+                c1, c2, c3, c4 = st.columns(4)
+                with c1:
+                    st.metric("Benzer İçerikli Sayfa", dup.get("near_duplicate_pages", 0))
+                with c2:
+                    st.metric("Aynı Title", dup.get("duplicate_title_pages", 0))
+                with c3:
+                    st.metric("Aynı Meta Desc", dup.get("duplicate_description_pages", 0))
+                with c4:
+                    st.metric("İnce İçerik", dup.get("thin_page_count", 0))
+
+                groups = ([("Neredeyse aynı içerik", g) for g in dup.get("near_duplicate_clusters", [])]
+                          + [("Aynı title", g) for g in dup.get("duplicate_titles", [])]
+                          + [("Aynı meta description", g) for g in dup.get("duplicate_descriptions", [])])
+                for label, urls in groups[:15]:
+                    with st.expander(f"{label}: {len(urls)} sayfa"):
+                        for u in urls[:50]:
+                            st.markdown(f"- {u}")
+                if dup.get("thin_pages"):
+                    with st.expander(f"İnce içerikli sayfalar ({dup.get('thin_page_count', 0)})"):
+                        for u in dup["thin_pages"]:
+                            st.markdown(f"- {u}")
+
             if multi.get("page_results"):
                 st.markdown("### 📄 Sayfa Detayları")
                 for p in multi["page_results"]:
@@ -479,13 +630,69 @@ if run_audit and url:
                     """, unsafe_allow_html=True)
                     st.markdown("---")
 
+        graph = results.get("link_graph", {})
+        if graph.get("node_count"):
+            st.markdown("### 🕸️ İç Link Grafiği")
+            c1, c2, c3, c4, c5 = st.columns(5)
+            with c1:
+                st.metric("URL", graph.get("node_count", 0))
+            with c2:
+                st.metric("İç Link", graph.get("edge_count", 0))
+            with c3:
+                st.metric("Maks. Derinlik", graph.get("max_depth", 0))
+            with c4:
+                st.metric("Yetim Sayfa", graph.get("orphan_count", 0))
+            with c5:
+                st.metric("Yönlendirme Zinciri", graph.get("redirect_chain_count", 0))
+
+            depth_dist = graph.get("depth_distribution", {})
+            if depth_dist:
+                fig_depth = px.bar(x=[f"{d}. tık" for d in depth_dist], y=list(depth_dist.values()),
+                                   labels={"x": "Tıklama Derinliği", "y": "Sayfa"},
+                                   title="Ana Sayfadan Tıklama Derinliği")
+                fig_depth.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                                        font=dict(color="#E6EDF3"), height=300)
+                st.plotly_chart(fig_depth, use_container_width=True)
+
+            if graph.get("top_pages"):
+                st.markdown("**En Güçlü Sayfalar (İç PageRank, 1.0 = ortalama)**")
+                st.dataframe(pd.DataFrame([{
+                    "URL": p["url"],
+                    "PageRank": p["pagerank"],
+                    "İç Link": p["in_links"],
+                    "Derinlik": p["depth"] if p["depth"] >= 0 else "Ulaşılamaz",
+                } for p in graph["top_pages"]]), use_container_width=True, hide_index=True)
+
+            if graph.get("orphan_pages"):
+                partial = " — kısmi tarama" if graph.get("orphan_scope") == "partial" else ""
+                with st.expander(f"Yetim sayfalar — sitemap'te var, iç link almıyor ({graph['orphan_count']}{partial})"):
+                    for u in graph["orphan_pages"]:
+                        st.markdown(f"- {u}")
+            if graph.get("deep_pages"):
+                with st.expander(f"3 tıktan derin sayfalar ({graph.get('deep_page_count', 0)})"):
+                    for u in graph["deep_pages"]:
+                        st.markdown(f"- {u}")
+            if graph.get("redirects"):
+                with st.expander(f"Yönlendirmeler ({graph.get('redirect_count', 0)})"):
+                    st.dataframe(pd.DataFrame([{
+                        "URL": r["url"],
+                        "Hedef": r["final_url"],
+                        "Adım": r["hops"],
+                        "Zincir": " → ".join(r.get("chain", [])),
+                    } for r in graph["redirects"]]), use_container_width=True, hide_index=True)
+
     # ── AI SEO RECOMMENDATIONS ──
     st.divider()
+    stored_ai = latest_ai_recommendations(url)
+    if stored_ai:
+        with st.expander(f"🌙 Toplu AI Önerileri — {stored_ai['generated_at']}"):
+            st.caption("Gece toplu işinde (ai_batches.py) son kayıtlı denetim için üretildi.")
+            st.markdown(stored_ai["text"])
     if Config.ANTHROPIC_API_KEY:
+        ai_refresh = st.checkbox("🔄 Önbelleği atla", key="seo_ai_refresh",
+                                 help="Aynı denetim için daha önce üretilen analiz varsa önbellekten gelir.")
         if st.button("🧠 AI ile Derinlemesine SEO Analizi Al", type="primary", use_container_width=True):
-            with st.spinner("Claude AI kapsamlı SEO analiz ediyor..."):
-                ai_recs = generate_seo_recommendations(url, results)
-                st.markdown(ai_recs)
+            st.write_stream(generate_seo_recommendations_stream(url, results, force_refresh=ai_refresh))
 
     # ── BACKLINK INDICATORS ──
     with st.expander("🔗 Backlink & Güven Göstergeleri"):
@@ -512,50 +719,89 @@ if run_audit and url:
             if trust:
                 st.info(f"Güven sinyalleri: {', '.join(trust)}")
 
-    # Save audit
-    if clients and selected_client != "Manuel URL Gir":
-        insert("seo_audits",
-               client_id=client["id"], url=url,
-               seo_score=score,
-               issues=json.dumps(results.get("issues", []), ensure_ascii=False),
-               recommendations=json.dumps(results.get("recommendations", []), ensure_ascii=False))
-        log_action(client["id"], "seo_audit", f"Gelişmiş SEO denetimi: {score}/100 ({grade})")
+    # ── AUDIT TIMINGS ──
+    with st.expander("⏱️ Denetim Süreleri"):
+        timings = results.get("timings", {})
+        section_times = timings.get("sections", {})
+        if section_times:
+            fig_time = px.bar(x=list(section_times.values()), y=[SECTION_LABELS.get(k, k) for k in section_times],
+                              orientation="h", labels={"x": "Saniye", "y": ""},
+                              title=f"Bölüm Süreleri (toplam {timings.get('total', 0):.1f} sn)")
+            fig_time.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                                   font=dict(color="#E6EDF3"), height=400)
+            st.plotly_chart(fig_time, use_container_width=True)
+        if timings.get("slowest_pages"):
+            st.markdown("**En Yavaş Taranan Sayfalar**")
+            st.dataframe(pd.DataFrame(timings["slowest_pages"]).rename(columns={"url": "URL", "elapsed": "Süre (sn)"}),
+                         use_container_width=True, hide_index=True)
+
+    # ── RULE ENGINE TIMING ──
+    with st.expander("⏱️ Kural Motoru Performansı"):
+        stats = rule_stats(top=20)
+        if stats:
+            st.caption("Bu oturumda en çok süre harcayan SEO kuralları (önbellekten gelen bölümler kural çalıştırmaz)")
+            st.dataframe(pd.DataFrame(stats).rename(columns={
+                "rule": "Kural", "evaluations": "Çalışma", "fired": "Tetiklenme",
+                "total_ms": "Toplam (ms)", "avg_us": "Ortalama (µs)",
+            }), use_container_width=True, hide_index=True)
+        else:
+            st.info("Tüm bölümler önbellekten geldi; kural çalıştırılmadı.")
+
+    # Save audit (with per-page records so the next run can diff against it). Partial audits
+    # are not stored: their score covers only some sections and would skew the history diff.
+    client_id = client["id"] if clients and selected_client != "Manuel URL Gir" else None
+    audit_id = None
+    if results.get("partial"):
+        st.caption("ℹ️ Kısmi denetim: puan yalnızca seçilen bölümleri kapsar ve geçmişe kaydedilmez.")
+    else:
+        audit_id = save_audit(client_id, results)
+        if client_id:
+            log_action(client_id, "seo_audit", f"Gelişmiş SEO denetimi: {score}/100 ({grade})")
+    # Only a small handle is kept per session; full results are reloaded from the database
+    st.session_state["seo_audit"] = audit_handle(results, audit_id)
 
 # ═══════════════════════════════════════════════════════════════════
 #  COMPETITOR COMPARISON
 # ═══════════════════════════════════════════════════════════════════
-if run_compare and url and competitor_url:
-    with st.spinner("🏆 Rakip karşılaştırma yapılıyor..."):
-        auditor = st.session_state.get("seo_auditor")
-        if not auditor or not auditor.results:
-            auditor = SEOAuditor(url)
-            auditor.full_audit()
-
-        comparison = auditor.compare_with_competitor(competitor_url)
+if run_compare and url and competitor_urls:
+    with st.spinner(f"🏆 {len(competitor_urls)} rakip ile paralel karşılaştırma yapılıyor..."):
+        # Reuse the audit that just ran on this page instead of auditing our site again
+        handle = st.session_state.get("seo_audit")
+        your_results = (load_audit_results(handle["audit_id"]) if handle and handle.get("audit_id")
+                        and handle["url"] == SEOAuditor(url).url else None)
+        benchmark = benchmark_sites(url, competitor_urls, your_results=your_results)
 
     st.markdown("## 🏆 Rakip SEO Karşılaştırması")
+    st.caption(f"{len(benchmark['sites'])} site {benchmark['elapsed']} sn içinde denetlendi")
+    if benchmark.get("error"):
+        st.error(f"❌ {benchmark['error']}")
+    for site, error in benchmark["errors"].items():
+        st.warning(f"⚠️ {site} denetlenemedi: {error}")
 
-    # Score comparison
-    c1, c2 = st.columns(2)
-    with c1:
-        your_score = comparison.get("your_score", 0)
-        st.markdown(f"### 🟢 Sizin Site: **{your_score}/100**")
-        st.caption(url)
-    with c2:
-        comp_score = comparison.get("competitor_score", 0)
-        st.markdown(f"### 🔵 Rakip: **{comp_score}/100**")
-        st.caption(competitor_url)
+    your_site = benchmark["your_site"]
+    sites = benchmark["sites"]
+    scores = benchmark["scores"]
 
-    # Comparison table
-    comp_data = comparison.get("comparison", {})
-    if comp_data:
+    # Score comparison
+    cols = st.columns(min(len(sites), 4) or 1)
+    for i, site in enumerate(sites):
+        with cols[i % len(cols)]:
+            label = "🟢 Sizin Site" if site == your_site else f"🔵 Rakip {i}"
+            delta = round(scores[site] - scores[your_site], 1) if site != your_site and your_site in scores else None
+            st.metric(label, f"{scores[site]}/100", delta=delta, delta_color="inverse")
+            st.caption(site)
+
+    # Comparison matrix
+    matrix = benchmark.get("matrix", {})
+    if matrix and sites:
+        metrics = list(matrix.keys())
         fig_comp = go.Figure()
-        metrics = list(comp_data.keys())
-        your_vals = [comp_data[m]["yours"] for m in metrics]
-        comp_vals = [comp_data[m]["competitor"] for m in metrics]
-
-        fig_comp.add_trace(go.Bar(name="Sizin Site", x=metrics, y=your_vals, marker_color="#4CAF50"))
-        fig_comp.add_trace(go.Bar(name="Rakip", x=metrics, y=comp_vals, marker_color="#2196F3"))
+        for site in sites:
+            fig_comp.add_trace(go.Bar(
+                name="Sizin Site" if site == your_site else site,
+                x=metrics, y=[matrix[m][site] for m in metrics],
+                marker_color="#4CAF50" if site == your_site else None,
+            ))
         fig_comp.update_layout(
             barmode="group", height=400,
             paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
@@ -564,14 +810,54 @@ if run_compare and url and competitor_url:
         )
         st.plotly_chart(fig_comp, use_container_width=True)
 
-        st.markdown("### 📊 Detaylı Karşılaştırma")
-        for metric, data in comp_data.items():
-            winner = data["winner"]
-            icon = "🟢" if winner == "Siz" else "🔵"
-            st.markdown(f"{icon} **{metric}:** Siz: {data['yours']} | Rakip: {data['competitor']} → **{winner} önde**")
+        st.markdown("### 📊 Karşılaştırma Matrisi")
+        df = pd.DataFrame(matrix).reindex(sites)
+        df.index = ["Sizin Site" if s == your_site else s for s in sites]
+        st.dataframe(df, use_container_width=True)
+
+        st.markdown("### 🥇 Metrik Liderleri")
+        for metric in metrics:
+            leader = benchmark["leaders"].get(metric)
+            rank = benchmark["your_rank"].get(metric)
+            icon = "🟢" if leader == your_site else "🔵"
+            direction = " (düşük olan iyi)" if metric in LOWER_IS_BETTER else ""
+            leader_name = "Siz" if leader == your_site else leader
+            st.markdown(f"{icon} **{metric}{direction}:** Lider: {leader_name} "
+                        f"({matrix[metric].get(leader)}) | Sizin sıranız: {rank}/{len(sites)}")
 
 # ── AUDIT HISTORY ──
 st.divider()
+
+# Regressions / improvements between the last two stored audits (no re-run needed)
+audit_diff = diff_latest_audits(url) if url else None
+if audit_diff:
+    st.markdown("### 📈 Son Denetime Göre Değişim")
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        before, after = audit_diff.get("score_before"), audit_diff.get("score_after")
+        delta = round(after - before, 1) if before is not None and after is not None else None
+        st.metric("SEO Puanı", after if after is not None else "?", delta=delta)
+    with c2:
+        st.metric("Değişen Sayfa", audit_diff["changed_pages"])
+    with c3:
+        st.metric("🔻 Gerileme", len(audit_diff["regressions"]))
+    with c4:
+        st.metric("🔺 İyileşme", len(audit_diff["improvements"]))
+
+    for r in audit_diff["regressions"]:
+        st.error(f"🔻 **{r['url']}** — {r['score_before']} → {r['score_after']}")
+        for issue in r["new_issues"][:5]:
+            st.markdown(f"  - Yeni: {issue.get('message', '')}")
+    for r in audit_diff["improvements"]:
+        st.success(f"🔺 **{r['url']}** — {r['score_before']} → {r['score_after']}")
+        for issue in r["resolved_issues"][:5]:
+            st.markdown(f"  - Çözüldü: {issue.get('message', '')}")
+    if audit_diff.get("rescored_pages"):
+        st.caption(f"{audit_diff['rescored_pages']} sayfa önceki denetimden sonra güncellenen puanlama ile "
+                   "değerlendirildi; bu sayfaların puanları karşılaştırılmadı.")
+    if audit_diff["new_pages"] or audit_diff["removed_pages"]:
+        st.caption(f"Yeni sayfa: {len(audit_diff['new_pages'])} | Artık taranmayan: {len(audit_diff['removed_pages'])}")
+
 st.markdown("### 📜 Geçmiş Denetimler")
 audits = fetch_all("seo_audits", limit=10)
 if audits:
@@ -2,29 +2,238 @@
 import requests
 import json
 import re
+import os
 import time
+import multiprocessing
 import concurrent.futures
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from collections import Counter
+from config import Config
+from sitemap_reader import collect_sitemap_seeds
+from http_cache import get_http_cache, get_session, content_hash
+from link_checker import LinkChecker, normalize_link
+from seo_rules import evaluate, SEVERITIES
+from seo_keywords import keyword_profile, page_terms, SiteKeywordMap
+from seo_duplicates import page_fingerprint, analyze_duplicates
+from link_graph import analyze_link_graph
+from asset_profiler import AssetProfiler, extract_assets
+
+# Bump when an analyzer's output or the scoring changes: cached section results are
+# recomputed and stored audits of another version are not compared score-to-score
+ANALYSIS_VERSION = 7
+
+# Extraction patterns, compiled once at import
+OG_PROPERTY = re.compile(r"^og:")
+TWITTER_NAME = re.compile(r"^twitter:")
+ICON_REL = re.compile(r"icon", re.I)
+RESOURCE_HINT_REL = re.compile(r"preload|prefetch|preconnect")
+TOUCH_ICON_REL = re.compile(r"apple-touch-icon")
+FIXED_WIDTH = re.compile(r'width\s*:\s*\d{4,}px')
+ABSOLUTE_HREF = re.compile(r'^https?://')
+SENTENCE_END = re.compile(r'[.!?]+')
+COPYRIGHT_YEAR = re.compile(r'©\s*(\d{4})')
+PHONE = re.compile(r'[\+]?[\d\s\-\(\)]{10,}')
+EMAIL = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+SOCIAL_PROFILES = {
+    "facebook": re.compile(r'facebook\.com/([a-zA-Z0-9._-]+)'),
+    "instagram": re.compile(r'instagram\.com/([a-zA-Z0-9._-]+)'),
+    "twitter": re.compile(r'(?:twitter|x)\.com/([a-zA-Z0-9_]+)'),
+    "linkedin": re.compile(r'linkedin\.com/(?:company|in)/([a-zA-Z0-9_-]+)'),
+    "youtube": re.compile(r'youtube\.com/(?:channel|c|@|user)/([a-zA-Z0-9_-]+)'),
+    "tiktok": re.compile(r'tiktok\.com/@([a-zA-Z0-9._-]+)'),
+    "pinterest": re.compile(r'pinterest\.com/([a-zA-Z0-9_-]+)'),
+}
+
+# Boilerplate removed before reading a page's body text
+NON_CONTENT_TAGS = ["script", "style", "nav", "footer", "header", "noscript"]
+RECOMMENDED_SCHEMA_TYPES = ["Organization", "LocalBusiness", "WebSite", "BreadcrumbList", "Product"]
+
+# (results key, analyzer method, body_only) in report order. Body-only sections read nothing
+# but the home page HTML, so they can be cached by content hash or run in a worker process.
+SECTIONS = [
+    ("meta_analysis", "_analyze_meta", True),
+    ("heading_structure", "_analyze_headings", True),
+    ("image_analysis", "_analyze_images", True),
+    ("link_analysis", "_analyze_links", False),
+    ("content_analysis", "_analyze_content", True),
+    ("keyword_analysis", "_analyze_keywords", True),
+    ("technical", "_analyze_technical", False),
+    ("security_headers", "_analyze_security_headers", False),
+    ("page_speed", "_analyze_page_speed", True),
+    ("mobile_friendly", "_check_mobile", True),
+    ("schema_markup", "_check_schema", True),
+    ("social_media", "_check_social_media", True),
+    ("backlink_indicators", "_analyze_backlink_indicators", True),
+    ("featured_snippet", "_check_featured_snippet_readiness", True),
+    ("multi_page", "_crawl_internal_pages", False),
+    ("link_graph", "_analyze_link_graph", False),
+    ("asset_weight", "_analyze_asset_weight", False),
+]
+SECTION_METHODS = {name: (method, body_only) for name, method, body_only in SECTIONS}
+# Sections that read another section's output; selecting one pulls in the other
+SECTION_DEPENDS = {
+    "link_graph": ("multi_page",),
+}
+# What each section fetches besides the home page (body-only sections fetch nothing else)
+SECTION_RESOURCES = {
+    "link_analysis": ("link_probes",),
+    "technical": ("timed_fetch", "robots", "sitemap"),
+    "multi_page": ("sitemap", "pages", "link_probes"),
+    "link_graph": ("sitemap",),
+    "asset_weight": ("asset_probes",),
+}
+# Quick audit: sections answered from the (cached) home page HTML alone
+QUICK_SECTIONS = tuple(name for name, _, body_only in SECTIONS if body_only)
+# Keys computed from every planned section at the end of an audit
+SUMMARY_KEYS = ("overall_score", "grade", "issues", "recommendations", "summary",
+                "section_scores", "cache", "pages", "timings")
+
+# Metrics shared by compare_with_competitor and benchmark_sites
+COMPARISON_METRICS = {
+    "SEO Puanı": lambda r: r.get("overall_score", 0),
+    "Kelime Sayısı": lambda r: r.get("content_analysis", {}).get("word_count", 0),
+    "İç Link": lambda r: r.get("link_analysis", {}).get("internal_count", 0),
+    "Dış Link": lambda r: r.get("link_analysis", {}).get("external_count", 0),
+    "Yanıt Süresi": lambda r: r.get("technical", {}).get("details", {}).get("response_time", 0),
+    "Görsel Sayısı": lambda r: r.get("image_analysis", {}).get("total", 0),
+    "Schema Tipi": lambda r: len(r.get("schema_markup", {}).get("json_ld_types", [])),
+    "Kritik Sorun": lambda r: sum(1 for i in r.get("issues", []) if i.get("severity") == "critical"),
+}
+LOWER_IS_BETTER = ("Yanıt Süresi", "Kritik Sorun")
+
+
+def normalize_url(url):
+    return url if url.startswith("http") else f"https://{url}"
+
+
+def plan_sections(sections=None):
+    """Resolve requested section keys into run order plus the resources they will fetch.
+
+    Dependencies are added automatically and unknown keys are ignored.
+    """
+    wanted = set()
+
+    def add(name):
+        if name in SECTION_METHODS and name not in wanted:
+            wanted.add(name)
+            for dep in SECTION_DEPENDS.get(name, ()):
+                add(dep)
+
+    for name in (SECTION_METHODS if sections is None else sections):
+        add(name)
+    ordered = [name for name, _, _ in SECTIONS if name in wanted]
+    resources = {"home"} if ordered else set()
+    for name in ordered:
+        resources.update(SECTION_RESOURCES.get(name, ()))
+    return {"sections": ordered, "resources": sorted(resources),
+            "partial": len(ordered) < len(SECTIONS)}
+
+
+class AuditResults(dict):
+    """Audit results whose sections are computed on first access.
+
+    Reading a planned section runs it (after its dependencies); reading a summary
+    key such as overall_score runs every remaining section first. resolve()
+    computes everything, e.g. before the results are serialized.
+    """
+
+    def __init__(self, auditor, pending, base):
+        super().__init__(base)
+        self._auditor = auditor
+        self._pending = list(pending)
+
+    @property
+    def pending(self):
+        return list(self._pending)
+
+    def _compute(self, key):
+        if key in self._pending:
+            for dep in SECTION_DEPENDS.get(key, ()):
+                self._compute(dep)
+            self._pending.remove(key)
+            dict.__setitem__(self, key, self._auditor._run_section(key))
+        elif key in SUMMARY_KEYS and not dict.__contains__(self, "overall_score"):
+            self.resolve()
+
+    def __getitem__(self, key):
+        self._compute(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self._compute(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._pending or key in SUMMARY_KEYS or dict.__contains__(self, key)
+
+    def resolve(self):
+        while self._pending:
+            self._compute(self._pending[0])
+        if not dict.__contains__(self, "overall_score"):
+            self._auditor._finish_audit()
+        return self
+
+
+def _body_text(soup):
+    """Visible body text with scripts, styles and navigation boilerplate removed (mutates soup)."""
+    for tag in soup(NON_CONTENT_TAGS):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)
 
 
 class SEOAuditor:
-    def __init__(self, url):
-        self.url = url if url.startswith("http") else f"https://{url}"
+    def __init__(self, url, use_cache=True, previous_pages=None, max_pages=None, max_stale=0, link_checker=None,
+                 parse_pool=None):
+        self.url = normalize_url(url)
         self.domain = urlparse(self.url).netloc
         self.results = {}
         self._page_cache = {}
+        # {url: page record} from the previous stored audit; unchanged pages are not re-parsed
+        self._previous_pages = previous_pages or {}
+        self._http_cache = get_http_cache() if use_cache else None
+        # Seconds a cached home page may be reused without revalidation (quick audits)
+        self.max_stale = max_stale
+        self._reused_sections = []
+        self._sitemap = None
+        # Crawl output consumed by _analyze_link_graph and _analyze_asset_weight
+        self._link_graph_input = None
+        self._crawled_assets = {}
+        self.max_pages = max_pages or Config.SEO_CRAWL_MAX_PAGES
+        # Crawled pages are not kept in _page_cache, so their 304 hits are counted here
+        self._crawl_from_cache = 0
         self._headers = {"User-Agent": "Mozilla/5.0 (compatible; OtonomAdsBot/4.0; +https://otonomreklam.com)"}
+        # Pass a shared checker so per-host probe limits hold across concurrent audits
+        self._link_checker = link_checker or LinkChecker(headers=self._headers)
+        # Shared process pool of concurrent audits; large crawls otherwise start their own
+        self._parse_pool = parse_pool
+        # Progress callback of the running audit and its timings (see full_audit)
+        self._on_event = None
+        self._timings = {"sections": {}, "pages": []}
+        self._audit_started = 0
+        self._section_total = 0
+
+    def _emit(self, event, **data):
+        """Send a progress event to the on_event callback; a failing callback never breaks the audit."""
+        if self._on_event:
+            try:
+                self._on_event(dict(data, event=event))
+            except Exception:
+                pass
 
-    def _fetch_page(self, url=None):
+    def _fetch_page(self, url=None, remember=True):
         target = url or self.url
         if target in self._page_cache:
             return self._page_cache[target]
         try:
-            resp = requests.get(target, headers=self._headers, timeout=15, allow_redirects=True)
-            self._page_cache[target] = resp
+            if self._http_cache:
+                resp = self._http_cache.get(target, headers=self._headers, timeout=15,
+                                            max_stale=self.max_stale if target == self.url else 0)
+            else:
+                resp = get_session().get(target, headers=self._headers, timeout=15, allow_redirects=True)
+            if remember:
+                self._page_cache[target] = resp
             return resp
         except Exception:
             return None
@@ -35,37 +244,153 @@ class SEOAuditor:
             return BeautifulSoup(resp.text, "html.parser")
         return None
 
+    def _get_sitemap(self, robots_text=None):
+        """Stream the site's sitemap(s) once and keep the freshest URLs as crawl seeds."""
+        if self._sitemap is None:
+            self._sitemap = collect_sitemap_seeds(self.url, headers=self._headers,
+                                                  robots_text=robots_text, limit=max(50, self.max_pages),
+                                                  keep_urls=self.max_pages + 1)
+        return self._sitemap
+
+    def _body_digest(self):
+        """Cache key for body-only results: home page hash + analyzer version (None if not cacheable)."""
+        resp = self._fetch_page()
+        if not self._http_cache or not resp or resp.status_code != 200:
+            return None
+        return f"{content_hash(resp)}:v{ANALYSIS_VERSION}"
+
+    def _cached_section(self, section, analyzer):
+        """Run a body-only analyzer, reusing the stored result if the page body is unchanged."""
+        digest = self._body_digest()
+        if digest is None:
+            return analyzer()
+        cached = self._http_cache.get_analysis(self.url, section, digest)
+        if cached is not None:
+            self._reused_sections.append(section)
+            return cached
+        result = analyzer()
+        self._http_cache.store_analysis(self.url, section, digest, result)
+        return result
+
+    def _cached_body_sections(self):
+        """Stored results of every body-only section, or None if any is missing or stale."""
+        digest = self._body_digest()
+        if digest is None:
+            return None
+        results = {}
+        for name, _, body_only in SECTIONS:
+            if body_only:
+                cached = self._http_cache.get_analysis(self.url, name, digest)
+                if cached is None:
+                    return None
+                results[name] = cached
+        return results
+
+    def _store_body_sections(self, results):
+        digest = self._body_digest()
+        if digest is not None:
+            for name, result in results.items():
+                self._http_cache.store_analysis(self.url, name, digest, result)
+
     # ═══════════════════════════════════════════════════════════════
     #  FULL AUDIT
     # ═══════════════════════════════════════════════════════════════
-    def full_audit(self):
-        """Run complete advanced SEO audit."""
-        self.results = {
+    def full_audit(self, precomputed=None, sections=None, lazy=False, on_event=None):
+        """Run complete advanced SEO audit.
+
+        `sections` limits the audit to those section keys plus their dependencies
+        (see plan_sections); resources no selected section needs are never fetched.
+        With `lazy=True` an AuditResults is returned and each section runs on first
+        access. `precomputed` maps section keys to results produced elsewhere (e.g.
+        by a worker process); those sections are not re-run.
+
+        `on_event(event)` is called as the audit progresses with dicts of type
+        "section_start", "section" (result and timing), "page" (one crawled
+        page fetched) and "done" (final results).
+        """
+        precomputed = precomputed or {}
+        self._reused_sections = []
+        self._on_event = on_event
+        self._timings = {"sections": {}, "pages": []}
+        self._audit_started = time.time()
+        plan = plan_sections(sections)
+        self._section_total = len(plan["sections"])
+        base = {
             "url": self.url,
             "domain": self.domain,
             "timestamp": datetime.now().isoformat(),
-            "meta_analysis": self._analyze_meta(),
-            "heading_structure": self._analyze_headings(),
-            "image_analysis": self._analyze_images(),
-            "link_analysis": self._analyze_links(),
-            "content_analysis": self._analyze_content(),
-            "keyword_analysis": self._analyze_keywords(),
-            "technical": self._analyze_technical(),
-            "security_headers": self._analyze_security_headers(),
-            "page_speed": self._analyze_page_speed(),
-            "mobile_friendly": self._check_mobile(),
-            "schema_markup": self._check_schema(),
-            "social_media": self._check_social_media(),
-            "backlink_indicators": self._analyze_backlink_indicators(),
-            "featured_snippet": self._check_featured_snippet_readiness(),
-            "multi_page": self._crawl_internal_pages(),
+            "sections": plan["sections"],
+            "partial": plan["partial"],
+        }
+        base.update({name: precomputed[name] for name in plan["sections"] if name in precomputed})
+        self.results = AuditResults(self, [n for n in plan["sections"] if n not in precomputed], base)
+        if lazy:
+            return self.results
+        self.results = dict(self.results.resolve())
+        return self.results
+
+    def _run_section(self, name):
+        method, body_only = SECTION_METHODS[name]
+        self._emit("section_start", section=name, done=len(self._timings["sections"]), total=self._section_total)
+        start = time.time()
+        reused = len(self._reused_sections)
+        if body_only:
+            result = self._cached_section(name, getattr(self, method))
+        else:
+            result = getattr(self, method)()
+        elapsed = round(time.time() - start, 3)
+        self._timings["sections"][name] = elapsed
+        self._emit("section", section=name, result=result, elapsed=elapsed,
+                   cached=len(self._reused_sections) > reused,
+                   done=len(self._timings["sections"]), total=self._section_total)
+        return result
+
+    def _finish_audit(self):
+        """Score, summary, cache stats and per-page records once every planned section has run."""
+        self.results.update({
             "overall_score": 0,
             "grade": "",
             "issues": [],
             "recommendations": [],
+        })
+        home = self._fetch_page()
+        self.results["cache"] = {
+            "home_from_cache": bool(getattr(home, "from_cache", False)),
+            "reused_sections": list(self._reused_sections),
+            "pages_from_cache": self._crawl_from_cache + sum(
+                1 for r in self._page_cache.values() if getattr(r, "from_cache", False)),
         }
         self._calculate_score()
-        return self.results
+        self.results["pages"] = self._page_records(home)
+        self.results["timings"] = {
+            "total": round(time.time() - self._audit_started, 3),
+            "sections": dict(self._timings["sections"]),
+            "slowest_pages": sorted(self._timings["pages"], key=lambda p: p["elapsed"], reverse=True)[:20],
+        }
+        self._emit("done", results=self.results, elapsed=self.results["timings"]["total"])
+
+    def _page_records(self, home):
+        """Per-URL records (content hash, score, issues) for history and diffing."""
+        records = [{
+            "url": self.url,
+            "content_hash": content_hash(home) if home is not None else None,
+            "status_code": home.status_code if home is not None else None,
+            "score": self.results.get("overall_score", 0),
+            "issues": self.results.get("issues", []),
+            "result": {"section_scores": self.results.get("section_scores", {}),
+                       "grade": self.results.get("grade", ""),
+                       "analysis_version": ANALYSIS_VERSION},
+        }]
+        for page in self.results.get("multi_page", {}).get("page_results", []):
+            records.append({
+                "url": page["url"],
+                "content_hash": page.get("content_hash"),
+                "status_code": page.get("status"),
+                "score": page.get("score", 0),
+                "issues": page.get("issues", []),
+                "result": page,
+            })
+        return records
 
     # ═══════════════════════════════════════════════════════════════
     #  1. META ANALYSIS (Enhanced)
@@ -75,115 +400,69 @@ class SEOAuditor:
         if not soup:
             return {"error": "Sayfa yüklenemedi", "score": 0, "issues": []}
 
-        result = {"score": 0, "issues": [], "details": {}}
+        details = {}
 
         # Title
         title_tag = soup.find("title")
         title = title_tag.text.strip() if title_tag else ""
-        result["details"]["title"] = title
-        result["details"]["title_length"] = len(title)
-        if not title:
-            result["issues"].append({"severity": "critical", "category": "meta", "message": "Title etiketi eksik!"})
-        elif len(title) < 30:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": f"Title çok kısa ({len(title)} karakter). 50-60 karakter önerilir."})
-        elif len(title) > 60:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": f"Title çok uzun ({len(title)} karakter). 50-60 karakter önerilir."})
-        else:
-            result["score"] += 10
-
-        # Title keyword check
+        details["title"] = title
+        details["title_length"] = len(title)
         if title:
-            title_words = len(title.split())
-            result["details"]["title_word_count"] = title_words
-            if title_words < 3:
-                result["issues"].append({"severity": "info", "category": "meta", "message": "Title'da daha fazla anahtar kelime kullanılabilir."})
+            details["title_word_count"] = len(title.split())
 
         # Meta Description
         meta_desc = soup.find("meta", attrs={"name": "description"})
         desc = meta_desc["content"].strip() if meta_desc and meta_desc.get("content") else ""
-        result["details"]["meta_description"] = desc
-        result["details"]["meta_description_length"] = len(desc)
-        if not desc:
-            result["issues"].append({"severity": "critical", "category": "meta", "message": "Meta description eksik!"})
-        elif len(desc) < 120:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": f"Meta description kısa ({len(desc)} karakter). 150-160 karakter önerilir."})
-        elif len(desc) > 160:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": f"Meta description uzun ({len(desc)} karakter). 150-160 karakter önerilir."})
-        else:
-            result["score"] += 10
+        details["meta_description"] = desc
+        details["meta_description_length"] = len(desc)
 
         # Canonical
         canonical = soup.find("link", attrs={"rel": "canonical"})
-        result["details"]["canonical"] = canonical["href"] if canonical else None
-        if not canonical:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": "Canonical URL tanımlanmamış."})
-        else:
-            result["score"] += 3
+        details["canonical"] = canonical["href"] if canonical else None
 
         # Robots
         robots = soup.find("meta", attrs={"name": "robots"})
-        result["details"]["robots"] = robots["content"] if robots and robots.get("content") else "belirtilmemiş"
-        if robots and "noindex" in (robots.get("content", "") or "").lower():
-            result["issues"].append({"severity": "critical", "category": "meta", "message": "Sayfa noindex olarak işaretli! Google'da görünmez."})
+        details["robots"] = robots["content"] if robots and robots.get("content") else "belirtilmemiş"
 
         # Open Graph
         og_tags = {}
-        for og in soup.find_all("meta", attrs={"property": re.compile(r"^og:")}):
+        for og in soup.find_all("meta", attrs={"property": OG_PROPERTY}):
             og_tags[og.get("property", "")] = og.get("content", "")
-        result["details"]["og_tags"] = og_tags
-        result["details"]["og_tags_count"] = len(og_tags)
-        if not og_tags:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": "Open Graph etiketleri eksik (sosyal medya paylaşımları için)."})
-        else:
-            result["score"] += 3
-            if "og:image" not in og_tags:
-                result["issues"].append({"severity": "info", "category": "meta", "message": "og:image eksik. Sosyal paylaşımlarda görsel çıkmaz."})
+        details["og_tags"] = og_tags
+        details["og_tags_count"] = len(og_tags)
 
         # Twitter Card
         twitter_tags = {}
-        for tw in soup.find_all("meta", attrs={"name": re.compile(r"^twitter:")}):
+        for tw in soup.find_all("meta", attrs={"name": TWITTER_NAME}):
             twitter_tags[tw.get("name", "")] = tw.get("content", "")
-        result["details"]["twitter_tags"] = twitter_tags
-        if not twitter_tags:
-            result["issues"].append({"severity": "info", "category": "meta", "message": "Twitter Card etiketleri eksik."})
-        else:
-            result["score"] += 2
+        details["twitter_tags"] = twitter_tags
 
         # Viewport
-        viewport = soup.find("meta", attrs={"name": "viewport"})
-        result["details"]["has_viewport"] = bool(viewport)
-        if not viewport:
-            result["issues"].append({"severity": "critical", "category": "meta", "message": "Viewport meta etiketi yok! Mobil uyumluluk sorunu."})
-        else:
-            result["score"] += 5
+        details["has_viewport"] = bool(soup.find("meta", attrs={"name": "viewport"}))
 
         # Language
         html_tag = soup.find("html")
-        result["details"]["lang"] = html_tag.get("lang", "") if html_tag else ""
-        if not result["details"]["lang"]:
-            result["issues"].append({"severity": "warning", "category": "meta", "message": "HTML lang attribute eksik."})
-        else:
-            result["score"] += 2
+        details["lang"] = html_tag.get("lang", "") if html_tag else ""
 
         # Hreflang (multi-language support)
         hreflangs = soup.find_all("link", attrs={"rel": "alternate", "hreflang": True})
-        result["details"]["hreflang_tags"] = [{
+        details["hreflang_tags"] = [{
             "lang": h.get("hreflang", ""),
             "href": h.get("href", "")
         } for h in hreflangs]
-        if hreflangs:
-            result["score"] += 3
-            result["details"]["is_multilingual"] = True
-        else:
-            result["details"]["is_multilingual"] = False
+        details["is_multilingual"] = bool(hreflangs)
 
         # Favicon
-        favicon = soup.find("link", attrs={"rel": re.compile(r"icon", re.I)})
-        result["details"]["has_favicon"] = bool(favicon)
-        if not favicon:
-            result["issues"].append({"severity": "info", "category": "meta", "message": "Favicon bulunamadı."})
-
-        result["score"] = min(38, result["score"])
+        details["has_favicon"] = bool(soup.find("link", attrs={"rel": ICON_REL}))
+
+        features = dict(details,
+                        title_word_count=details.get("title_word_count", 0),
+                        has_canonical=bool(canonical),
+                        noindex=bool(robots and "noindex" in (robots.get("content", "") or "").lower()),
+                        has_og_image="og:image" in og_tags,
+                        twitter_tags_count=len(twitter_tags))
+        result = evaluate("meta_analysis", features)
+        result["details"] = details
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -194,37 +473,20 @@ class SEOAuditor:
         if not soup:
             return {"error": "Sayfa yüklenemedi", "score": 0, "issues": []}
 
-        result = {"issues": [], "score": 0}
         headings = {}
         for i in range(1, 7):
             tags = soup.find_all(f"h{i}")
             headings[f"h{i}"] = [t.get_text(strip=True)[:100] for t in tags]
 
-        result["headings"] = headings
-        result["h1_count"] = len(headings.get("h1", []))
-        result["total_headings"] = sum(len(v) for v in headings.values())
-
-        if result["h1_count"] == 0:
-            result["issues"].append({"severity": "critical", "category": "heading", "message": "H1 etiketi yok!"})
-        elif result["h1_count"] > 1:
-            result["issues"].append({"severity": "warning", "category": "heading", "message": f"Birden fazla H1 ({result['h1_count']} adet). Tek H1 önerilir."})
-        else:
-            result["score"] += 8
-
-        if not headings.get("h2"):
-            result["issues"].append({"severity": "warning", "category": "heading", "message": "H2 etiketi yok. İçerik yapısı iyileştirilmeli."})
-        else:
-            result["score"] += 4
-
-        # Heading hierarchy check
-        has_skip = False
-        for i in range(1, 5):
-            if not headings.get(f"h{i}") and headings.get(f"h{i+1}"):
-                has_skip = True
-                result["issues"].append({"severity": "info", "category": "heading", "message": f"H{i} atlanmış ama H{i+1} kullanılmış. Hiyerarşi bozuk."})
-        if not has_skip and result["total_headings"] >= 3:
-            result["score"] += 3
-
+        features = {
+            "h1_count": len(headings["h1"]),
+            "h2_count": len(headings["h2"]),
+            "total_headings": sum(len(v) for v in headings.values()),
+            # Heading hierarchy: level i is skipped when H(i+1) is used without any H(i)
+            "skipped_levels": [i for i in range(1, 5) if not headings[f"h{i}"] and headings[f"h{i+1}"]],
+        }
+        result = evaluate("heading_structure", features)
+        result.update(headings=headings, h1_count=features["h1_count"], total_headings=features["total_headings"])
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -237,7 +499,7 @@ class SEOAuditor:
 
         images = soup.find_all("img")
         result = {"total": len(images), "missing_alt": 0, "missing_dimensions": 0,
-                  "lazy_loaded": 0, "large_images": [], "issues": [], "score": 0}
+                  "lazy_loaded": 0, "issues": [], "score": 0}
 
         for img in images:
             alt = img.get("alt", "").strip()
@@ -251,41 +513,16 @@ class SEOAuditor:
             if img.get("loading") == "lazy" or img.get("data-src"):
                 result["lazy_loaded"] += 1
 
-            src = img.get("src", "") or img.get("data-src", "")
-            if src and not src.startswith("data:"):
-                result["large_images"].append(src)
-
+        lazy_pct = 0
         if result["total"] > 0:
             alt_pct = (result["total"] - result["missing_alt"]) / result["total"] * 100
             result["alt_coverage"] = round(alt_pct, 1)
-            if result["missing_alt"] > 0:
-                result["issues"].append({
-                    "severity": "warning", "category": "image",
-                    "message": f"{result['missing_alt']}/{result['total']} görselin alt etiketi eksik."
-                })
-            if alt_pct >= 90:
-                result["score"] += 5
-
-            if result["missing_dimensions"] > result["total"] * 0.5:
-                result["issues"].append({
-                    "severity": "info", "category": "image",
-                    "message": f"{result['missing_dimensions']} görselde genişlik/yükseklik tanımlı değil. CLS sorununa neden olabilir."
-                })
-
-            lazy_pct = result["lazy_loaded"] / result["total"] * 100 if result["total"] > 0 else 0
+            lazy_pct = result["lazy_loaded"] / result["total"] * 100
             result["lazy_load_coverage"] = round(lazy_pct, 1)
-            if result["total"] > 5 and lazy_pct < 50:
-                result["issues"].append({
-                    "severity": "info", "category": "image",
-                    "message": f"Görsellerin sadece %{lazy_pct:.0f}'si lazy load kullanıyor. Sayfa hızı için önerilir."
-                })
-            elif lazy_pct >= 50:
-                result["score"] += 3
         else:
-            result["alt_coverage"] = 100
-            result["score"] += 5
+            alt_pct = result["alt_coverage"] = 100
 
-        result["large_images"] = result["large_images"][:5]
+        result.update(evaluate("image_analysis", dict(result, alt_coverage=alt_pct, lazy_pct=lazy_pct)))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -322,16 +559,12 @@ class SEOAuditor:
             if not anchor_text and not link.find("img"):
                 broken_candidates.append({"url": href, "issue": "Boş anchor text"})
 
-        # Check for broken links (sample max 10)
-        broken_links = []
-        sample_links = [l["url"] for l in internal[:10]]
-        for link_url in sample_links:
-            try:
-                r = requests.head(link_url, headers=self._headers, timeout=5, allow_redirects=True)
-                if r.status_code >= 400:
-                    broken_links.append({"url": link_url, "status": r.status_code})
-            except:
-                broken_links.append({"url": link_url, "status": "timeout"})
+        # Check every unique internal + external link concurrently
+        checked = self._link_checker.check([l["url"] for l in internal + external])
+        broken_links = [{"url": url, "status": r["status"],
+                         "type": "internal" if urlparse(url).netloc == self.domain else "external"}
+                        for url, r in checked.items() if not r["ok"]]
+        broken_internal = sum(1 for b in broken_links if b["type"] == "internal")
 
         result = {
             "internal_count": len(internal),
@@ -340,34 +573,16 @@ class SEOAuditor:
             "external_domain_count": len(external_domains),
             "nofollow_count": nofollow_count,
             "empty_anchors": len(broken_candidates),
-            "broken_links": broken_links[:10],
+            "checked_link_count": len(checked),
+            "broken_links": broken_links[:50],
             "broken_link_count": len(broken_links),
+            "broken_internal_count": broken_internal,
+            "broken_external_count": len(broken_links) - broken_internal,
             "top_internal": internal[:15],
             "top_external": external[:15],
-            "issues": [],
-            "score": 0,
         }
 
-        if len(internal) >= 5:
-            result["score"] += 4
-        elif len(internal) >= 2:
-            result["score"] += 2
-
-        if len(external) >= 1:
-            result["score"] += 2
-
-        if len(broken_candidates) > 5:
-            result["issues"].append({
-                "severity": "warning", "category": "link",
-                "message": f"{len(broken_candidates)} boş anchor text tespit edildi."
-            })
-
-        if broken_links:
-            result["issues"].append({
-                "severity": "critical", "category": "link",
-                "message": f"{len(broken_links)} kırık link tespit edildi!"
-            })
-
+        result.update(evaluate("link_analysis", result))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -378,15 +593,12 @@ class SEOAuditor:
         if not soup:
             return {"error": "Sayfa yüklenemedi", "score": 0, "issues": []}
 
-        for tag in soup(["script", "style", "nav", "footer", "header", "noscript"]):
-            tag.decompose()
-
-        text = soup.get_text(separator=" ", strip=True)
+        text = _body_text(soup)
         words = text.split()
         word_count = len(words)
 
         # Sentence analysis
-        sentences = re.split(r'[.!?]+', text)
+        sentences = SENTENCE_END.split(text)
         sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
         avg_sentence_length = sum(len(s.split()) for s in sentences) / max(1, len(sentences))
 
@@ -413,27 +625,9 @@ class SEOAuditor:
             "long_word_percentage": round(long_word_pct, 1),
             "readability_score": round(readability, 1),
             "text_html_ratio": round(text_html_ratio, 1),
-            "issues": [],
-            "score": 0,
         }
-
-        if word_count < 300:
-            result["issues"].append({"severity": "warning", "category": "content", "message": f"İçerik çok az ({word_count} kelime). 500+ kelime önerilir."})
-        elif word_count >= 500:
-            result["score"] += 5
-        if word_count >= 1000:
-            result["score"] += 3
-
-        if text_html_ratio < 10:
-            result["issues"].append({"severity": "warning", "category": "content", "message": f"Metin/HTML oranı düşük (%{text_html_ratio:.1f}). Daha fazla içerik eklenmelidir."})
-        elif text_html_ratio >= 15:
-            result["score"] += 2
-
-        if readability < 40:
-            result["issues"].append({"severity": "info", "category": "content", "message": f"İçerik okunabilirliği düşük (Skor: {readability:.0f}/100). Daha kısa cümleler önerilir."})
-        elif readability >= 60:
-            result["score"] += 2
-
+        result.update(evaluate("content_analysis", dict(result, text_html_ratio=text_html_ratio,
+                                                        readability=readability)))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -444,87 +638,24 @@ class SEOAuditor:
         if not soup:
             return {"score": 0, "issues": []}
 
-        for tag in soup(["script", "style", "nav", "footer", "header", "noscript"]):
-            tag.decompose()
-
-        text = soup.get_text(separator=" ", strip=True).lower()
-        # Turkish stop words
-        stop_words = {
-            "bir", "ve", "bu", "da", "de", "ile", "için", "olan", "olarak", "en",
-            "çok", "daha", "gibi", "ama", "ancak", "hem", "ya", "veya", "ise",
-            "her", "ne", "kadar", "sonra", "önce", "üzere", "biz", "siz", "ben",
-            "sen", "onun", "bunu", "şu", "var", "yok", "olan", "den", "dan",
-            "the", "and", "for", "that", "this", "with", "are", "was", "were",
-            "from", "has", "have", "been", "will", "can", "all", "its", "your",
-            "not", "but", "they", "you", "more", "some", "about",
-        }
-
-        words = re.findall(r'\b[a-zçğıöşü]{3,}\b', text)
-        filtered = [w for w in words if w not in stop_words and len(w) >= 3]
-        word_count = len(filtered)
-
-        # Single keywords
-        single_freq = Counter(filtered)
-        top_keywords = single_freq.most_common(20)
-
-        # Two-word phrases
-        bigrams = [f"{filtered[i]} {filtered[i+1]}" for i in range(len(filtered)-1)]
-        bigram_freq = Counter(bigrams)
-        top_bigrams = bigram_freq.most_common(10)
-
-        # Three-word phrases
-        trigrams = [f"{filtered[i]} {filtered[i+1]} {filtered[i+2]}" for i in range(len(filtered)-2)]
-        trigram_freq = Counter(trigrams)
-        top_trigrams = trigram_freq.most_common(5)
-
-        # Keyword in important elements
-        title = (soup.find("title") or type("", (), {"text": ""})()).text if soup.find("title") else ""
-        meta_desc = ""
+        title_tag = soup.find("title")
         md = soup.find("meta", attrs={"name": "description"})
-        if md and md.get("content"):
-            meta_desc = md["content"]
         h1_text = " ".join(h.get_text() for h in soup.find_all("h1"))
 
-        # Check if top keywords appear in title, meta, H1
-        keyword_placement = []
-        for kw, count in top_keywords[:5]:
-            placement = {
-                "keyword": kw,
-                "count": count,
-                "density": round((count / max(1, word_count)) * 100, 2),
-                "in_title": kw.lower() in title.lower(),
-                "in_meta_desc": kw.lower() in meta_desc.lower(),
-                "in_h1": kw.lower() in h1_text.lower(),
-            }
-            keyword_placement.append(placement)
-
-        result = {
-            "total_words_analyzed": word_count,
-            "top_keywords": [{"keyword": k, "count": c, "density": round((c/max(1, word_count))*100, 2)} for k, c in top_keywords],
-            "top_bigrams": [{"phrase": k, "count": c} for k, c in top_bigrams],
-            "top_trigrams": [{"phrase": k, "count": c} for k, c in top_trigrams],
-            "keyword_placement": keyword_placement,
-            "issues": [],
-            "score": 0,
-        }
-
-        if top_keywords:
-            top_kw = top_keywords[0][0]
-            top_density = (top_keywords[0][1] / max(1, word_count)) * 100
-            if top_density > 5:
-                result["issues"].append({"severity": "warning", "category": "keyword", "message": f"'{top_kw}' anahtar kelime yoğunluğu çok yüksek (%{top_density:.1f}). Keyword stuffing riski."})
-            elif top_density >= 1:
-                result["score"] += 4
-
-            if keyword_placement:
-                kp = keyword_placement[0]
-                if not kp["in_title"]:
-                    result["issues"].append({"severity": "warning", "category": "keyword", "message": f"En çok kullanılan kelime '{top_kw}' title'da geçmiyor."})
-                else:
-                    result["score"] += 3
-                if not kp["in_h1"]:
-                    result["issues"].append({"severity": "info", "category": "keyword", "message": f"En çok kullanılan kelime '{top_kw}' H1'de geçmiyor."})
-
+        result = keyword_profile(_body_text(soup),
+                                 title=title_tag.text if title_tag else "",
+                                 meta_desc=md["content"] if md and md.get("content") else "",
+                                 h1_text=h1_text)
+        keyword_placement = result["keyword_placement"]
+        word_count = result["total_words_analyzed"]
+
+        top = keyword_placement[0] if keyword_placement else {}
+        result.update(evaluate("keyword_analysis", {
+            "top_keyword": top.get("keyword", ""),
+            "top_density": (top.get("count", 0) / max(1, word_count)) * 100,
+            "top_in_title": top.get("in_title", False),
+            "top_in_h1": top.get("in_h1", False),
+        }))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -550,73 +681,39 @@ class SEOAuditor:
             # Redirects
             if resp.history:
                 result["details"]["redirect_chain"] = [r.url for r in resp.history] + [resp.url]
-                if len(resp.history) > 2:
-                    result["issues"].append({"severity": "warning", "category": "technical", "message": f"{len(resp.history)} yönlendirme var. Fazla yönlendirme hızı etkiler."})
-
-            # Response time
-            if load_time > 3:
-                result["issues"].append({"severity": "critical", "category": "technical", "message": f"Sayfa çok yavaş ({load_time:.1f}s). 3s altı önerilir."})
-            elif load_time > 1.5:
-                result["issues"].append({"severity": "warning", "category": "technical", "message": f"Sayfa yavaş ({load_time:.1f}s). 1.5s altı ideal."})
-            else:
-                result["score"] += 8
-
-            # HTTPS
-            if not result["details"]["is_https"]:
-                result["issues"].append({"severity": "critical", "category": "technical", "message": "HTTPS kullanılmıyor! Güvenlik sorunu."})
-            else:
-                result["score"] += 5
-
-            # Page size
-            size_kb = result["details"]["content_size_kb"]
-            if size_kb > 3000:
-                result["issues"].append({"severity": "warning", "category": "technical", "message": f"Sayfa boyutu çok büyük ({size_kb:.0f} KB). 3MB altı önerilir."})
-            elif size_kb < 1500:
-                result["score"] += 2
 
-            # Compression
+            # Compression / caching headers
             content_encoding = resp.headers.get("Content-Encoding", "")
             result["details"]["compression"] = content_encoding or "Yok"
-            if not content_encoding:
-                result["issues"].append({"severity": "warning", "category": "technical", "message": "Gzip/Brotli sıkıştırma aktif değil. Sayfa hızını artırır."})
-            else:
-                result["score"] += 3
-
-            # Caching
             cache_control = resp.headers.get("Cache-Control", "")
             result["details"]["cache_control"] = cache_control or "Yok"
-            if not cache_control:
-                result["issues"].append({"severity": "info", "category": "technical", "message": "Cache-Control başlığı yok. Önbellekleme performansı artırır."})
-            else:
-                result["score"] += 2
 
             # Robots.txt
+            robots_text = None
             try:
                 rr = requests.get(urljoin(self.url, "/robots.txt"), headers=self._headers, timeout=5)
                 result["details"]["has_robots_txt"] = rr.status_code == 200
                 if rr.status_code == 200:
+                    robots_text = rr.text
                     result["details"]["robots_txt_content"] = rr.text[:500]
-                    result["score"] += 2
             except:
                 result["details"]["has_robots_txt"] = False
 
-            # Sitemap
+            # Sitemap (streamed; follows sitemap indexes and .gz files)
             try:
-                sr = requests.get(urljoin(self.url, "/sitemap.xml"), headers=self._headers, timeout=5)
-                result["details"]["has_sitemap"] = sr.status_code == 200
-                if sr.status_code == 200:
-                    result["score"] += 2
-                    # Count URLs in sitemap
-                    sitemap_soup = BeautifulSoup(sr.text, "html.parser")
-                    sitemap_urls = sitemap_soup.find_all("url")
-                    result["details"]["sitemap_url_count"] = len(sitemap_urls)
+                sitemap = self._get_sitemap(robots_text)
+                result["details"]["has_sitemap"] = sitemap["found"]
+                if sitemap["found"]:
+                    result["details"]["sitemap_url_count"] = sitemap["url_count"]
+                    result["details"]["sitemap_files_read"] = sitemap["files_read"]
+                    result["details"]["sitemap_lastmod_count"] = sitemap["lastmod_count"]
+                    result["details"]["sitemap_newest_lastmod"] = sitemap["newest_lastmod"]
             except:
                 result["details"]["has_sitemap"] = False
 
-            if not result["details"].get("has_sitemap"):
-                result["issues"].append({"severity": "warning", "category": "technical", "message": "Sitemap.xml bulunamadı."})
-            if not result["details"].get("has_robots_txt"):
-                result["issues"].append({"severity": "warning", "category": "technical", "message": "Robots.txt bulunamadı."})
+            result.update(evaluate("technical", dict(result["details"], load_time=load_time,
+                                                     has_compression=bool(content_encoding),
+                                                     has_cache_control=bool(cache_control))))
 
         except Exception as e:
             result["details"]["error"] = str(e)
@@ -632,33 +729,19 @@ class SEOAuditor:
             return {"score": 0, "issues": []}
 
         headers = resp.headers
-        result = {"headers": {}, "issues": [], "score": 0}
-
-        security_checks = {
-            "Strict-Transport-Security": {"severity": "warning", "message": "HSTS başlığı eksik. HTTPS zorlaması önerilir."},
-            "X-Content-Type-Options": {"severity": "info", "message": "X-Content-Type-Options başlığı eksik."},
-            "X-Frame-Options": {"severity": "info", "message": "X-Frame-Options başlığı eksik. Clickjacking koruması önerilir."},
-            "Content-Security-Policy": {"severity": "info", "message": "Content-Security-Policy başlığı eksik."},
-            "X-XSS-Protection": {"severity": "info", "message": "X-XSS-Protection başlığı eksik."},
-        }
-
-        found_count = 0
-        for header, check in security_checks.items():
-            value = headers.get(header, "")
-            result["headers"][header] = value or "Eksik"
-            if value:
-                found_count += 1
-            else:
-                result["issues"].append({"severity": check["severity"], "category": "security", "message": check["message"]})
+        security_headers = ["Strict-Transport-Security", "X-Content-Type-Options", "X-Frame-Options",
+                            "Content-Security-Policy", "X-XSS-Protection"]
+        present = {h: headers.get(h, "") for h in security_headers}
+        server = headers.get("Server", "")
 
-        result["score"] = min(5, found_count)
+        result = evaluate("security_headers", {"headers": present, "server": server})
+        result["headers"] = {h: value or "Eksik" for h, value in present.items()}
+        found_count = sum(1 for value in present.values() if value)
         result["security_grade"] = "A" if found_count >= 4 else "B" if found_count >= 3 else "C" if found_count >= 2 else "D" if found_count >= 1 else "F"
 
         # Server header (info leak)
-        server = headers.get("Server", "")
         if server:
             result["headers"]["Server"] = server
-            result["issues"].append({"severity": "info", "category": "security", "message": f"Server başlığı açık: '{server}'. Gizlenmesi önerilir."})
 
         return result
 
@@ -671,19 +754,15 @@ class SEOAuditor:
             return {"score": 0, "issues": []}
 
         soup = BeautifulSoup(resp.text, "html.parser")
-        result = {"issues": [], "score": 0, "details": {}}
+        result = {"details": {}}
 
         # CSS files
         css_files = soup.find_all("link", attrs={"rel": "stylesheet"})
         result["details"]["css_files"] = len(css_files)
-        if len(css_files) > 10:
-            result["issues"].append({"severity": "warning", "category": "speed", "message": f"{len(css_files)} CSS dosyası yükleniyor. Birleştirme önerilir."})
 
         # JS files
         js_files = soup.find_all("script", src=True)
         result["details"]["js_files"] = len(js_files)
-        if len(js_files) > 15:
-            result["issues"].append({"severity": "warning", "category": "speed", "message": f"{len(js_files)} JavaScript dosyası yükleniyor. Birleştirme önerilir."})
 
         # Render-blocking resources
         blocking_css = [l for l in css_files if not l.get("media") or l.get("media") == "all"]
@@ -691,9 +770,6 @@ class SEOAuditor:
         result["details"]["blocking_css"] = len(blocking_css)
         result["details"]["blocking_js"] = len(blocking_js)
 
-        if len(blocking_js) > 5:
-            result["issues"].append({"severity": "warning", "category": "speed", "message": f"{len(blocking_js)} render-blocking JS dosyası. async/defer kullanılmalı."})
-
         # Inline CSS/JS
         inline_styles = soup.find_all("style")
         inline_scripts = soup.find_all("script", src=False)
@@ -704,17 +780,12 @@ class SEOAuditor:
         # Total resource estimate
         total_resources = len(css_files) + len(js_files) + len(soup.find_all("img"))
         result["details"]["total_resources"] = total_resources
-        if total_resources <= 30:
-            result["score"] += 3
-        elif total_resources <= 60:
-            result["score"] += 1
 
         # Preload/prefetch
-        preloads = soup.find_all("link", attrs={"rel": re.compile(r"preload|prefetch|preconnect")})
+        preloads = soup.find_all("link", attrs={"rel": RESOURCE_HINT_REL})
         result["details"]["preload_hints"] = len(preloads)
-        if preloads:
-            result["score"] += 2
 
+        result.update(evaluate("page_speed", result["details"]))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -725,19 +796,16 @@ class SEOAuditor:
         if not soup:
             return {"score": 0, "issues": []}
 
-        result = {"issues": [], "score": 0, "details": {}}
+        result = {"details": {}}
 
         # Viewport
         viewport = soup.find("meta", attrs={"name": "viewport"})
         result["details"]["has_viewport"] = bool(viewport)
         if viewport:
             result["details"]["viewport_content"] = viewport.get("content", "")
-            result["score"] += 3
-        else:
-            result["issues"].append({"severity": "critical", "category": "mobile", "message": "Viewport meta etiketi yok!"})
 
         # Touch icons
-        touch_icon = soup.find("link", attrs={"rel": re.compile(r"apple-touch-icon")})
+        touch_icon = soup.find("link", attrs={"rel": TOUCH_ICON_REL})
         result["details"]["has_touch_icon"] = bool(touch_icon)
 
         # Media queries in inline CSS
@@ -745,18 +813,13 @@ class SEOAuditor:
         all_css = " ".join(s.string or "" for s in styles)
         has_media_queries = "@media" in all_css
         result["details"]["has_media_queries"] = has_media_queries
-        if has_media_queries:
-            result["score"] += 2
-
-        # Fixed widths
-        fixed_width_pattern = re.compile(r'width\s*:\s*\d{4,}px')
-        if fixed_width_pattern.search(all_css):
-            result["issues"].append({"severity": "warning", "category": "mobile", "message": "Çok büyük sabit piksel genişlikleri tespit edildi."})
 
         # AMP check
         amp_link = soup.find("link", attrs={"rel": "amphtml"})
         result["details"]["has_amp"] = bool(amp_link)
 
+        result.update(evaluate("mobile_friendly", dict(result["details"],
+                                                       has_fixed_width=bool(FIXED_WIDTH.search(all_css)))))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -792,22 +855,11 @@ class SEOAuditor:
             "microdata_types": microdata_types,
             "schema_count": len(parsed_schemas),
             "raw_schemas": parsed_schemas[:5],
-            "issues": [],
-            "score": 0,
         }
 
-        recommended = ["Organization", "LocalBusiness", "WebSite", "BreadcrumbList", "Product"]
-        if types:
-            result["score"] += 4
-            missing_recommended = [r for r in recommended if r not in types]
-            if missing_recommended:
-                result["issues"].append({
-                    "severity": "info", "category": "schema",
-                    "message": f"Önerilen schema tipleri eksik: {', '.join(missing_recommended[:3])}"
-                })
-        else:
-            result["issues"].append({"severity": "warning", "category": "schema", "message": "JSON-LD yapısal veri bulunamadı. Google zengin sonuçlar için eklenmeli."})
-
+        missing_recommended = [r for r in RECOMMENDED_SCHEMA_TYPES if r not in types]
+        result.update(evaluate("schema_markup", {"json_ld_types": types,
+                                                 "missing_recommended": ", ".join(missing_recommended[:3])}))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -818,34 +870,15 @@ class SEOAuditor:
         if not soup:
             return {"score": 0, "issues": [], "profiles": {}}
 
-        result = {"profiles": {}, "issues": [], "score": 0}
         page_text = str(soup)
-
-        social_patterns = {
-            "facebook": r'facebook\.com/([a-zA-Z0-9._-]+)',
-            "instagram": r'instagram\.com/([a-zA-Z0-9._-]+)',
-            "twitter": r'(?:twitter|x)\.com/([a-zA-Z0-9_]+)',
-            "linkedin": r'linkedin\.com/(?:company|in)/([a-zA-Z0-9_-]+)',
-            "youtube": r'youtube\.com/(?:channel|c|@|user)/([a-zA-Z0-9_-]+)',
-            "tiktok": r'tiktok\.com/@([a-zA-Z0-9._-]+)',
-            "pinterest": r'pinterest\.com/([a-zA-Z0-9_-]+)',
-        }
-
-        found_count = 0
-        for platform, pattern in social_patterns.items():
-            match = re.search(pattern, page_text)
+        profiles = {}
+        for platform, pattern in SOCIAL_PROFILES.items():
+            match = pattern.search(page_text)
             if match:
-                result["profiles"][platform] = match.group(1)
-                found_count += 1
-
-        if found_count >= 3:
-            result["score"] += 3
-        elif found_count >= 1:
-            result["score"] += 1
-
-        if found_count == 0:
-            result["issues"].append({"severity": "info", "category": "social", "message": "Sosyal medya profil bağlantısı bulunamadı."})
+                profiles[platform] = match.group(1)
 
+        result = evaluate("social_media", {"profile_count": len(profiles)})
+        result["profiles"] = profiles
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -857,26 +890,26 @@ class SEOAuditor:
         if not soup:
             return {"score": 0, "issues": []}
 
-        result = {"indicators": {}, "issues": [], "score": 0}
+        result = {"indicators": {}}
 
         # Check for external trust signals
-        page_text = str(soup).lower()
+        raw_html = str(soup)
+        page_text = raw_html.lower()
 
         # SSL certificate (already checked in technical)
         result["indicators"]["has_ssl"] = self.url.startswith("https")
 
         # Domain age indicator (check copyright year)
-        copyright_match = re.search(r'©\s*(\d{4})', str(soup))
+        domain_age_est = None
+        copyright_match = COPYRIGHT_YEAR.search(raw_html)
         if copyright_match:
             year = int(copyright_match.group(1))
             current_year = datetime.now().year
             domain_age_est = current_year - year
             result["indicators"]["estimated_domain_age"] = f"{domain_age_est} yıl+"
-            if domain_age_est >= 3:
-                result["score"] += 2
 
         # External links pointing indicators
-        result["indicators"]["external_link_count"] = len(soup.find_all("a", href=re.compile(r'^https?://')))
+        result["indicators"]["external_link_count"] = len(soup.find_all("a", href=ABSOLUTE_HREF))
 
         # Social proof signals
         social_signals = ["facebook", "instagram", "twitter", "linkedin", "youtube"]
@@ -887,22 +920,19 @@ class SEOAuditor:
         trust_keywords = ["sertifika", "certificate", "iso", "fssc", "haccp", "halal", "helal", "kalite", "quality", "award", "ödül"]
         found_trust = [kw for kw in trust_keywords if kw in page_text]
         result["indicators"]["trust_signals"] = found_trust
-        if len(found_trust) >= 2:
-            result["score"] += 2
 
         # Contact information completeness
-        has_phone = bool(re.search(r'[\+]?[\d\s\-\(\)]{10,}', str(soup)))
-        has_email = bool(re.search(r'[\w\.-]+@[\w\.-]+\.\w+', str(soup)))
+        has_phone = bool(PHONE.search(raw_html))
+        has_email = bool(EMAIL.search(raw_html))
         has_address = any(kw in page_text for kw in ["adres", "address", "mahalle", "sokak", "cadde"])
         result["indicators"]["has_phone"] = has_phone
         result["indicators"]["has_email"] = has_email
         result["indicators"]["has_address"] = has_address
-        if all([has_phone, has_email, has_address]):
-            result["score"] += 2
-
-        if not has_phone and not has_email:
-            result["issues"].append({"severity": "warning", "category": "backlink", "message": "İletişim bilgileri eksik. Güven sinyali düşük."})
 
+        result.update(evaluate("backlink_indicators", {
+            "domain_age": domain_age_est, "trust_signal_count": len(found_trust),
+            "has_phone": has_phone, "has_email": has_email, "has_address": has_address,
+        }))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -913,7 +943,7 @@ class SEOAuditor:
         if not soup:
             return {"score": 0, "issues": []}
 
-        result = {"readiness": {}, "issues": [], "score": 0}
+        result = {"readiness": {}}
 
         # Lists (ol, ul)
         ordered_lists = soup.find_all("ol")
@@ -957,105 +987,263 @@ class SEOAuditor:
                 pass
         result["readiness"]["has_faq_schema"] = has_faq_schema
 
-        # Score
-        if result["readiness"]["has_lists"]:
-            result["score"] += 1
-        if result["readiness"]["has_tables"]:
-            result["score"] += 1
-        if result["readiness"]["has_faq_content"]:
-            result["score"] += 1
-        if definition_ready >= 2:
-            result["score"] += 1
-        if has_faq_schema:
-            result["score"] += 2
-
-        if not result["readiness"]["has_lists"] and not result["readiness"]["has_tables"]:
-            result["issues"].append({"severity": "info", "category": "snippet", "message": "Listeler veya tablolar yok. Featured snippet şansı artırılabilir."})
-        if not result["readiness"]["has_faq_content"]:
-            result["issues"].append({"severity": "info", "category": "snippet", "message": "FAQ/SSS içeriği bulunamadı. Soru-cevap formatı snippet için etkili."})
-
+        result.update(evaluate("featured_snippet", result["readiness"]))
         return result
 
     # ═══════════════════════════════════════════════════════════════
     #  15. MULTI-PAGE CRAWL (NEW)
     # ═══════════════════════════════════════════════════════════════
-    def _crawl_internal_pages(self, max_pages=5):
+    def _crawl_internal_pages(self, max_pages=None):
         """Crawl key internal pages for common issues."""
+        max_pages = max_pages or self.max_pages
         soup = self._get_soup()
         if not soup:
             return {"pages_crawled": 0, "issues": [], "score": 0}
 
-        # Find important internal links
-        links = soup.find_all("a", href=True)
-        internal_urls = set()
-        for link in links:
-            href = link["href"]
-            full_url = urljoin(self.url, href)
-            parsed = urlparse(full_url)
-            if parsed.netloc == self.domain and full_url != self.url:
-                # Skip anchors, images, assets
-                if not any(ext in full_url.lower() for ext in [".jpg", ".png", ".gif", ".pdf", ".css", ".js", "#"]):
-                    internal_urls.add(full_url)
+        def crawlable(full_url):
+            # Skip other hosts, the home page itself, anchors, images, assets
+            return (urlparse(full_url).netloc == self.domain and full_url != self.url
+                    and not any(ext in full_url.lower() for ext in [".jpg", ".png", ".gif", ".pdf", ".css", ".js", "#"]))
 
-        pages_to_crawl = list(internal_urls)[:max_pages]
-        result = {"pages_crawled": 0, "page_results": [], "common_issues": [], "issues": [], "score": 0}
+        # Seed with the most recently modified sitemap URLs, then fill from home page links
+        pages_to_crawl = []
+        seen = set()
+        sitemap_seeds = 0
+        try:
+            seeds = self._get_sitemap().get("seeds", [])
+        except Exception:
+            seeds = []
+        for seed in seeds:
+            if len(pages_to_crawl) >= max_pages:
+                break
+            if crawlable(seed["url"]) and seed["url"] not in seen:
+                seen.add(seed["url"])
+                pages_to_crawl.append(seed["url"])
+                sitemap_seeds += 1
+
+        for link in soup.find_all("a", href=True):
+            if len(pages_to_crawl) >= max_pages:
+                break
+            full_url = urljoin(self.url, link["href"])
+            if crawlable(full_url) and full_url not in seen:
+                seen.add(full_url)
+                pages_to_crawl.append(full_url)
+
+        result = {"pages_crawled": 0, "pages_reused": 0, "sitemap_seeds": sitemap_seeds,
+                  "page_results": []}
+
+        fetched = {}   # url -> status, load time and hash of the fetched body
+        analyzed = {}  # url -> page record (fresh or reused from the previous audit)
+
+        def bodies_to_analyze():
+            # Fetches lazily, so only pages waiting for a worker are held in memory
+            for page_url in pages_to_crawl:
+                try:
+                    start = time.time()
+                    resp = self._fetch_page(page_url, remember=False)
+                    load_time = time.time() - start
+                    if resp is None:
+                        continue
+                    self._crawl_from_cache += bool(getattr(resp, "from_cache", False))
+                    self._timings["pages"].append({"url": page_url, "elapsed": round(load_time, 3)})
+                    self._emit("page", url=page_url, status=resp.status_code, elapsed=round(load_time, 3),
+                               from_cache=bool(getattr(resp, "from_cache", False)),
+                               done=len(self._timings["pages"]), total=len(pages_to_crawl))
+
+                    digest = content_hash(resp)
+                    fetched[page_url] = {
+                        "status": resp.status_code,
+                        "load_time": round(load_time, 2),
+                        "content_hash": digest,
+                        "html_bytes": len(resp.content),
+                        "analysis_version": ANALYSIS_VERSION,
+                    }
+                    if resp.history:
+                        fetched[page_url]["redirect_chain"] = [r.url for r in resp.history] + [resp.url]
+                    previous = self._previous_pages.get(page_url) or {}
+                    stored = previous.get("result") or {}
+                    if (previous.get("content_hash") == digest
+                            and stored.get("analysis_version") == ANALYSIS_VERSION):
+                        # Body unchanged since the last stored audit: reuse its analysis
+                        analyzed[page_url] = dict(stored)
+                        result["pages_reused"] += 1
+                    else:
+                        yield page_url, resp.url, resp.text
+                except Exception:
+                    pass
+
+        if len(pages_to_crawl) >= Config.SEO_PARSE_PROCESS_MIN_PAGES:
+            records = analyze_pages(bodies_to_analyze(), pool=self._parse_pool)
+        else:
+            records = _analyze_page_chunk(list(bodies_to_analyze()))
+        for page_url, page_info in records:
+            analyzed[page_url] = page_info
 
         pages_missing_title = 0
         pages_missing_desc = 0
         pages_missing_h1 = 0
         pages_slow = 0
+        keyword_map = SiteKeywordMap()
+        fingerprints = {}
+        home_soup = self._get_soup()
+        if home_soup:
+            home_title = home_soup.find("title")
+            home_desc = home_soup.find("meta", attrs={"name": "description"})
+            home_text = _body_text(home_soup)
+            keyword_map.add_page(self.url, page_terms(home_text))
+            fingerprints[self.url] = page_fingerprint(home_text, home_title.text if home_title else "",
+                                                      home_desc.get("content", "") if home_desc else "")
 
         for page_url in pages_to_crawl:
-            try:
-                start = time.time()
-                resp = requests.get(page_url, headers=self._headers, timeout=10)
-                load_time = time.time() - start
-                page_soup = BeautifulSoup(resp.text, "html.parser")
-
-                title = page_soup.find("title")
-                meta_desc = page_soup.find("meta", attrs={"name": "description"})
-                h1 = page_soup.find("h1")
-
-                page_info = {
-                    "url": page_url,
-                    "status": resp.status_code,
-                    "load_time": round(load_time, 2),
-                    "has_title": bool(title and title.text.strip()),
-                    "title": (title.text.strip()[:60] if title else "Yok"),
-                    "has_meta_desc": bool(meta_desc and meta_desc.get("content")),
-                    "has_h1": bool(h1),
-                }
-                result["page_results"].append(page_info)
-                result["pages_crawled"] += 1
-
-                if not page_info["has_title"]:
-                    pages_missing_title += 1
-                if not page_info["has_meta_desc"]:
-                    pages_missing_desc += 1
-                if not page_info["has_h1"]:
-                    pages_missing_h1 += 1
-                if load_time > 3:
-                    pages_slow += 1
-
-            except:
-                pass
-
-        if pages_missing_title > 0:
-            result["common_issues"].append(f"{pages_missing_title} iç sayfada title eksik")
-        if pages_missing_desc > 0:
-            result["common_issues"].append(f"{pages_missing_desc} iç sayfada meta description eksik")
-        if pages_missing_h1 > 0:
-            result["common_issues"].append(f"{pages_missing_h1} iç sayfada H1 eksik")
-        if pages_slow > 0:
-            result["common_issues"].append(f"{pages_slow} iç sayfa 3 saniyeden yavaş")
+            if page_url not in analyzed or page_url not in fetched:
+                continue
+            page_info = analyzed[page_url]
+            page_info.update(fetched[page_url], url=page_url)
+            result["page_results"].append(page_info)
+            result["pages_crawled"] += 1
+
+            if not page_info["has_title"]:
+                pages_missing_title += 1
+            if not page_info["has_meta_desc"]:
+                pages_missing_desc += 1
+            if not page_info["has_h1"]:
+                pages_missing_h1 += 1
+            if page_info["load_time"] > 3:
+                pages_slow += 1
+            keyword_map.add_page(page_url, page_info.get("terms", {}))
+            if page_info.get("fingerprint"):
+                fingerprints[page_url] = page_info["fingerprint"]
+
+        # Site-wide link health: every link on the home + crawled pages, checked once
+        found_on = {}
+        home_links = []
+        for link in soup.find_all("a", href=True):
+            url = normalize_link(urljoin(self.url, link["href"]))
+            if url:
+                home_links.append(url)
+                found_on.setdefault(url, self.url)
+        for page in result["page_results"]:
+            for url in page.get("links", []):
+                found_on.setdefault(url, page["url"])
+        checked = self._link_checker.check(list(found_on))
+        site_broken = [{"url": url, "status": r["status"], "found_on": found_on[url],
+                        "type": "internal" if urlparse(url).netloc == self.domain else "external"}
+                       for url, r in checked.items() if not r["ok"]]
+        result["site_links_checked"] = len(checked)
+        result["site_broken_links"] = site_broken[:100]
+        result["site_broken_link_count"] = len(site_broken)
+
+        # Internal edges + redirects (from crawled fetches and link probes) for the link graph
+        def internal(url):
+            return urlparse(url).netloc == self.domain
+        redirects = {url: {"final_url": r["final_url"], "hops": r["redirects"]}
+                     for url, r in checked.items()
+                     if r.get("redirects") and internal(url) and internal(r.get("final_url", ""))}
+        for page in result["page_results"]:
+            chain = page.get("redirect_chain")
+            if chain and internal(chain[-1]):
+                redirects[page["url"]] = {"final_url": chain[-1], "hops": len(chain) - 1, "chain": chain}
+        page_links = {self.url: [u for u in home_links if internal(u)]}
+        for page in result["page_results"]:
+            page_links[page["url"]] = [u for u in page.get("links", []) if internal(u)]
+        self._link_graph_input = {"page_links": page_links, "redirects": redirects}
+        self._crawled_assets = {page["url"]: {"html_bytes": page.get("html_bytes", 0), "assets": page.get("assets", [])}
+                                for page in result["page_results"]}
+
+        result["site_keywords"] = keyword_map.summary()
+        duplicates = analyze_duplicates(fingerprints)
+        result["duplicates"] = duplicates
+
+        result.update(evaluate("multi_page", {
+            "pages_crawled": result["pages_crawled"],
+            "near_duplicate_pages": duplicates["near_duplicate_pages"],
+            "near_duplicate_clusters": len(duplicates["near_duplicate_clusters"]),
+            "duplicate_title_pages": duplicates["duplicate_title_pages"],
+            "duplicate_description_pages": duplicates["duplicate_description_pages"],
+            "thin_page_count": duplicates["thin_page_count"],
+            "site_broken_internal": sum(1 for b in site_broken if b["type"] == "internal"),
+            "pages_missing_title": pages_missing_title,
+            "pages_missing_desc": pages_missing_desc,
+            "pages_missing_h1": pages_missing_h1,
+            "pages_slow": pages_slow,
+        }))
+        result["common_issues"] = [i["message"] for i in result["issues"]]
+        return result
 
-        if result["common_issues"]:
-            for issue in result["common_issues"]:
-                result["issues"].append({"severity": "warning", "category": "multipage", "message": issue})
+    @staticmethod
+    def _analyze_crawled_page(resp):
+        """Lightweight title/description/H1 check of one crawled page, with its own issues and score."""
+        page_soup = BeautifulSoup(resp.text, "html.parser")
+        title = page_soup.find("title")
+        meta_desc = page_soup.find("meta", attrs={"name": "description"})
+        h1 = page_soup.find("h1")
+
+        links = {normalize_link(urljoin(resp.url, a["href"])) for a in page_soup.find_all("a", href=True)}
+        links.discard(None)
+        assets = extract_assets(page_soup, resp.url)  # before _body_text strips the scripts
+        text = _body_text(page_soup)
+
+        page_info = {
+            "has_title": bool(title and title.text.strip()),
+            "title": (title.text.strip()[:60] if title else "Yok"),
+            "has_meta_desc": bool(meta_desc and meta_desc.get("content")),
+            "has_h1": bool(h1),
+            "links": sorted(links)[:300],
+            "assets": assets[:150],
+            "terms": page_terms(text),
+            "fingerprint": page_fingerprint(text, title.text if title else "",
+                                            meta_desc.get("content", "") if meta_desc else ""),
+        }
+        page_info.update(evaluate("page", page_info))
+        return page_info
 
-        if result["pages_crawled"] > 0 and not result["common_issues"]:
-            result["score"] += 3
+    # ═══════════════════════════════════════════════════════════════
+    #  16. INTERNAL LINK GRAPH (PageRank, click depth, orphans)
+    # ═══════════════════════════════════════════════════════════════
+    def _analyze_link_graph(self):
+        """Internal PageRank, click depth, orphan sitemap pages and redirect chains over the crawl."""
+        if self._link_graph_input is None:
+            return {"score": 0, "issues": []}
+        try:
+            sitemap = self._get_sitemap()
+        except Exception:
+            sitemap = {}
+        # Only the first crawl-sized slice of the sitemap is kept; seeds are sitemap URLs too
+        sitemap_urls = list(dict.fromkeys(
+            u for u in sitemap.get("urls", []) + [s["url"] for s in sitemap.get("seeds", [])]
+            if urlparse(u).netloc == self.domain))
+        result = analyze_link_graph(self.url, self._link_graph_input["page_links"],
+                                    sitemap_urls=sitemap_urls,
+                                    redirects=self._link_graph_input["redirects"],
+                                    sitemap_total=sitemap.get("url_count", len(sitemap_urls)))
+        result["sitemap_url_count"] = sitemap.get("url_count", len(sitemap_urls))
+        result.update(evaluate("link_graph", result))
+        return result
 
+    # ═══════════════════════════════════════════════════════════════
+    #  17. ASSET WEIGHT (CSS/JS/image bytes, compression)
+    # ═══════════════════════════════════════════════════════════════
+    def _analyze_asset_weight(self):
+        """Page weight of the home and crawled pages; each unique asset URL is sized once."""
+        home = self._fetch_page()
+        soup = self._get_soup()
+        if not soup:
+            return {"score": 0, "issues": []}
+        pages = {self.url: {"html_bytes": len(home.content), "assets": extract_assets(soup, self.url)}}
+        pages.update(self._crawled_assets)
+        result = AssetProfiler(checker=self._link_checker).profile(pages)
+
+        home_weight = next((p for p in result["page_weights"] if p["url"] == self.url), {})
+        result["home_bytes"] = home_weight.get("total_bytes", 0)
+        result["home_blocking_bytes"] = home_weight.get("blocking_bytes", 0)
+        result.update(evaluate("asset_weight", dict(
+            result,
+            home_kb=round(result["home_bytes"] / 1024),
+            home_blocking_kb=round(result["home_blocking_bytes"] / 1024),
+            uncompressed_kb=round(result["uncompressed_bytes"] / 1024),
+            page_limit_kb=Config.SEO_PAGE_WEIGHT_MAX_KB,
+            image_limit_kb=Config.SEO_IMAGE_MAX_KB,
+        )))
         return result
 
     # ═══════════════════════════════════════════════════════════════
@@ -1075,40 +1263,9 @@ class SEOAuditor:
         }
 
         # Compare key metrics
-        metrics = {
-            "SEO Puanı": (self.results.get("overall_score", 0), competitor_results.get("overall_score", 0)),
-            "Kelime Sayısı": (
-                self.results.get("content_analysis", {}).get("word_count", 0),
-                competitor_results.get("content_analysis", {}).get("word_count", 0),
-            ),
-            "İç Link": (
-                self.results.get("link_analysis", {}).get("internal_count", 0),
-                competitor_results.get("link_analysis", {}).get("internal_count", 0),
-            ),
-            "Dış Link": (
-                self.results.get("link_analysis", {}).get("external_count", 0),
-                competitor_results.get("link_analysis", {}).get("external_count", 0),
-            ),
-            "Yanıt Süresi": (
-                self.results.get("technical", {}).get("details", {}).get("response_time", 0),
-                competitor_results.get("technical", {}).get("details", {}).get("response_time", 0),
-            ),
-            "Görsel Sayısı": (
-                self.results.get("image_analysis", {}).get("total", 0),
-                competitor_results.get("image_analysis", {}).get("total", 0),
-            ),
-            "Schema Tipi": (
-                len(self.results.get("schema_markup", {}).get("json_ld_types", [])),
-                len(competitor_results.get("schema_markup", {}).get("json_ld_types", [])),
-            ),
-            "Kritik Sorun": (
-                sum(1 for i in self.results.get("issues", []) if i.get("severity") == "critical"),
-                sum(1 for i in competitor_results.get("issues", []) if i.get("severity") == "critical"),
-            ),
-        }
-
-        for metric, (yours, theirs) in metrics.items():
-            if metric in ("Yanıt Süresi", "Kritik Sorun"):
+        for metric, extract in COMPARISON_METRICS.items():
+            yours, theirs = extract(self.results), extract(competitor_results)
+            if metric in LOWER_IS_BETTER:
                 winner = "Siz" if yours <= theirs else "Rakip"
             else:
                 winner = "Siz" if yours >= theirs else "Rakip"
@@ -1127,16 +1284,10 @@ class SEOAuditor:
         total = 0
         all_issues = []
 
-        sections = [
-            "meta_analysis", "heading_structure", "image_analysis",
-            "link_analysis", "content_analysis", "keyword_analysis",
-            "technical", "security_headers", "page_speed",
-            "mobile_friendly", "schema_markup", "social_media",
-            "backlink_indicators", "featured_snippet", "multi_page",
-        ]
-
         section_scores = {}
-        for section in sections:
+        for section, _, _ in SECTIONS:
+            if section not in self.results:
+                continue
             data = self.results.get(section, {})
             if isinstance(data, dict):
                 score = data.get("score", 0)
@@ -1162,16 +1313,16 @@ class SEOAuditor:
         else:
             self.results["grade"] = "F"
 
+        rank = {severity: i for i, severity in enumerate(SEVERITIES)}
         self.results["issues"] = sorted(
             all_issues,
-            key=lambda x: {"critical": 0, "warning": 1, "info": 2}.get(x.get("severity", "info"), 3)
+            key=lambda x: rank.get(x.get("severity", "info"), len(SEVERITIES))
         )
 
         # Generate smart recommendations
         recs = []
-        critical_count = sum(1 for i in all_issues if i.get("severity") == "critical")
-        warning_count = sum(1 for i in all_issues if i.get("severity") == "warning")
-        info_count = sum(1 for i in all_issues if i.get("severity") == "info")
+        counts = Counter(i.get("severity") for i in all_issues)
+        critical_count, warning_count, info_count = (counts[s] for s in SEVERITIES)
 
         if critical_count > 0:
             recs.append(f"🔴 {critical_count} kritik sorun hemen düzeltilmeli")
@@ -1193,3 +1344,193 @@ class SEOAuditor:
             "warning_count": warning_count,
             "info_count": info_count,
         }
+
+
+# ═══════════════════════════════════════════════════════════════
+#  MULTI-SITE BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+class _FetchedPage:
+    """Stand-in for requests.Response carrying an already fetched body into a worker process."""
+
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+        self.status_code = 200
+        self.headers = {}
+
+
+def analyze_body_sections(url, html):
+    """Run every body-only analyzer on already fetched HTML (process-pool entry point)."""
+    auditor = SEOAuditor(url, use_cache=False)
+    auditor._page_cache[auditor.url] = _FetchedPage(auditor.url, html)
+    return {name: getattr(auditor, method)() for name, method, body_only in SECTIONS if body_only}
+
+
+def _process_pool(max_workers):
+    """Spawn-based process pool (safe to start from Streamlit's threaded server); None if unavailable."""
+    try:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+    except (OSError, ValueError, NotImplementedError):
+        return None
+
+
+def _audit_site(url, parse_pool, **auditor_kwargs):
+    """Audit one site: network sections on this thread, HTML parsing in the process pool.
+
+    Raises if the home page cannot be fetched, so an unreachable site is reported as
+    an error instead of being scored as an empty page.
+    """
+    auditor = SEOAuditor(url, parse_pool=parse_pool, **auditor_kwargs)
+    home = auditor._fetch_page()
+    if home is None:
+        raise Exception("Sayfa yüklenemedi")
+    body = auditor._cached_body_sections()
+    future = None
+    if body is None and parse_pool is not None and home is not None and home.status_code == 200:
+        future = parse_pool.submit(analyze_body_sections, auditor.url, home.text)
+
+    # Network-bound sections run while the worker parses the HTML
+    network = {name: getattr(auditor, method)() for name, method, body_only in SECTIONS if not body_only}
+    if future is not None:
+        try:
+            body = future.result()
+            auditor._store_body_sections(body)
+        except Exception:
+            body = None
+    return auditor.full_audit(precomputed={**(body or {}), **network})
+
+
+def benchmark_sites(your_url, competitor_urls, your_results=None, use_processes=True):
+    """Audit your site and N competitors concurrently and build a multi-site comparison matrix.
+
+    Each site's network I/O runs on its own thread over the shared session, HTTP
+    cache and link checker; HTML analysis is shipped to a process pool. Pass
+    `your_results` to reuse an audit of your site that has already finished.
+    """
+    start = time.time()
+    sites = list(dict.fromkeys(normalize_url(u.strip()) for u in [your_url, *competitor_urls] if u and u.strip()))
+    sites = sites[:Config.SEO_BENCHMARK_MAX_SITES]
+    your_site = sites[0]
+
+    site_results, errors = {}, {}
+    if your_results:
+        site_results[your_site] = your_results
+    pending = [s for s in sites if s not in site_results]
+
+    parse_pool = _process_pool(min(len(pending), os.cpu_count() or 1)) if use_processes and pending else None
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(pending))) as io_pool:
+            futures = {io_pool.submit(_audit_site, site, parse_pool): site for site in pending}
+            for future in concurrent.futures.as_completed(futures):
+                site = futures[future]
+                try:
+                    site_results[site] = future.result()
+                except Exception as e:
+                    errors[site] = str(e)
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+    audited = [s for s in sites if s in site_results]
+    matrix, leaders, your_rank = {}, {}, {}
+    if your_site not in site_results:
+        # Nothing to rank the competitors against
+        return {"your_site": your_site, "sites": [], "scores": {}, "grades": {}, "matrix": matrix,
+                "leaders": leaders, "your_rank": your_rank, "errors": errors,
+                "error": f"Siteniz denetlenemedi: {errors.get(your_site, 'bilinmeyen hata')}",
+                "elapsed": round(time.time() - start, 1)}
+    for metric, extract in COMPARISON_METRICS.items():
+        values = {s: extract(site_results[s]) for s in audited}
+        ranked = sorted(audited, key=lambda s: values[s], reverse=metric not in LOWER_IS_BETTER)
+        matrix[metric] = values
+        if ranked:
+            leaders[metric] = ranked[0]
+        if your_site in values:
+            your_rank[metric] = ranked.index(your_site) + 1
+
+    return {
+        "your_site": your_site,
+        "sites": audited,
+        "scores": {s: site_results[s].get("overall_score", 0) for s in audited},
+        "grades": {s: site_results[s].get("grade", "") for s in audited},
+        "matrix": matrix,
+        "leaders": leaders,
+        "your_rank": your_rank,
+        "errors": errors,
+        "elapsed": round(time.time() - start, 1),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+#  PARALLEL PAGE ANALYSIS
+# ═══════════════════════════════════════════════════════════════
+def _analyze_page_chunk(chunk):
+    """Analyze (url, final_url, html) bodies into compact (url, record) pairs; failed pages are skipped."""
+    records = []
+    for url, final_url, html in chunk:
+        try:
+            records.append((url, SEOAuditor._analyze_crawled_page(_FetchedPage(final_url, html))))
+        except Exception:
+            pass
+    return records
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze_pages(pages, workers=None, chunk_size=None, pool=None):
+    """Analyze fetched page bodies in a process pool, yielding (url, record) as chunks finish.
+
+    `pages` is an iterable of (url, final_url, html) and may be a lazy generator:
+    at most two chunks per worker are in flight, and the next chunk is only
+    pulled once one finishes, so memory stays bounded on large crawls.
+    Pass the caller's `pool` when several audits run at once; a private pool is
+    only started (and shut down) when none is given.
+    """
+    workers = workers or Config.SEO_PARSE_WORKERS or os.cpu_count() or 1
+    chunk_size = chunk_size or Config.SEO_PARSE_CHUNK_SIZE
+    own_pool = pool is None
+    if own_pool:
+        pool = _process_pool(workers)
+    if pool is None:
+        for chunk in _chunks(pages, chunk_size):
+            yield from _analyze_page_chunk(chunk)
+        return
+
+    def collect(future):
+        # A chunk whose worker died (or that could not be submitted) is analyzed in-process
+        try:
+            return future.result()
+        except Exception:
+            return _analyze_page_chunk(in_flight[future])
+
+    max_in_flight = workers * 2
+    in_flight = {}  # future -> chunk
+    try:
+        for chunk in _chunks(pages, chunk_size):
+            if len(in_flight) >= max_in_flight:
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield from collect(future)
+                    del in_flight[future]
+            try:
+                in_flight[pool.submit(_analyze_page_chunk, chunk)] = chunk
+            except Exception:
+                yield from _analyze_page_chunk(chunk)
+        for future in concurrent.futures.as_completed(list(in_flight)):
+            yield from collect(future)
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+        else:
+            for future in in_flight:
+                future.cancel()
@@ -0,0 +1,236 @@
+"""Batch SEO Audit - Every Client Website, Bounded Concurrency, Per-Domain Politeness & Bulk Persistence
+
+Usage (no Streamlit needed, e.g. from a nightly cron job):
+    python seo_batch.py
+    python seo_batch.py --workers 32 --max-pages 10 --deadline 240 --json portfolio.json
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from urllib.parse import urlparse
+from config import Config
+from database import init_db, fetch_all, insert_many
+from link_checker import LinkChecker
+from seo_auditor import normalize_url, _audit_site, _process_pool
+from seo_history import save_audits, load_previous_pages, comparable_score
+from seo_rules import SEVERITIES
+
+
+def domain_key(url):
+    """Host without "www." so www/non-www variants of a site share one politeness slot."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainGate:
+    """Limits concurrent audits per domain and spaces out their start times."""
+
+    def __init__(self, per_domain=None, delay=None):
+        self.per_domain = per_domain or Config.SEO_BATCH_PER_DOMAIN
+        self.delay = Config.SEO_BATCH_DOMAIN_DELAY if delay is None else delay
+        self._slots = defaultdict(lambda: threading.Semaphore(self.per_domain))
+        self._next_start = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, domain):
+        with self._lock:
+            slot = self._slots[domain]
+        slot.acquire()
+        with self._lock:
+            start_at = max(time.time(), self._next_start.get(domain, 0))
+            self._next_start[domain] = start_at + self.delay
+        time.sleep(max(0, start_at - time.time()))
+
+    def release(self, domain):
+        self._slots[domain].release()
+
+
+def client_sites():
+    """{normalized website: [client rows]} for every client with a website."""
+    sites = OrderedDict()
+    for client in fetch_all("clients", where="website IS NOT NULL AND TRIM(website) != ''",
+                            order_by="id ASC", limit=100000):
+        sites.setdefault(normalize_url(client["website"].strip()), []).append(client)
+    return sites
+
+
+def _interleave_by_domain(urls):
+    """Round-robin sites across domains so one busy domain doesn't hold every worker."""
+    by_domain = OrderedDict()
+    for url in urls:
+        by_domain.setdefault(domain_key(url), deque()).append(url)
+    queues = list(by_domain.values())
+    ordered = []
+    while queues:
+        for q in queues:
+            ordered.append(q.popleft())
+        queues = [q for q in queues if q]
+    return ordered
+
+
+def run_batch_audit(workers=None, max_pages=None, deadline_minutes=None, use_processes=True, log=print):
+    """Audit every client website and store the results; returns the portfolio summary.
+
+    Sites run on `workers` threads sharing one link checker (so per-host probe
+    limits hold across sites) and one process pool for HTML analysis. Results
+    are written SEO_BATCH_FLUSH_EVERY audits per transaction. With a deadline,
+    sites not yet started when it passes are skipped and reported.
+    """
+    init_db()
+    start = time.time()
+    workers = workers or Config.SEO_BATCH_WORKERS
+    deadline = start + deadline_minutes * 60 if deadline_minutes else None
+    sites = client_sites()
+    order = _interleave_by_domain(list(sites))
+    log(f"{len(order)} site ({sum(len(c) for c in sites.values())} müşteri) denetlenecek, {workers} eşzamanlı.")
+
+    gate = DomainGate()
+    checker = LinkChecker(headers={"User-Agent": "Mozilla/5.0 (compatible; OtonomAdsBot/4.0; +https://otonomreklam.com)"})
+    parse_pool = _process_pool(min(workers, os.cpu_count() or 1)) if use_processes else None
+    rows, errors, skipped = [], {}, []
+    pending_saves = []  # (client_id, results) not yet written
+
+    def flush():
+        if pending_saves:
+            save_audits(pending_saves)
+            del pending_saves[:]
+
+    def audit(site):
+        """(results, previous home score, seconds), or None if the deadline passed before it started."""
+        if deadline and time.time() > deadline:
+            return None
+        domain = domain_key(site)
+        gate.acquire(domain)
+        try:
+            site_start = time.time()
+            previous = load_previous_pages(site)
+            results = _audit_site(site, parse_pool, previous_pages=previous,
+                                  max_pages=max_pages, link_checker=checker)
+            return results, comparable_score(previous.get(site, {})), round(time.time() - site_start, 1)
+        finally:
+            gate.release(domain)
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(audit, site): site for site in order}
+            for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                site = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    errors[site] = str(e)
+                    log(f"[{done}/{len(order)}] ❌ {site}: {e}")
+                    continue
+                if outcome is None:
+                    skipped.append(site)
+                    continue
+                results, previous_score, elapsed = outcome
+                score = results.get("overall_score", 0)
+                counts = Counter(i.get("severity") for i in results.get("issues", []))
+                for client in sites[site]:
+                    rows.append({
+                        "client_id": client["id"],
+                        "client": client["name"],
+                        "url": site,
+                        "score": score,
+                        "grade": results.get("grade", ""),
+                        "previous_score": previous_score,
+                        "delta": round(score - previous_score, 1) if previous_score is not None else None,
+                        **{severity: counts[severity] for severity in SEVERITIES},
+                        "issue_codes": [i.get("code") for i in results.get("issues", []) if i.get("code")],
+                        "elapsed": elapsed,
+                    })
+                    pending_saves.append((client["id"], results))
+                log(f"[{done}/{len(order)}] ✅ {site}: {score}/100 ({results.get('grade', '')}) {elapsed}s")
+                if len(pending_saves) >= Config.SEO_BATCH_FLUSH_EVERY:
+                    flush()
+    finally:
+        flush()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+    insert_many("action_logs", [{
+        "client_id": r["client_id"],
+        "action_type": "seo_audit",
+        "description": f"Toplu SEO denetimi: {r['score']}/100 ({r['grade']})",
+        "severity": "info",
+    } for r in rows])
+    return portfolio_summary(rows, errors, skipped, time.time() - start)
+
+
+def portfolio_summary(rows, errors=None, skipped=None, elapsed=0):
+    """Score distribution, biggest movers and most common issues across the audited clients."""
+    scores = [r["score"] for r in rows]
+    code_counts = Counter(code for r in rows for code in set(r["issue_codes"]))
+    movers = [r for r in rows if r["delta"] is not None]
+    return {
+        "audited": len(rows),
+        "failed": errors or {},
+        "skipped": skipped or [],
+        "elapsed": round(elapsed, 1),
+        "avg_score": round(sum(scores) / len(scores), 1) if scores else 0,
+        "grades": dict(Counter(r["grade"] for r in rows)),
+        "critical_total": sum(r["critical"] for r in rows),
+        "worst": sorted(rows, key=lambda r: r["score"])[:10],
+        "regressions": sorted((r for r in movers if r["delta"] < 0), key=lambda r: r["delta"])[:10],
+        "improvements": sorted((r for r in movers if r["delta"] > 0), key=lambda r: r["delta"], reverse=True)[:10],
+        "common_issues": [{"code": code, "sites": n} for code, n in code_counts.most_common(15)],
+        "clients": sorted(rows, key=lambda r: r["client"]),
+    }
+
+
+def print_summary(summary):
+    print()
+    print("═" * 72)
+    print(f" PORTFÖY SEO ÖZETİ — {summary['audited']} müşteri, {summary['elapsed']} sn")
+    print("═" * 72)
+    print(f" Ortalama puan: {summary['avg_score']}   Kritik sorun: {summary['critical_total']}   "
+          f"Not dağılımı: {', '.join(f'{g}={n}' for g, n in sorted(summary['grades'].items()))}")
+    if summary["failed"]:
+        print(f" Başarısız: {len(summary['failed'])}   ", end="")
+    if summary["skipped"]:
+        print(f" Süre dolduğu için atlanan: {len(summary['skipped'])}", end="")
+    print()
+
+    def table(title, rows):
+        if not rows:
+            return
+        print(f"\n {title}")
+        for r in rows:
+            delta = f"{r['delta']:+}" if r["delta"] is not None else "  -"
+            print(f"   {r['score']:>5} {r['grade']:<2} {delta:>6}  {r['client'][:28]:<28} {r['url']}")
+
+    table("En düşük puanlar", summary["worst"])
+    table("En çok gerileyenler", summary["regressions"])
+    table("En çok iyileşenler", summary["improvements"])
+    if summary["common_issues"]:
+        print("\n En yaygın sorunlar")
+        for issue in summary["common_issues"]:
+            print(f"   {issue['sites']:>4} site  {issue['code']}")
+    for site, error in summary["failed"].items():
+        print(f"   ❌ {site}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tüm müşteri sitelerinde toplu SEO denetimi")
+    parser.add_argument("--workers", type=int, default=Config.SEO_BATCH_WORKERS, help="eşzamanlı site sayısı")
+    parser.add_argument("--max-pages", type=int, default=Config.SEO_CRAWL_MAX_PAGES, help="site başına taranan iç sayfa")
+    parser.add_argument("--deadline", type=float, help="dakika; sonrasında yeni site başlatılmaz")
+    parser.add_argument("--no-processes", action="store_true", help="HTML analizini işlem havuzu olmadan yap")
+    parser.add_argument("--json", help="özeti bu dosyaya JSON olarak yaz")
+    args = parser.parse_args()
+
+    summary = run_batch_audit(workers=args.workers, max_pages=args.max_pages,
+                              deadline_minutes=args.deadline, use_processes=not args.no_processes)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
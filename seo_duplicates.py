@@ -0,0 +1,126 @@
+"""Duplicate Content Detection - SimHash Fingerprints, LSH Banding & Duplicate Title/Description Maps"""
+import hashlib
+from collections import Counter, defaultdict
+from seo_keywords import tokenize, turkish_lower
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+# 4 bands of 16 bits: two fingerprints within 3 bits of each other must agree on
+# at least one whole band, so band buckets find every near-duplicate pair
+LSH_BANDS = 4
+MAX_DISTANCE = 3
+# Pages with fewer content words are reported as thin and left out of clustering
+THIN_CONTENT_WORDS = 100
+
+
+def _hash64(value):
+    # Stable across processes (unlike hash()), so worker fingerprints are comparable
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(tokens, shingle_size=SHINGLE_SIZE):
+    """64-bit SimHash of a token list, using word shingles weighted by frequency."""
+    if len(tokens) < shingle_size:
+        shingles = Counter([" ".join(tokens)]) if tokens else Counter()
+    else:
+        shingles = Counter(" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+    weights = [0] * SIMHASH_BITS
+    for shingle, weight in shingles.items():
+        h = _hash64(shingle)
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def _text_key(text):
+    """Short digest of whitespace/case-normalized text, for exact-duplicate hash maps."""
+    normalized = " ".join(turkish_lower(text).split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16] if normalized else None
+
+
+def page_fingerprint(text, title="", meta_desc=""):
+    """Compact per-page fingerprint: SimHash of the body plus title/description keys."""
+    tokens = tokenize(text, ())
+    return {
+        "simhash": format(simhash(tokens), "016x"),
+        "content_words": len(tokens),
+        "title_key": _text_key(title),
+        "desc_key": _text_key(meta_desc),
+    }
+
+
+def _hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def near_duplicate_clusters(fingerprints, max_distance=MAX_DISTANCE):
+    """Group {url: simhash int} into clusters of pages within `max_distance` bits.
+
+    Pages are bucketed by each 16-bit band. Inside a bucket a page is only
+    compared with one leader per group found so far, so thousands of
+    near-identical product pages cost one comparison each instead of one per pair.
+    """
+    band_bits = SIMHASH_BITS // LSH_BANDS
+    mask = (1 << band_bits) - 1
+    buckets = defaultdict(list)
+    for url, h in fingerprints.items():
+        for band in range(LSH_BANDS):
+            buckets[(band, h >> (band * band_bits) & mask)].append(url)
+
+    parent = {url: url for url in fingerprints}
+
+    def find(url):
+        while parent[url] != url:
+            parent[url] = parent[parent[url]]
+            url = parent[url]
+        return url
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        leaders = []  # (simhash, url) of each group seen in this bucket
+        for url in members:
+            h = fingerprints[url]
+            for leader_hash, leader in leaders:
+                if _hamming(h, leader_hash) <= max_distance:
+                    parent[find(url)] = find(leader)
+                    break
+            else:
+                leaders.append((h, url))
+
+    clusters = defaultdict(list)
+    for url in fingerprints:
+        clusters[find(url)].append(url)
+    return sorted((sorted(c) for c in clusters.values() if len(c) > 1), key=len, reverse=True)
+
+
+def duplicate_groups(keys):
+    """Group {url: key} by identical key; returns only keys shared by 2+ pages."""
+    groups = defaultdict(list)
+    for url, key in keys.items():
+        if key:
+            groups[key].append(url)
+    return sorted((urls for urls in groups.values() if len(urls) > 1), key=len, reverse=True)
+
+
+def analyze_duplicates(pages):
+    """Duplicate/thin content report over {url: page_fingerprint()} records."""
+    thin = [url for url, fp in pages.items() if fp.get("content_words", 0) < THIN_CONTENT_WORDS]
+    thin_set = set(thin)
+    clusters = near_duplicate_clusters({url: int(fp["simhash"], 16) for url, fp in pages.items()
+                                        if url not in thin_set and fp.get("simhash")})
+    titles = duplicate_groups({url: fp.get("title_key") for url, fp in pages.items()})
+    descs = duplicate_groups({url: fp.get("desc_key") for url, fp in pages.items()})
+    return {
+        "near_duplicate_clusters": clusters[:20],
+        "near_duplicate_pages": sum(len(c) for c in clusters),
+        "duplicate_titles": titles[:20],
+        "duplicate_title_pages": sum(len(g) for g in titles),
+        "duplicate_descriptions": descs[:20],
+        "duplicate_description_pages": sum(len(g) for g in descs),
+        "thin_pages": thin[:50],
+        "thin_page_count": len(thin),
+    }
@@ -0,0 +1,266 @@
+"""SEO Audit History - Normalized Issues, Compressed Section Details, Incremental Re-Audits & Audit Diffs"""
+import json
+import zlib
+from collections import defaultdict
+from database import get_conn
+from seo_auditor import normalize_url, SECTIONS, ANALYSIS_VERSION
+from seo_rules import SEVERITIES
+
+# Issue severity is stored as its index in SEVERITIES (0 = critical)
+SEVERITY_CODES = {name: i for i, name in enumerate(SEVERITIES)}
+
+
+def pack(obj):
+    """zlib-compressed compact JSON, stored as a BLOB."""
+    return zlib.compress(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack(value, default=None):
+    """Inverse of pack(); also reads the plain JSON text of rows written before compression."""
+    if value is None:
+        return default
+    if isinstance(value, bytes):
+        return json.loads(zlib.decompress(value))
+    return json.loads(value or "null") or default
+
+
+def _insert(conn, table, row):
+    cur = conn.execute(f"INSERT INTO {table} ({', '.join(row)}) VALUES ({', '.join(['?'] * len(row))})",
+                       list(row.values()))
+    return cur.lastrowid
+
+
+def _issue_rows(audit_id, page_id, section, issues):
+    return [[audit_id, page_id, section, i.get("code"), SEVERITY_CODES.get(i.get("severity"), len(SEVERITIES) - 1),
+             i.get("category"), i.get("message", "")] for i in issues]
+
+
+def _write_audit(conn, client_id, results):
+    section_scores = results.get("section_scores", {})
+    audit_id = _insert(conn, "seo_audits", {
+        "client_id": client_id,
+        "url": results.get("url"),
+        "page_speed_score": section_scores.get("page_speed"),
+        "mobile_score": section_scores.get("mobile_friendly"),
+        "seo_score": results.get("overall_score", 0),
+        "recommendations": json.dumps(results.get("recommendations", []), ensure_ascii=False),
+    })
+
+    issue_rows = []
+    home_page_id = None
+    for page in results.get("pages", []):
+        # Issues go to seo_issues; the stored result keeps everything else, compressed
+        result = {k: v for k, v in page.get("result", {}).items() if k != "issues"}
+        page_id = _insert(conn, "seo_page_audits", {
+            "audit_id": audit_id,
+            "client_id": client_id,
+            "url": page["url"],
+            "content_hash": page.get("content_hash"),
+            "status_code": page.get("status_code"),
+            "score": page.get("score"),
+            "result": pack(result),
+        })
+        if page["url"] == results.get("url"):
+            home_page_id = page_id
+        else:
+            issue_rows.extend(_issue_rows(audit_id, page_id, "page", page.get("issues", [])))
+
+    # Home page issues are stored once, per section; section details without their
+    # issues (and without the crawled pages, which have their own rows) are compressed
+    section_rows = []
+    for name, _, _ in SECTIONS:
+        data = results.get(name)
+        if not isinstance(data, dict):
+            continue
+        issue_rows.extend(_issue_rows(audit_id, home_page_id, name, data.get("issues", [])))
+        details = {k: v for k, v in data.items() if k not in ("issues", "page_results")}
+        section_rows.append([audit_id, name, data.get("score", 0), pack(details)])
+
+    conn.executemany("INSERT INTO seo_issues (audit_id, page_id, section, code, severity, category, message) "
+                     "VALUES (?,?,?,?,?,?,?)", issue_rows)
+    conn.executemany("INSERT INTO seo_audit_sections (audit_id, section, score, details) VALUES (?,?,?,?)",
+                     section_rows)
+    return audit_id
+
+
+def save_audits(entries):
+    """Persist many (client_id, results) audits, their pages and issues in one transaction; returns the audit ids."""
+    if not entries:
+        return []
+    conn = get_conn()
+    try:
+        audit_ids = [_write_audit(conn, client_id, results) for client_id, results in entries]
+        conn.commit()
+    finally:
+        conn.close()
+    return audit_ids
+
+
+def save_audit(client_id, results):
+    """Persist an audit row plus one row per audited page and per issue; returns the audit id."""
+    return save_audits([(client_id, results)])[0]
+
+
+def audit_handle(results, audit_id=None):
+    """Small session-state stand-in for full results; load_audit_results() brings them back."""
+    return {
+        "audit_id": audit_id,
+        "url": results.get("url"),
+        "overall_score": results.get("overall_score", 0),
+        "grade": results.get("grade", ""),
+        "partial": results.get("partial", False),
+        "timestamp": results.get("timestamp"),
+    }
+
+
+def recent_audit_ids(url, limit=2):
+    """Ids of the most recent audits of a site that have per-page records."""
+    conn = get_conn()
+    rows = conn.execute("""
+        SELECT a.id FROM seo_audits a
+        WHERE a.url = ? AND EXISTS (SELECT 1 FROM seo_page_audits p WHERE p.audit_id = a.id)
+        ORDER BY a.id DESC LIMIT ?
+    """, [normalize_url(url), limit]).fetchall()
+    conn.close()
+    return [r["id"] for r in rows]
+
+
+def latest_ai_recommendations(url):
+    """{"text", "generated_at", "audit_id"} of the newest batch-generated AI recommendations for a site, or None."""
+    conn = get_conn()
+    row = conn.execute("""
+        SELECT id, ai_recommendations, ai_generated_at FROM seo_audits
+        WHERE url = ? AND ai_recommendations IS NOT NULL ORDER BY id DESC LIMIT 1
+    """, [normalize_url(url)]).fetchone()
+    conn.close()
+    if row is None:
+        return None
+    return {"text": row["ai_recommendations"], "generated_at": row["ai_generated_at"], "audit_id": row["id"]}
+
+
+def _issues_by_page(conn, audit_id):
+    """{page_id: [issue dicts]} for one audit, most severe first."""
+    issues = defaultdict(list)
+    for r in conn.execute("SELECT * FROM seo_issues WHERE audit_id = ? ORDER BY severity, id", [audit_id]):
+        issues[r["page_id"]].append({"severity": SEVERITIES[r["severity"]], "category": r["category"],
+                                     "code": r["code"], "message": r["message"], "section": r["section"]})
+    return issues
+
+
+def load_audit_pages(audit_id):
+    """Per-page records of one audit as {url: record}."""
+    conn = get_conn()
+    rows = conn.execute("SELECT * FROM seo_page_audits WHERE audit_id = ? ORDER BY id", [audit_id]).fetchall()
+    issues = _issues_by_page(conn, audit_id)
+    conn.close()
+    pages = {}
+    for r in rows:
+        page = dict(r)
+        page["issues"] = issues.get(page["id"]) or unpack(page.get("issues"), [])
+        page["result"] = unpack(page["result"], {})
+        if "score" in page["result"]:
+            # Crawled page record: its issues are part of the reusable analysis
+            page["result"]["issues"] = page["issues"]
+        pages[page["url"]] = page
+    return pages
+
+
+def load_audit_results(audit_id):
+    """Rebuild an audit's results dict (sections, issues, crawled pages) from its stored rows."""
+    conn = get_conn()
+    audit = conn.execute("SELECT * FROM seo_audits WHERE id = ?", [audit_id]).fetchone()
+    if audit is None:
+        conn.close()
+        return None
+    sections = conn.execute("SELECT * FROM seo_audit_sections WHERE audit_id = ?", [audit_id]).fetchall()
+    conn.close()
+    pages = load_audit_pages(audit_id)
+    home = pages.get(audit["url"], {})
+
+    results = {"url": audit["url"], "overall_score": audit["seo_score"],
+               "grade": home.get("result", {}).get("grade", ""),
+               "section_scores": home.get("result", {}).get("section_scores", {}),
+               "recommendations": unpack(audit["recommendations"], []),
+               "issues": home.get("issues", [])}
+    section_issues = defaultdict(list)
+    for issue in results["issues"]:
+        section_issues[issue.get("section")].append(issue)
+    for r in sections:
+        results[r["section"]] = dict(unpack(r["details"], {}), issues=section_issues[r["section"]])
+    if "multi_page" in results:
+        results["multi_page"]["page_results"] = [
+            dict(p["result"], url=url) for url, p in pages.items() if url != audit["url"]]
+    return results
+
+
+def load_previous_pages(url):
+    """Per-page records of the last stored audit of `url` ({} if none)."""
+    ids = recent_audit_ids(url, limit=1)
+    return load_audit_pages(ids[0]) if ids else {}
+
+
+def comparable_score(record):
+    """Score of a stored page record, or None if it was scored by another ANALYSIS_VERSION."""
+    if (record.get("result") or {}).get("analysis_version") != ANALYSIS_VERSION:
+        return None
+    return record.get("score")
+
+
+def _issue_keys(issues):
+    return {(i.get("category", ""), i.get("message", "")): i for i in issues}
+
+
+def diff_pages(previous, current):
+    """Compare two {url: page record} maps and report what got better or worse.
+
+    Pages whose records come from different ANALYSIS_VERSIONs are only counted in
+    rescored_pages: new rules and point changes are not regressions or improvements.
+    """
+    diff = {"regressions": [], "improvements": [], "new_pages": [], "removed_pages": [],
+            "changed_pages": 0, "unchanged_pages": 0, "rescored_pages": 0}
+
+    for url, page in current.items():
+        before = previous.get(url)
+        if before is None:
+            diff["new_pages"].append(url)
+            continue
+        if before.get("content_hash") and before.get("content_hash") == page.get("content_hash"):
+            diff["unchanged_pages"] += 1
+        else:
+            diff["changed_pages"] += 1
+        if (before.get("result") or {}).get("analysis_version") != (page.get("result") or {}).get("analysis_version"):
+            diff["rescored_pages"] += 1
+            continue
+
+        old_issues = _issue_keys(before.get("issues", []))
+        new_issues = _issue_keys(page.get("issues", []))
+        added = [new_issues[k] for k in new_issues.keys() - old_issues.keys()]
+        resolved = [old_issues[k] for k in old_issues.keys() - new_issues.keys()]
+        score_before = before.get("score") or 0
+        score_after = page.get("score") or 0
+        entry = {"url": url, "score_before": score_before, "score_after": score_after,
+                 "score_delta": round(score_after - score_before, 1),
+                 "new_issues": added, "resolved_issues": resolved}
+
+        if score_after < score_before or (added and score_after <= score_before):
+            diff["regressions"].append(entry)
+        elif score_after > score_before or resolved:
+            diff["improvements"].append(entry)
+
+    diff["removed_pages"] = [url for url in previous if url not in current]
+    diff["regressions"].sort(key=lambda e: e["score_delta"])
+    diff["improvements"].sort(key=lambda e: e["score_delta"], reverse=True)
+    return diff
+
+
+def diff_latest_audits(url):
+    """Diff the last two stored audits of a site without re-running anything."""
+    ids = recent_audit_ids(url, limit=2)
+    if len(ids) < 2:
+        return None
+    current, previous = load_audit_pages(ids[0]), load_audit_pages(ids[1])
+    diff = diff_pages(previous, current)
+    site = normalize_url(url)
+    diff["score_before"] = comparable_score(previous.get(site, {}))
+    diff["score_after"] = current.get(site, {}).get("score")
+    return diff
@@ -0,0 +1,130 @@
+"""SEO Keyword Extraction - Turkish-Aware Tokenizer, N-Gram Counts & Site-Wide Keyword Maps"""
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from operator import itemgetter
+
+# Turkish + English stop words for keyword extraction
+STOP_WORDS = frozenset({
+    "bir", "ve", "bu", "da", "de", "ile", "için", "olan", "olarak", "en",
+    "çok", "daha", "gibi", "ama", "ancak", "hem", "ya", "veya", "ise",
+    "her", "ne", "kadar", "sonra", "önce", "üzere", "biz", "siz", "ben",
+    "sen", "onun", "bunu", "şu", "var", "yok", "den", "dan",
+    "the", "and", "for", "that", "this", "with", "are", "was", "were",
+    "from", "has", "have", "been", "will", "can", "all", "its", "your",
+    "not", "but", "they", "you", "more", "some", "about",
+})
+
+# Dotted/dotless I must be mapped before str.lower(): "I".lower() is "i" and
+# "İ".lower() is "i" + U+0307, both wrong for Turkish text.
+_TURKISH_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+_COMBINING_DOT = "\u0307"
+TOKEN = re.compile(r"\b[a-zçğıöşüâîû]{3,}\b")
+
+
+def turkish_lower(text):
+    """Lowercase with Turkish I/ı and İ/i rules (NFC-normalized first)."""
+    text = unicodedata.normalize("NFC", text or "")
+    return text.translate(_TURKISH_UPPER).lower().replace(_COMBINING_DOT, "")
+
+
+def tokenize(text, stop_words=STOP_WORDS):
+    """Lowercased content words of 3+ letters, stop words removed."""
+    return [t for t in TOKEN.findall(turkish_lower(text)) if t not in stop_words]
+
+
+def count_ngrams(tokens, n):
+    """Counter of n-grams keyed by token tuples (no joined strings are built)."""
+    if n == 1:
+        return Counter(tokens)
+    return Counter(zip(*(tokens[i:] for i in range(n))))
+
+
+def top_k(counts, k):
+    """The k most frequent items as (key, count), ties in first-seen order (same as most_common)."""
+    return heapq.nlargest(k, counts.items(), key=itemgetter(1))
+
+
+def phrase(key):
+    return key if isinstance(key, str) else " ".join(key)
+
+
+def keyword_profile(text, title="", meta_desc="", h1_text="", top=20):
+    """Keyword, bigram and trigram frequencies of a page plus placement of its top keywords."""
+    tokens = tokenize(text)
+    word_count = len(tokens)
+    top_keywords = top_k(count_ngrams(tokens, 1), top)
+    top_bigrams = top_k(count_ngrams(tokens, 2), 10)
+    top_trigrams = top_k(count_ngrams(tokens, 3), 5)
+
+    # Placement is checked on whole tokens, so "kal" does not match "kalite"
+    title_tokens = set(tokenize(title, ()))
+    desc_tokens = set(tokenize(meta_desc, ()))
+    h1_tokens = set(tokenize(h1_text, ()))
+
+    def density(count):
+        return round((count / max(1, word_count)) * 100, 2)
+
+    return {
+        "total_words_analyzed": word_count,
+        "top_keywords": [{"keyword": k, "count": c, "density": density(c)} for k, c in top_keywords],
+        "top_bigrams": [{"phrase": phrase(k), "count": c} for k, c in top_bigrams],
+        "top_trigrams": [{"phrase": phrase(k), "count": c} for k, c in top_trigrams],
+        "keyword_placement": [{
+            "keyword": kw,
+            "count": count,
+            "density": density(count),
+            "in_title": kw in title_tokens,
+            "in_meta_desc": kw in desc_tokens,
+            "in_h1": kw in h1_tokens,
+        } for kw, count in top_keywords[:5]],
+    }
+
+
+def page_terms(text, keywords=10, phrases=5):
+    """Compact per-page term summary for site-wide aggregation: [[term, count], ...]."""
+    tokens = tokenize(text)
+    return {
+        "word_count": len(tokens),
+        "keywords": [[k, c] for k, c in top_k(count_ngrams(tokens, 1), keywords)],
+        "phrases": [[phrase(k), c] for k, c in top_k(count_ngrams(tokens, 2), phrases)],
+    }
+
+
+class SiteKeywordMap:
+    """Aggregates per-page term summaries into site-wide keyword → pages maps."""
+
+    def __init__(self, pages_per_term=5):
+        self.pages_per_term = pages_per_term
+        self.counts = Counter()
+        self.page_counts = Counter()
+        self._pages = {}  # term -> min-heap of (count, url), bounded to pages_per_term
+        self.page_total = 0
+        self.word_total = 0
+
+    def add_page(self, url, terms):
+        self.page_total += 1
+        self.word_total += terms.get("word_count", 0)
+        for term, count in terms.get("keywords", []) + terms.get("phrases", []):
+            self.counts[term] += count
+            self.page_counts[term] += 1
+            heap = self._pages.setdefault(term, [])
+            if len(heap) < self.pages_per_term:
+                heapq.heappush(heap, (count, url))
+            elif count > heap[0][0]:
+                heapq.heapreplace(heap, (count, url))
+
+    def summary(self, top=30):
+        """Top site-wide terms with their frequency, page coverage and strongest pages."""
+        return {
+            "pages": self.page_total,
+            "words": self.word_total,
+            "terms": [{
+                "term": term,
+                "count": count,
+                "page_count": self.page_counts[term],
+                "coverage": round(self.page_counts[term] / max(1, self.page_total) * 100, 1),
+                "top_pages": [url for _, url in sorted(self._pages[term], reverse=True)],
+            } for term, count in top_k(self.counts, top)],
+        }
@@ -0,0 +1,395 @@
+"""Declarative SEO Rules - Precompiled Checks Evaluated on Page Feature Vectors"""
+import threading
+import time
+
+# Issue severities, most urgent first
+SEVERITIES = ("critical", "warning", "info")
+
+# Each section lists its rules in report order. A rule fires when `when(features)`
+# is truthy: it adds `points` to the section score and, if it has a severity,
+# an issue whose message is formatted with the feature dict.
+RULES = {
+    "meta_analysis": {
+        "category": "meta",
+        "max_score": 38,
+        "rules": [
+            {"id": "meta.title_missing", "when": lambda f: not f["title_length"],
+             "severity": "critical", "message": "Title etiketi eksik!"},
+            {"id": "meta.title_short", "when": lambda f: 0 < f["title_length"] < 30,
+             "severity": "warning", "message": "Title çok kısa ({title_length} karakter). 50-60 karakter önerilir."},
+            {"id": "meta.title_long", "when": lambda f: f["title_length"] > 60,
+             "severity": "warning", "message": "Title çok uzun ({title_length} karakter). 50-60 karakter önerilir."},
+            {"id": "meta.title_ok", "when": lambda f: 30 <= f["title_length"] <= 60, "points": 10},
+            {"id": "meta.title_few_words", "when": lambda f: f["title_length"] and f["title_word_count"] < 3,
+             "severity": "info", "message": "Title'da daha fazla anahtar kelime kullanılabilir."},
+            {"id": "meta.desc_missing", "when": lambda f: not f["meta_description_length"],
+             "severity": "critical", "message": "Meta description eksik!"},
+            {"id": "meta.desc_short", "when": lambda f: 0 < f["meta_description_length"] < 120,
+             "severity": "warning",
+             "message": "Meta description kısa ({meta_description_length} karakter). 150-160 karakter önerilir."},
+            {"id": "meta.desc_long", "when": lambda f: f["meta_description_length"] > 160,
+             "severity": "warning",
+             "message": "Meta description uzun ({meta_description_length} karakter). 150-160 karakter önerilir."},
+            {"id": "meta.desc_ok", "when": lambda f: 120 <= f["meta_description_length"] <= 160, "points": 10},
+            {"id": "meta.canonical_missing", "when": lambda f: not f["has_canonical"],
+             "severity": "warning", "message": "Canonical URL tanımlanmamış."},
+            {"id": "meta.canonical_ok", "when": lambda f: f["has_canonical"], "points": 3},
+            {"id": "meta.noindex", "when": lambda f: f["noindex"],
+             "severity": "critical", "message": "Sayfa noindex olarak işaretli! Google'da görünmez."},
+            {"id": "meta.og_missing", "when": lambda f: not f["og_tags_count"],
+             "severity": "warning", "message": "Open Graph etiketleri eksik (sosyal medya paylaşımları için)."},
+            {"id": "meta.og_ok", "when": lambda f: f["og_tags_count"], "points": 3},
+            {"id": "meta.og_image_missing", "when": lambda f: f["og_tags_count"] and not f["has_og_image"],
+             "severity": "info", "message": "og:image eksik. Sosyal paylaşımlarda görsel çıkmaz."},
+            {"id": "meta.twitter_missing", "when": lambda f: not f["twitter_tags_count"],
+             "severity": "info", "message": "Twitter Card etiketleri eksik."},
+            {"id": "meta.twitter_ok", "when": lambda f: f["twitter_tags_count"], "points": 2},
+            {"id": "meta.viewport_missing", "when": lambda f: not f["has_viewport"],
+             "severity": "critical", "message": "Viewport meta etiketi yok! Mobil uyumluluk sorunu."},
+            {"id": "meta.viewport_ok", "when": lambda f: f["has_viewport"], "points": 5},
+            {"id": "meta.lang_missing", "when": lambda f: not f["lang"],
+             "severity": "warning", "message": "HTML lang attribute eksik."},
+            {"id": "meta.lang_ok", "when": lambda f: f["lang"], "points": 2},
+            {"id": "meta.hreflang_ok", "when": lambda f: f["is_multilingual"], "points": 3},
+            {"id": "meta.favicon_missing", "when": lambda f: not f["has_favicon"],
+             "severity": "info", "message": "Favicon bulunamadı."},
+        ],
+    },
+    "heading_structure": {
+        "category": "heading",
+        "rules": [
+            {"id": "heading.h1_missing", "when": lambda f: f["h1_count"] == 0,
+             "severity": "critical", "message": "H1 etiketi yok!"},
+            {"id": "heading.h1_multiple", "when": lambda f: f["h1_count"] > 1,
+             "severity": "warning", "message": "Birden fazla H1 ({h1_count} adet). Tek H1 önerilir."},
+            {"id": "heading.h1_ok", "when": lambda f: f["h1_count"] == 1, "points": 8},
+            {"id": "heading.h2_missing", "when": lambda f: not f["h2_count"],
+             "severity": "warning", "message": "H2 etiketi yok. İçerik yapısı iyileştirilmeli."},
+            {"id": "heading.h2_ok", "when": lambda f: f["h2_count"], "points": 4},
+            *[{"id": f"heading.skip_h{i}", "when": lambda f, i=i: i in f["skipped_levels"],
+               "severity": "info", "message": f"H{i} atlanmış ama H{i + 1} kullanılmış. Hiyerarşi bozuk."}
+              for i in range(1, 5)],
+            {"id": "heading.hierarchy_ok", "when": lambda f: not f["skipped_levels"] and f["total_headings"] >= 3,
+             "points": 3},
+        ],
+    },
+    "image_analysis": {
+        "category": "image",
+        "rules": [
+            {"id": "image.alt_missing", "when": lambda f: f["missing_alt"] > 0,
+             "severity": "warning", "message": "{missing_alt}/{total} görselin alt etiketi eksik."},
+            {"id": "image.alt_ok", "when": lambda f: f["alt_coverage"] >= 90, "points": 5},
+            {"id": "image.dimensions_missing", "when": lambda f: f["total"] and f["missing_dimensions"] > f["total"] * 0.5,
+             "severity": "info",
+             "message": "{missing_dimensions} görselde genişlik/yükseklik tanımlı değil. CLS sorununa neden olabilir."},
+            {"id": "image.lazy_low", "when": lambda f: f["total"] > 5 and f["lazy_pct"] < 50,
+             "severity": "info",
+             "message": "Görsellerin sadece %{lazy_pct:.0f}'si lazy load kullanıyor. Sayfa hızı için önerilir."},
+            {"id": "image.lazy_ok", "when": lambda f: f["total"] and f["lazy_pct"] >= 50, "points": 3},
+        ],
+    },
+    "link_analysis": {
+        "category": "link",
+        "rules": [
+            {"id": "link.internal_many", "when": lambda f: f["internal_count"] >= 5, "points": 4},
+            {"id": "link.internal_some", "when": lambda f: 2 <= f["internal_count"] < 5, "points": 2},
+            {"id": "link.external_ok", "when": lambda f: f["external_count"] >= 1, "points": 2},
+            {"id": "link.empty_anchors", "when": lambda f: f["empty_anchors"] > 5,
+             "severity": "warning", "message": "{empty_anchors} boş anchor text tespit edildi."},
+            {"id": "link.broken_internal", "when": lambda f: f["broken_internal_count"],
+             "severity": "critical", "message": "{broken_internal_count} kırık iç link tespit edildi!"},
+            {"id": "link.broken_external", "when": lambda f: f["broken_external_count"],
+             "severity": "warning", "message": "{broken_external_count} kırık dış link tespit edildi."},
+        ],
+    },
+    "content_analysis": {
+        "category": "content",
+        "rules": [
+            {"id": "content.thin", "when": lambda f: f["word_count"] < 300,
+             "severity": "warning", "message": "İçerik çok az ({word_count} kelime). 500+ kelime önerilir."},
+            {"id": "content.words_500", "when": lambda f: f["word_count"] >= 500, "points": 5},
+            {"id": "content.words_1000", "when": lambda f: f["word_count"] >= 1000, "points": 3},
+            {"id": "content.text_ratio_low", "when": lambda f: f["text_html_ratio"] < 10,
+             "severity": "warning",
+             "message": "Metin/HTML oranı düşük (%{text_html_ratio:.1f}). Daha fazla içerik eklenmelidir."},
+            {"id": "content.text_ratio_ok", "when": lambda f: f["text_html_ratio"] >= 15, "points": 2},
+            {"id": "content.readability_low", "when": lambda f: f["readability"] < 40,
+             "severity": "info",
+             "message": "İçerik okunabilirliği düşük (Skor: {readability:.0f}/100). Daha kısa cümleler önerilir."},
+            {"id": "content.readability_ok", "when": lambda f: f["readability"] >= 60, "points": 2},
+        ],
+    },
+    "keyword_analysis": {
+        "category": "keyword",
+        "rules": [
+            {"id": "keyword.stuffing", "when": lambda f: f["top_keyword"] and f["top_density"] > 5,
+             "severity": "warning",
+             "message": "'{top_keyword}' anahtar kelime yoğunluğu çok yüksek (%{top_density:.1f}). Keyword stuffing riski."},
+            {"id": "keyword.density_ok", "when": lambda f: f["top_keyword"] and 1 <= f["top_density"] <= 5,
+             "points": 4},
+            {"id": "keyword.not_in_title", "when": lambda f: f["top_keyword"] and not f["top_in_title"],
+             "severity": "warning", "message": "En çok kullanılan kelime '{top_keyword}' title'da geçmiyor."},
+            {"id": "keyword.in_title", "when": lambda f: f["top_keyword"] and f["top_in_title"], "points": 3},
+            {"id": "keyword.not_in_h1", "when": lambda f: f["top_keyword"] and not f["top_in_h1"],
+             "severity": "info", "message": "En çok kullanılan kelime '{top_keyword}' H1'de geçmiyor."},
+        ],
+    },
+    "technical": {
+        "category": "technical",
+        "rules": [
+            {"id": "technical.redirects", "when": lambda f: f["redirect_count"] > 2,
+             "severity": "warning", "message": "{redirect_count} yönlendirme var. Fazla yönlendirme hızı etkiler."},
+            {"id": "technical.very_slow", "when": lambda f: f["load_time"] > 3,
+             "severity": "critical", "message": "Sayfa çok yavaş ({load_time:.1f}s). 3s altı önerilir."},
+            {"id": "technical.slow", "when": lambda f: 1.5 < f["load_time"] <= 3,
+             "severity": "warning", "message": "Sayfa yavaş ({load_time:.1f}s). 1.5s altı ideal."},
+            {"id": "technical.fast", "when": lambda f: f["load_time"] <= 1.5, "points": 8},
+            {"id": "technical.no_https", "when": lambda f: not f["is_https"],
+             "severity": "critical", "message": "HTTPS kullanılmıyor! Güvenlik sorunu."},
+            {"id": "technical.https", "when": lambda f: f["is_https"], "points": 5},
+            {"id": "technical.page_heavy", "when": lambda f: f["content_size_kb"] > 3000,
+             "severity": "warning", "message": "Sayfa boyutu çok büyük ({content_size_kb:.0f} KB). 3MB altı önerilir."},
+            {"id": "technical.page_light", "when": lambda f: f["content_size_kb"] < 1500, "points": 2},
+            {"id": "technical.no_compression", "when": lambda f: not f["has_compression"],
+             "severity": "warning", "message": "Gzip/Brotli sıkıştırma aktif değil. Sayfa hızını artırır."},
+            {"id": "technical.compression", "when": lambda f: f["has_compression"], "points": 3},
+            {"id": "technical.no_cache_control", "when": lambda f: not f["has_cache_control"],
+             "severity": "info", "message": "Cache-Control başlığı yok. Önbellekleme performansı artırır."},
+            {"id": "technical.cache_control", "when": lambda f: f["has_cache_control"], "points": 2},
+            {"id": "technical.robots_txt", "when": lambda f: f["has_robots_txt"], "points": 2},
+            {"id": "technical.sitemap", "when": lambda f: f["has_sitemap"], "points": 2},
+            {"id": "technical.no_sitemap", "when": lambda f: not f["has_sitemap"],
+             "severity": "warning", "message": "Sitemap.xml bulunamadı."},
+            {"id": "technical.no_robots_txt", "when": lambda f: not f["has_robots_txt"],
+             "severity": "warning", "message": "Robots.txt bulunamadı."},
+        ],
+    },
+    "security_headers": {
+        "category": "security",
+        "max_score": 5,
+        "rules": [
+            *[{"id": f"security.{header.lower()}", "when": lambda f, h=header: not f["headers"].get(h),
+               "severity": severity, "message": message, "else_points": 1}
+              for header, severity, message in [
+                  ("Strict-Transport-Security", "warning", "HSTS başlığı eksik. HTTPS zorlaması önerilir."),
+                  ("X-Content-Type-Options", "info", "X-Content-Type-Options başlığı eksik."),
+                  ("X-Frame-Options", "info", "X-Frame-Options başlığı eksik. Clickjacking koruması önerilir."),
+                  ("Content-Security-Policy", "info", "Content-Security-Policy başlığı eksik."),
+                  ("X-XSS-Protection", "info", "X-XSS-Protection başlığı eksik."),
+              ]],
+            {"id": "security.server_exposed", "when": lambda f: f["server"],
+             "severity": "info", "message": "Server başlığı açık: '{server}'. Gizlenmesi önerilir."},
+        ],
+    },
+    "page_speed": {
+        "category": "speed",
+        "rules": [
+            {"id": "speed.css_many", "when": lambda f: f["css_files"] > 10,
+             "severity": "warning", "message": "{css_files} CSS dosyası yükleniyor. Birleştirme önerilir."},
+            {"id": "speed.js_many", "when": lambda f: f["js_files"] > 15,
+             "severity": "warning", "message": "{js_files} JavaScript dosyası yükleniyor. Birleştirme önerilir."},
+            {"id": "speed.blocking_js", "when": lambda f: f["blocking_js"] > 5,
+             "severity": "warning", "message": "{blocking_js} render-blocking JS dosyası. async/defer kullanılmalı."},
+            {"id": "speed.resources_few", "when": lambda f: f["total_resources"] <= 30, "points": 3},
+            {"id": "speed.resources_some", "when": lambda f: 30 < f["total_resources"] <= 60, "points": 1},
+            {"id": "speed.resource_hints", "when": lambda f: f["preload_hints"], "points": 2},
+        ],
+    },
+    "mobile_friendly": {
+        "category": "mobile",
+        "rules": [
+            {"id": "mobile.viewport", "when": lambda f: f["has_viewport"], "points": 3},
+            {"id": "mobile.viewport_missing", "when": lambda f: not f["has_viewport"],
+             "severity": "critical", "message": "Viewport meta etiketi yok!"},
+            {"id": "mobile.media_queries", "when": lambda f: f["has_media_queries"], "points": 2},
+            {"id": "mobile.fixed_width", "when": lambda f: f["has_fixed_width"],
+             "severity": "warning", "message": "Çok büyük sabit piksel genişlikleri tespit edildi."},
+        ],
+    },
+    "schema_markup": {
+        "category": "schema",
+        "rules": [
+            {"id": "schema.json_ld", "when": lambda f: f["json_ld_types"], "points": 4},
+            {"id": "schema.recommended_missing", "when": lambda f: f["json_ld_types"] and f["missing_recommended"],
+             "severity": "info", "message": "Önerilen schema tipleri eksik: {missing_recommended}"},
+            {"id": "schema.json_ld_missing", "when": lambda f: not f["json_ld_types"],
+             "severity": "warning",
+             "message": "JSON-LD yapısal veri bulunamadı. Google zengin sonuçlar için eklenmeli."},
+        ],
+    },
+    "social_media": {
+        "category": "social",
+        "rules": [
+            {"id": "social.many_profiles", "when": lambda f: f["profile_count"] >= 3, "points": 3},
+            {"id": "social.some_profiles", "when": lambda f: 1 <= f["profile_count"] < 3, "points": 1},
+            {"id": "social.no_profiles", "when": lambda f: f["profile_count"] == 0,
+             "severity": "info", "message": "Sosyal medya profil bağlantısı bulunamadı."},
+        ],
+    },
+    "backlink_indicators": {
+        "category": "backlink",
+        "rules": [
+            {"id": "backlink.domain_age", "when": lambda f: (f["domain_age"] or 0) >= 3, "points": 2},
+            {"id": "backlink.trust_signals", "when": lambda f: f["trust_signal_count"] >= 2, "points": 2},
+            {"id": "backlink.contact_complete", "when": lambda f: f["has_phone"] and f["has_email"] and f["has_address"],
+             "points": 2},
+            {"id": "backlink.contact_missing", "when": lambda f: not f["has_phone"] and not f["has_email"],
+             "severity": "warning", "message": "İletişim bilgileri eksik. Güven sinyali düşük."},
+        ],
+    },
+    "featured_snippet": {
+        "category": "snippet",
+        "rules": [
+            {"id": "snippet.lists", "when": lambda f: f["has_lists"], "points": 1},
+            {"id": "snippet.tables", "when": lambda f: f["has_tables"], "points": 1},
+            {"id": "snippet.faq_content", "when": lambda f: f["has_faq_content"], "points": 1},
+            {"id": "snippet.definitions", "when": lambda f: f["definition_paragraphs"] >= 2, "points": 1},
+            {"id": "snippet.faq_schema", "when": lambda f: f["has_faq_schema"], "points": 2},
+            {"id": "snippet.no_lists_tables", "when": lambda f: not f["has_lists"] and not f["has_tables"],
+             "severity": "info", "message": "Listeler veya tablolar yok. Featured snippet şansı artırılabilir."},
+            {"id": "snippet.no_faq", "when": lambda f: not f["has_faq_content"],
+             "severity": "info", "message": "FAQ/SSS içeriği bulunamadı. Soru-cevap formatı snippet için etkili."},
+        ],
+    },
+    "multi_page": {
+        "category": "multipage",
+        "rules": [
+            {"id": "multipage.broken_internal", "when": lambda f: f["site_broken_internal"],
+             "severity": "warning", "message": "Site genelinde {site_broken_internal} kırık iç link"},
+            {"id": "multipage.missing_title", "when": lambda f: f["pages_missing_title"],
+             "severity": "warning", "message": "{pages_missing_title} iç sayfada title eksik"},
+            {"id": "multipage.missing_desc", "when": lambda f: f["pages_missing_desc"],
+             "severity": "warning", "message": "{pages_missing_desc} iç sayfada meta description eksik"},
+            {"id": "multipage.missing_h1", "when": lambda f: f["pages_missing_h1"],
+             "severity": "warning", "message": "{pages_missing_h1} iç sayfada H1 eksik"},
+            {"id": "multipage.slow", "when": lambda f: f["pages_slow"],
+             "severity": "warning", "message": "{pages_slow} iç sayfa 3 saniyeden yavaş"},
+            {"id": "multipage.near_duplicates", "when": lambda f: f["near_duplicate_pages"],
+             "severity": "warning",
+             "message": "{near_duplicate_pages} sayfa neredeyse aynı içeriğe sahip ({near_duplicate_clusters} grup)"},
+            {"id": "multipage.duplicate_titles", "when": lambda f: f["duplicate_title_pages"],
+             "severity": "warning", "message": "{duplicate_title_pages} sayfa aynı title'ı paylaşıyor"},
+            {"id": "multipage.duplicate_descs", "when": lambda f: f["duplicate_description_pages"],
+             "severity": "warning", "message": "{duplicate_description_pages} sayfa aynı meta description'ı paylaşıyor"},
+            {"id": "multipage.thin", "when": lambda f: f["thin_page_count"],
+             "severity": "info", "message": "{thin_page_count} sayfada içerik çok az (ince içerik)"},
+            {"id": "multipage.clean", "when": lambda f: f["pages_crawled"] and not (
+                f["site_broken_internal"] or f["pages_missing_title"] or f["pages_missing_desc"]
+                or f["pages_missing_h1"] or f["pages_slow"] or f["near_duplicate_pages"]
+                or f["duplicate_title_pages"] or f["duplicate_description_pages"]), "points": 3},
+        ],
+    },
+    "link_graph": {
+        "category": "linkgraph",
+        "rules": [
+            {"id": "linkgraph.orphans", "when": lambda f: f["orphan_count"] and f["orphan_scope"] == "full",
+             "severity": "warning",
+             "message": "{orphan_count} sitemap sayfasına taranan sayfalardan hiç iç link verilmiyor (yetim sayfa)."},
+            {"id": "linkgraph.orphans_partial", "when": lambda f: f["orphan_count"] and f["orphan_scope"] == "partial",
+             "severity": "info",
+             "message": "Taranan {orphan_checked} sitemap sayfasından {orphan_count} tanesine diğer taranan sayfalardan "
+                        "link verilmiyor (kısmi tarama; site geneli için tarama sayısını artırın)."},
+            {"id": "linkgraph.deep_pages", "when": lambda f: f["deep_page_count"],
+             "severity": "info", "message": "{deep_page_count} sayfa ana sayfadan 3 tıklamadan daha uzakta."},
+            {"id": "linkgraph.redirect_chains", "when": lambda f: f["redirect_chain_count"],
+             "severity": "warning",
+             "message": "{redirect_chain_count} iç link birden fazla yönlendirmeden geçiyor. Linkleri son adrese güncelleyin."},
+            {"id": "linkgraph.redirecting_links", "when": lambda f: f["redirect_count"] > f["redirect_chain_count"],
+             "severity": "info", "message": "{redirect_count} iç link yönlendirme yapan adreslere gidiyor."},
+            {"id": "linkgraph.healthy", "when": lambda f: f["crawled_pages"] > 1 and not (
+                f["orphan_count"] or f["deep_page_count"] or f["redirect_chain_count"]), "points": 3},
+        ],
+    },
+    "asset_weight": {
+        "category": "speed",
+        "rules": [
+            {"id": "assets.home_heavy", "when": lambda f: f["home_kb"] > f["page_limit_kb"],
+             "severity": "warning",
+             "message": "Ana sayfa ağırlığı {home_kb} KB. {page_limit_kb} KB altında tutulması önerilir."},
+            {"id": "assets.heavy_pages", "when": lambda f: f["heavy_page_count"],
+             "severity": "warning", "message": "{heavy_page_count} sayfanın toplam ağırlığı {page_limit_kb} KB'ı aşıyor."},
+            {"id": "assets.oversized_images", "when": lambda f: f["oversized_image_count"],
+             "severity": "warning",
+             "message": "{oversized_image_count} görsel {image_limit_kb} KB'dan büyük. WebP/AVIF ve yeniden boyutlandırma önerilir."},
+            {"id": "assets.uncompressed", "when": lambda f: f["uncompressed_count"], "else_points": 2,
+             "severity": "warning",
+             "message": "{uncompressed_count} CSS/JS/metin dosyası sıkıştırmasız sunuluyor ({uncompressed_kb} KB). Gzip/Brotli açılmalı."},
+            {"id": "assets.blocking_heavy", "when": lambda f: f["home_blocking_kb"] > 300,
+             "severity": "info", "message": "Render-blocking CSS/JS toplamı {home_blocking_kb} KB."},
+            {"id": "assets.light", "when": lambda f: f["unique_assets"] and not (
+                f["heavy_page_count"] or f["oversized_image_count"]), "points": 3},
+        ],
+    },
+    # One crawled internal page
+    "page": {
+        "category": "multipage",
+        "rules": [
+            {"id": "page.title_missing", "when": lambda f: not f["has_title"], "else_points": 10,
+             "severity": "critical", "message": "Title etiketi eksik!"},
+            {"id": "page.desc_missing", "when": lambda f: not f["has_meta_desc"], "else_points": 10,
+             "severity": "warning", "message": "Meta description eksik."},
+            {"id": "page.h1_missing", "when": lambda f: not f["has_h1"], "else_points": 10,
+             "severity": "warning", "message": "H1 etiketi yok."},
+        ],
+    },
+}
+
+
+def _compile(rules):
+    """Flatten the registry into per-section tuples so evaluation is a plain loop."""
+    compiled = {}
+    for section, spec in rules.items():
+        category = spec["category"]
+        compiled[section] = (spec.get("max_score"), tuple(
+            (r["id"], r["when"], r.get("points", 0), r.get("else_points", 0),
+             {"severity": r["severity"], "category": category, "code": r["id"]} if r.get("severity") else None,
+             r.get("message", ""))
+            for r in spec["rules"]))
+    return compiled
+
+
+_COMPILED = _compile(RULES)
+
+# rule id -> [evaluations, times fired, total seconds]; process-wide
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def evaluate(section, features):
+    """Run one section's rules on a feature dict; returns {"score": ..., "issues": [...]}."""
+    max_score, rules = _COMPILED[section]
+    score = 0
+    issues = []
+    timings = []
+    clock = time.perf_counter
+    for rule_id, when, points, else_points, issue, message in rules:
+        start = clock()
+        hit = bool(when(features))
+        if hit:
+            score += points
+            if issue is not None:
+                issues.append(dict(issue, message=message.format(**features)))
+        else:
+            score += else_points
+        timings.append((rule_id, hit, clock() - start))
+
+    with _stats_lock:
+        for rule_id, hit, elapsed in timings:
+            entry = _stats.setdefault(rule_id, [0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += hit
+            entry[2] += elapsed
+
+    if max_score is not None:
+        score = min(max_score, score)
+    return {"score": score, "issues": issues}
+
+
+def rule_stats(top=None):
+    """Per-rule evaluation counts, fire counts and timing, slowest first."""
+    with _stats_lock:
+        rows = [{"rule": rule_id, "evaluations": n, "fired": hits,
+                 "total_ms": round(total * 1000, 3), "avg_us": round(total / n * 1e6, 2) if n else 0}
+                for rule_id, (n, hits, total) in _stats.items()]
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows[:top] if top else rows
@@ -0,0 +1,182 @@
+"""Streaming Sitemap Reader - Index, Gzip & Lastmod Aware URL Discovery"""
+import heapq
+import zlib
+import requests
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+
+CHUNK_SIZE = 64 * 1024
+MAX_SITEMAP_FILES = 50
+
+
+# Namespaces whose <loc>/<lastmod> describe the page itself; image:, video:, news: etc. are ignored
+SITEMAP_NAMESPACES = {"", "http://www.sitemaps.org/schemas/sitemap/0.9", "http://www.google.com/schemas/sitemap/0.84"}
+
+
+def _split_tag(tag):
+    """(namespace, local name) of an ElementTree tag."""
+    if tag.startswith("{"):
+        return tuple(tag[1:].split("}", 1))
+    return "", tag
+
+
+def parse_lastmod(value):
+    """Parse a W3C datetime lastmod value into a UTC timestamp (0 if missing/invalid)."""
+    if not value:
+        return 0.0
+    value = value.strip().replace("Z", "+00:00")
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            dt = datetime.strptime(value[:10], "%Y-%m-%d")
+        except ValueError:
+            return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def sitemaps_from_robots(robots_text):
+    """Extract `Sitemap:` directives from robots.txt content."""
+    found = []
+    for line in (robots_text or "").splitlines():
+        if line.lower().startswith("sitemap:"):
+            loc = line.split(":", 1)[1].strip()
+            if loc:
+                found.append(loc)
+    return found
+
+
+def _iter_body(resp):
+    """Yield body chunks, transparently gunzipping `.gz` sitemap files."""
+    chunks = resp.iter_content(CHUNK_SIZE)
+    first = next(chunks, b"")
+    if first[:2] != b"\x1f\x8b":
+        yield first
+        yield from chunks
+        return
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in _chain(first, chunks):
+        while chunk:
+            yield inflater.decompress(chunk, CHUNK_SIZE)
+            chunk = inflater.unconsumed_tail
+    yield inflater.flush()
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def _iter_entries(resp):
+    """Incrementally parse one sitemap file, yielding (kind, loc, lastmod) tuples.
+
+    kind is "url" for <urlset> entries and "sitemap" for <sitemapindex> children.
+    Only <loc>/<lastmod> in the sitemap namespace that are direct children of the
+    entry count, so extension tags such as <image:loc> never replace the page URL.
+    Processed elements are cleared from the tree so memory stays flat.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    path = []  # (namespace, name) of the open elements
+    loc = lastmod = None
+    for chunk in _iter_body(resp):
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                path.append(_split_tag(elem.tag))
+                continue
+            ns, name = path.pop()
+            if ns not in SITEMAP_NAMESPACES:
+                continue
+            parent = path[-1] if path else None
+            if name in ("loc", "lastmod"):
+                if parent and parent[0] in SITEMAP_NAMESPACES and parent[1] in ("url", "sitemap"):
+                    if name == "loc":
+                        loc = (elem.text or "").strip()
+                    else:
+                        lastmod = (elem.text or "").strip()
+            elif name in ("url", "sitemap") and len(path) == 1:
+                if loc:
+                    yield name, loc, lastmod
+                loc = lastmod = None
+                root.clear()
+    parser.close()
+
+
+def iter_sitemap(url, headers=None, timeout=10, max_files=MAX_SITEMAP_FILES, stats=None):
+    """Stream every page URL reachable from a sitemap or sitemap index.
+
+    Yields (loc, lastmod) pairs. Nested sitemap indexes are followed breadth-first,
+    each file is fetched once, and at most `max_files` files are read. If a
+    `stats` dict is given, the number of files read is counted into stats["files"].
+    """
+    queue = [url]
+    seen = set()
+    while queue and len(seen) < max_files:
+        current = queue.pop(0)
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            resp = requests.get(current, headers=headers, timeout=timeout, stream=True)
+        except Exception:
+            continue
+        try:
+            if resp.status_code != 200:
+                continue
+            if stats is not None:
+                stats["files"] = stats.get("files", 0) + 1
+            for kind, loc, lastmod in _iter_entries(resp):
+                if kind == "sitemap":
+                    queue.append(urljoin(current, loc))
+                else:
+                    yield loc, lastmod
+        except (ET.ParseError, zlib.error, EOFError, requests.RequestException):
+            # A corrupt or cut-off child sitemap only loses its own remaining entries
+            continue
+        finally:
+            resp.close()
+
+
+def collect_sitemap_seeds(site_url, headers=None, robots_text=None, limit=50, timeout=10, keep_urls=0):
+    """Read a site's sitemap(s) and keep the `limit` most recently modified URLs.
+
+    Only a bounded heap of seeds is held in memory, so 50k-URL sitemaps are
+    counted in a single streaming pass. With `keep_urls`, up to that many page
+    URLs are also returned in result["urls"] (for orphan-page analysis).
+    """
+    candidates = sitemaps_from_robots(robots_text) or [urljoin(site_url, "/sitemap.xml")]
+    result = {"found": False, "sitemap_files": candidates, "files_read": 0, "url_count": 0,
+              "lastmod_count": 0, "newest_lastmod": None, "seeds": [], "urls": []}
+
+    heap = []
+    newest = 0.0
+    stats = {"files": 0}
+    for sitemap_url in candidates:
+        for loc, lastmod in iter_sitemap(sitemap_url, headers=headers, timeout=timeout, stats=stats):
+            result["url_count"] += 1
+            if len(result["urls"]) < keep_urls:
+                result["urls"].append(loc)
+            ts = parse_lastmod(lastmod)
+            if ts:
+                result["lastmod_count"] += 1
+                newest = max(newest, ts)
+            entry = (ts, -result["url_count"], loc, lastmod)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    result["found"] = stats["files"] > 0
+    result["files_read"] = stats["files"]
+    result["seeds"] = [{"url": loc, "lastmod": lastmod} for _, _, loc, lastmod in sorted(heap, reverse=True)]
+    if newest:
+        result["newest_lastmod"] = datetime.fromtimestamp(newest, tz=timezone.utc).isoformat()
+    return result
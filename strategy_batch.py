@@ -0,0 +1,265 @@
+"""Portfolio Strategy Runs - Async Fan-Out Across Clients, Rate-Limit Aware Retries & Resume
+
+Usage (no Streamlit needed):
+    python strategy_batch.py
+    python strategy_batch.py --concurrency 12 --prompt "Q4 kampanya dönemine odaklan"
+    python strategy_batch.py --resume          # continue the last unfinished run
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from config import Config
+from database import init_db, get_conn, fetch_all, fetch_one
+from ai_engine import HAS_ANTHROPIC, create_async_client, agenerate_strategy
+
+try:
+    import anthropic
+    # 429, 5xx/529 overload, connection drops and timeouts; anything else fails the client at once
+    RETRYABLE = (anthropic.RateLimitError, anthropic.InternalServerError, anthropic.APIConnectionError)
+except ImportError:
+    RETRYABLE = ()
+
+
+class Cooldown:
+    """Shared pause after a 429 so every in-flight worker backs off, not just the one that was throttled."""
+
+    def __init__(self):
+        self.until = 0
+
+    def hold(self, seconds):
+        self.until = max(self.until, time.monotonic() + seconds)
+
+    async def wait(self):
+        while self.until > time.monotonic():
+            await asyncio.sleep(self.until - time.monotonic())
+
+
+def retry_delay(error, attempt):
+    """Seconds to wait before retrying: the server's retry-after if given, else jittered exponential backoff."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(0.5, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return min(60, 2 ** attempt) * (0.5 + random.random())
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RUN BOOKKEEPING
+# ═══════════════════════════════════════════════════════════════
+
+def start_run(client_ids=None, custom_prompt="", label=None):
+    """Create a run with one pending item per client (all clients by default); returns its id."""
+    init_db()
+    if client_ids is None:
+        client_ids = [c["id"] for c in fetch_all("clients", order_by="id ASC", limit=100000)]
+    conn = get_conn()
+    try:
+        cur = conn.execute("INSERT INTO strategy_runs (label, custom_prompt, total) VALUES (?,?,?)",
+                           [label or datetime.now().strftime("%m.%Y"), custom_prompt, len(client_ids)])
+        run_id = cur.lastrowid
+        conn.executemany("INSERT INTO strategy_run_items (run_id, client_id) VALUES (?,?)",
+                         [[run_id, cid] for cid in client_ids])
+        conn.commit()
+    finally:
+        conn.close()
+    return run_id
+
+
+def open_run():
+    """The most recent run that still has unfinished clients, or None."""
+    init_db()
+    runs = fetch_all("strategy_runs", where="status != 'done'", limit=1)
+    return runs[0] if runs else None
+
+
+def run_status(run_id):
+    """Run row plus per-status item counts and the failed items."""
+    run = fetch_one("strategy_runs", "id = ?", [run_id]) or {}
+    conn = get_conn()
+    counts = {r["status"]: r["n"] for r in conn.execute(
+        "SELECT status, COUNT(*) AS n FROM strategy_run_items WHERE run_id = ? GROUP BY status", [run_id])}
+    failed = [dict(r) for r in conn.execute(
+        "SELECT i.client_id, c.name, i.attempts, i.error FROM strategy_run_items i "
+        "LEFT JOIN clients c ON c.id = i.client_id WHERE i.run_id = ? AND i.status = 'failed'", [run_id])]
+    conn.close()
+    return {**run, "counts": counts, "failed": failed}
+
+
+def _client_context(client):
+    """Synced campaigns, top keywords and search terms of a client, as generate_strategy() expects them."""
+    campaigns = fetch_all("campaigns", where="client_id = ?", params=[client["id"]], order_by="cost DESC", limit=10)
+    conn = get_conn()
+    keywords = [dict(r) for r in conn.execute(
+        "SELECT k.text AS keyword, k.match_type, k.clicks, k.cost, k.conversions, k.quality_score "
+        "FROM keywords k JOIN campaigns c ON c.id = k.campaign_id "
+        "WHERE c.client_id = ? AND k.is_negative = 0 ORDER BY k.cost DESC LIMIT 20", [client["id"]])]
+    conn.close()
+    search_terms = fetch_all("search_terms", where="client_id = ?", params=[client["id"]],
+                             order_by="cost DESC", limit=50)
+    client_info = {key: client.get(key) for key in
+                   ("name", "sector", "website", "monthly_budget", "products", "target_cpa", "target_roas")}
+    client_info["monthly_budget"] = client_info["monthly_budget"] or 0
+    return client_info, campaigns, keywords, search_terms
+
+
+def insert_strategy(conn, client_id, strategy, title):
+    """Insert a parsed strategy into strategies on an open connection; returns the row id."""
+    meta = strategy.get("_meta", {})
+    cur = conn.execute(
+        "INSERT INTO strategies (client_id, title, analysis, recommendations, budget_allocation, "
+        "kpi_targets, action_plan, ai_model, tokens_used) VALUES (?,?,?,?,?,?,?,?,?)",
+        [client_id, title, strategy.get("analysis", ""),
+         json.dumps(strategy.get("recommendations", []), ensure_ascii=False),
+         json.dumps(strategy.get("budget_allocation", []), ensure_ascii=False),
+         json.dumps(strategy.get("kpi_targets", {}), ensure_ascii=False),
+         json.dumps(strategy.get("action_plan", []), ensure_ascii=False),
+         meta.get("model", ""), meta.get("tokens", 0)])
+    return cur.lastrowid
+
+
+def _save_result(run_id, client_id, strategy, label, attempts):
+    """Store a client's strategy and mark its run item done, in one transaction."""
+    meta = strategy.get("_meta", {})
+    conn = get_conn()
+    try:
+        strategy_id = insert_strategy(conn, client_id, strategy, f"Portföy Stratejisi — {label}")
+        conn.execute("UPDATE strategy_run_items SET status = 'done', strategy_id = ?, error = NULL, "
+                     "attempts = attempts + ?, updated_at = CURRENT_TIMESTAMP WHERE run_id = ? AND client_id = ?",
+                     [strategy_id, attempts, run_id, client_id])
+        conn.execute("INSERT INTO action_logs (client_id, action_type, description, details, severity) "
+                     "VALUES (?,?,?,?,?)",
+                     [client_id, "ai_strategy", "Portföy çalışmasında AI strateji oluşturuldu",
+                      json.dumps({"run_id": run_id, "tokens": meta.get("tokens", 0)}), "info"])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _save_failure(run_id, client_id, error, attempts):
+    conn = get_conn()
+    conn.execute("UPDATE strategy_run_items SET status = 'failed', error = ?, attempts = attempts + ?, "
+                 "updated_at = CURRENT_TIMESTAMP WHERE run_id = ? AND client_id = ?",
+                 [error[:500], attempts, run_id, client_id])
+    conn.commit()
+    conn.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ASYNC FAN-OUT
+# ═══════════════════════════════════════════════════════════════
+
+async def _run(run, clients, concurrency, force_refresh, on_progress):
+    api = create_async_client()
+    slots = asyncio.Semaphore(concurrency)
+    cooldown = Cooldown()
+    done = [0]
+
+    async def generate(client, tries):
+        client_info, campaigns, keywords, search_terms = _client_context(client)
+        for attempt in range(1, Config.AI_BATCH_MAX_ATTEMPTS + 1):
+            await cooldown.wait()
+            tries["n"] = attempt
+            try:
+                async with slots:
+                    return await agenerate_strategy(api, client_info, campaigns, keywords, search_terms,
+                                                    custom_prompt=run["custom_prompt"] or "",
+                                                    force_refresh=force_refresh)
+            except RETRYABLE as e:
+                if attempt == Config.AI_BATCH_MAX_ATTEMPTS:
+                    raise
+                delay = retry_delay(e, attempt)
+                if isinstance(e, anthropic.RateLimitError):
+                    cooldown.hold(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+    async def one(client):
+        tries = {"n": 0}
+        try:
+            strategy = await generate(client, tries)
+            _save_result(run["id"], client["id"], strategy, run["label"], tries["n"])
+            outcome = {"client": client["name"], "status": "done", "attempts": tries["n"]}
+        except Exception as e:
+            _save_failure(run["id"], client["id"], str(e), tries["n"])
+            outcome = {"client": client["name"], "status": "failed", "error": str(e)}
+        done[0] += 1
+        if on_progress:
+            on_progress(done[0], len(clients), outcome)
+        return outcome
+
+    try:
+        return await asyncio.gather(*(one(c) for c in clients))
+    finally:
+        await api.close()
+
+
+def run_portfolio_strategies(run_id=None, client_ids=None, custom_prompt="", concurrency=None,
+                             force_refresh=False, on_progress=None):
+    """Generate and store strategies for every client of a run; returns run_status().
+
+    Without `run_id` a new run is started for `client_ids` (all clients by default).
+    With it, only clients not yet done are processed, so a crashed or interrupted
+    run continues where it stopped. Each strategy is committed as soon as it arrives.
+    """
+    if not HAS_ANTHROPIC or not Config.ANTHROPIC_API_KEY:
+        raise RuntimeError("Anthropic API yapılandırılmamış")
+    if run_id is None:
+        run_id = start_run(client_ids, custom_prompt)
+    run = fetch_one("strategy_runs", "id = ?", [run_id])
+    conn = get_conn()
+    clients = [dict(r) for r in conn.execute(
+        "SELECT c.* FROM strategy_run_items i JOIN clients c ON c.id = i.client_id "
+        "WHERE i.run_id = ? AND i.status != 'done' ORDER BY c.id", [run_id])]
+    conn.execute("UPDATE strategy_runs SET status = 'running' WHERE id = ?", [run_id])
+    conn.commit()
+    conn.close()
+
+    if clients:
+        asyncio.run(_run(run, clients, concurrency or Config.AI_BATCH_CONCURRENCY, force_refresh, on_progress))
+
+    status = run_status(run_id)
+    finished = status["counts"].get("done", 0) == status.get("total", 0)
+    conn = get_conn()
+    conn.execute("UPDATE strategy_runs SET status = ?, finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+                 ["done" if finished else "incomplete", run_id])
+    conn.commit()
+    conn.close()
+    return run_status(run_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tüm müşteriler için AI strateji üretimi")
+    parser.add_argument("--concurrency", type=int, default=Config.AI_BATCH_CONCURRENCY, help="eşzamanlı istek")
+    parser.add_argument("--prompt", default="", help="tüm müşterilere uygulanacak ek talimat")
+    parser.add_argument("--resume", nargs="?", const=0, type=int, metavar="RUN_ID",
+                        help="yarım kalan çalışmayı sürdür (numara verilmezse sonuncusu)")
+    parser.add_argument("--force-refresh", action="store_true", help="AI önbelleğini atla")
+    args = parser.parse_args()
+
+    run_id = None
+    if args.resume is not None:
+        run_id = args.resume or (open_run() or {}).get("id")
+        if not run_id:
+            print("Sürdürülecek yarım çalışma yok.")
+            return
+
+    start = time.time()
+
+    def progress(done, total, outcome):
+        icon = "✅" if outcome["status"] == "done" else "❌"
+        print(f"[{done}/{total}] {icon} {outcome['client']}" + (f": {outcome['error']}" if "error" in outcome else ""))
+
+    status = run_portfolio_strategies(run_id=run_id, custom_prompt=args.prompt, concurrency=args.concurrency,
+                                      force_refresh=args.force_refresh, on_progress=progress)
+    counts = status["counts"]
+    print(f"\nÇalışma #{status['id']} ({status['label']}): {counts.get('done', 0)}/{status['total']} tamamlandı, "
+          f"{counts.get('failed', 0)} başarısız, {time.time() - start:.0f} sn")
+    if status["status"] != "done":
+        print(f"Kalanlar için: python strategy_batch.py --resume {status['id']}")
+
+
+if __name__ == "__main__":
+    main()